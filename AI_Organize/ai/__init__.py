@@ -1,9 +1,175 @@
 # Auto-generated __init__.py
 
+from . import backends
+from .backends import AkinusBackend
+from .backends import FakeBackend
+from .backends import FakeEmbedder
+from .backends import LLMBackend
+from .backends import OllamaBackend
+from .backends import OllamaHTTPEmbedder
+from .backends import get_backend
+from . import balancer
+from .balancer import BalancedBackend
+from .balancer import Endpoint
+from .balancer import NoEndpointError
+from . import cassette
+from .cassette import Cassette
+from .cassette import CassetteMissError
+from .cassette import RecordingBackend
+from .cassette import RecordingEmbedder
+from .cassette import ReplayBackend
+from .cassette import ReplayEmbedder
+from . import clustering
+from .clustering import FileCluster
+from .clustering import cluster_files
+from .clustering import cluster_files_async
+from . import destination_index
+from .destination_index import DestinationIndex
+from . import embedding_service
+from .embedding_service import EmbeddingService
+from . import embeddings
+from .embeddings import ContextEmbeddingCache
+from .embeddings import EmbeddingBackend
+from .embeddings import HashingEmbedder
+from .embeddings import OllamaEmbedder
+from .embeddings import combine_embeddings
+from .embeddings import get_embedder
+from . import filename_templates
+from .filename_templates import TemplateIndex
+from .filename_templates import filename_template
+from . import generation
+from .generation import GenerationProfile
+from .generation import apply_stop
+from .generation import json_instruction
+from .generation import parse_json_list
+from .generation import parse_json_text
+from .generation import profiles_from_settings
+from . import local_classifier
+from .local_classifier import LocalClassifier
+from .local_classifier import name_tokens
+from . import local_summary
+from .local_summary import LocalSummarizer
+from .local_summary import LocalSummary
 from . import organizer
 from .organizer import suggest_folders
+from . import prompts
+from .prompts import classify_prompt
+from .prompts import classify_system_prompt
+from .prompts import summary_prompt
+from .prompts import summary_system_prompt
+from .prompts import system_tokens
+from .prompts import with_system
+from . import rate_limit
+from .rate_limit import AdaptiveLimiter
+from .rate_limit import RateLimitedBackend
+from .rate_limit import SharedTokenBucket
+from .rate_limit import TokenBucket
+from .rate_limit import is_throttled
+from .rate_limit import retry_after
+from . import resilience
+from .resilience import CallPolicy
+from .resilience import CircuitBreaker
+from .resilience import CircuitOpenError
+from .resilience import Resilience
+from .resilience import ResilientEmbedder
+from .resilience import queued
+from . import response_cache
+from .response_cache import CachedBackend
+from .response_cache import ResponseCache
+from .response_cache import cache_key
+from .response_cache import normalize_prompt
+from . import routing
+from .routing import ModelRouter
+from . import shortlist
+from .shortlist import estimate_tokens
+from .shortlist import shortlist_folders
+from . import warmup
+from .warmup import ModelWarmer
 
 __all__ = [
+    "backends",
+    "balancer",
+    "cassette",
+    "clustering",
+    "destination_index",
+    "embedding_service",
+    "embeddings",
+    "filename_templates",
+    "generation",
+    "local_classifier",
+    "local_summary",
     "organizer",
+    "prompts",
+    "rate_limit",
+    "resilience",
+    "response_cache",
+    "routing",
+    "shortlist",
+    "warmup",
+    "AdaptiveLimiter",
+    "AkinusBackend",
+    "BalancedBackend",
+    "CachedBackend",
+    "Cassette",
+    "CassetteMissError",
+    "CallPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ContextEmbeddingCache",
+    "DestinationIndex",
+    "EmbeddingBackend",
+    "EmbeddingService",
+    "Endpoint",
+    "FakeBackend",
+    "FakeEmbedder",
+    "FileCluster",
+    "GenerationProfile",
+    "HashingEmbedder",
+    "LLMBackend",
+    "LocalClassifier",
+    "LocalSummarizer",
+    "LocalSummary",
+    "ModelRouter",
+    "ModelWarmer",
+    "NoEndpointError",
+    "OllamaBackend",
+    "OllamaEmbedder",
+    "OllamaHTTPEmbedder",
+    "RateLimitedBackend",
+    "RecordingBackend",
+    "RecordingEmbedder",
+    "ReplayBackend",
+    "ReplayEmbedder",
+    "Resilience",
+    "ResilientEmbedder",
+    "ResponseCache",
+    "SharedTokenBucket",
+    "TemplateIndex",
+    "TokenBucket",
+    "apply_stop",
+    "cache_key",
+    "classify_prompt",
+    "classify_system_prompt",
+    "cluster_files",
+    "cluster_files_async",
+    "combine_embeddings",
+    "estimate_tokens",
+    "filename_template",
+    "get_backend",
+    "get_embedder",
+    "is_throttled",
+    "json_instruction",
+    "name_tokens",
+    "normalize_prompt",
+    "parse_json_list",
+    "parse_json_text",
+    "profiles_from_settings",
+    "queued",
+    "retry_after",
+    "shortlist_folders",
     "suggest_folders",
+    "summary_prompt",
+    "summary_system_prompt",
+    "system_tokens",
+    "with_system",
 ]
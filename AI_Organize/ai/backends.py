@@ -0,0 +1,666 @@
+from collections import Counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import json
+import re
+import threading
+import time
+import numpy as np
+
+from AI_Organize.ai.embeddings import EmbeddingBackend, HashingEmbedder
+from AI_Organize.ai.generation import (
+    DEFAULT_PROFILES,
+    GenerationProfile,
+    apply_stop,
+    json_instruction,
+    profiles_from_settings,
+)
+from AI_Organize.ai.prompts import system_tokens, with_system
+from AI_Organize.ai.shortlist import estimate_tokens
+
+
+# ----------------------------
+# Backend interface
+# ----------------------------
+
+class LLMBackend:
+    """
+    Base class for text-generation backends.
+
+    Backends are also callable as `ai_call(prompt, model)`, the signature
+    the directory-summary code has always accepted.
+
+    `site` names the calling code path ("classify", "summary", ...);
+    backends may use it (caching, stats) but never send it to the model.
+
+    `system` is the static instruction block. Backends with
+    `supports_system` send it separately so the server can reuse its
+    evaluation across calls; the others prepend it to the prompt.
+
+    `profiles` maps a site to its GenerationProfile (output budget,
+    stop sequences, temperature, JSON format), applied as far as the
+    backend can express it.
+
+    `stream` yields the response in chunks; `generate_until` stops
+    reading (and generating) once `done(text_so_far)` is true. Backends
+    that cannot stream yield the whole response as one chunk.
+    """
+    name = "base"
+    supports_system = False
+
+    def __init__(self, profiles: Optional[Dict[str, GenerationProfile]] = None):
+        self.profiles = dict(DEFAULT_PROFILES) if profiles is None else profiles
+
+        # "system_tokens_sent" / "system_tokens_reused" (estimated)
+        self.prompt_stats: Counter = Counter()
+        self._systems_seen: set = set()
+
+        # (site, "calls" | "output_tokens" | "decode_ms" | "early_stops") -> total
+        self.generation_stats: Counter = Counter()
+
+        self._last_activity = time.monotonic()
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        raise NotImplementedError
+
+    async def stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> AsyncIterator[str]:
+        yield await self.generate(prompt, model=model, site=site, system=system, **options)
+
+    async def generate_until(
+        self,
+        prompt: str,
+        *,
+        done: Callable[[str], bool],
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        text = ""
+        chunks = self.stream(prompt, model=model, site=site, system=system, **options)
+        try:
+            async for chunk in chunks:
+                text += chunk
+                if done(text):
+                    self.generation_stats[(site, "early_stops")] += 1
+                    break
+        finally:
+            await chunks.aclose()
+        return text
+
+    def _count_system(self, system: Optional[str]):
+        if not system:
+            return
+
+        tokens = system_tokens(system)
+        if self.supports_system and system in self._systems_seen:
+            self.prompt_stats["system_tokens_reused"] += tokens
+        else:
+            self.prompt_stats["system_tokens_sent"] += tokens
+            if self.supports_system:
+                self._systems_seen.add(system)
+
+    def _record_output(self, site: Optional[str], text: str, data: Optional[Dict[str, Any]] = None):
+        """
+        Output tokens as reported by the server, else estimated from the text.
+        """
+        data = data or {}
+        self._last_activity = time.monotonic()
+        self.generation_stats[(site, "calls")] += 1
+        self.generation_stats[(site, "output_tokens")] += data.get(
+            "eval_count", estimate_tokens(text) if text else 0
+        )
+        if "eval_duration" in data:
+            self.generation_stats[(site, "decode_ms")] += data["eval_duration"] / 1e6
+
+    def generation_report(self) -> List[str]:
+        sites = sorted({s for s, _ in self.generation_stats}, key=str)
+        lines = []
+        for site in sites:
+            calls = self.generation_stats[(site, "calls")]
+            line = (
+                f"{site}: calls={calls} "
+                f"output_tokens/call~{self.generation_stats[(site, 'output_tokens')] / calls:.0f}"
+            )
+            if self.generation_stats[(site, "decode_ms")]:
+                line += f" decode_ms/call={self.generation_stats[(site, 'decode_ms')] / calls:.0f}"
+            if self.generation_stats[(site, "early_stops")]:
+                line += f" early_stops={self.generation_stats[(site, 'early_stops')]}"
+            lines.append(line)
+        return lines
+
+    def prompt_report(self) -> str:
+        return (
+            f"system prompt tokens sent~{self.prompt_stats['system_tokens_sent']} "
+            f"reused~{self.prompt_stats['system_tokens_reused']}"
+        )
+
+    async def __call__(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        *,
+        done: Optional[Callable[[str], bool]] = None,
+        **options,
+    ) -> str:
+        if done is not None:
+            return await self.generate_until(prompt, done=done, model=model, **options)
+        return await self.generate(prompt, model=model, **options)
+
+    def for_site(self, site: str) -> Callable[..., Awaitable[str]]:
+        """
+        `ai_call`-style callable that tags every call with `site`.
+        Passing `done=` streams and stops early.
+        """
+        async def call(
+            prompt: str,
+            model: Optional[str] = None,
+            *,
+            done: Optional[Callable[[str], bool]] = None,
+            **options,
+        ) -> str:
+            if done is not None:
+                return await self.generate_until(
+                    prompt, done=done, model=model, site=site, **options
+                )
+            return await self.generate(prompt, model=model, site=site, **options)
+
+        return call
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        """
+        Load `model` on the server ahead of the first call and extend its
+        keep-alive. Returns False when the backend cannot preload.
+        """
+        return False
+
+    def idle_for(self) -> float:
+        """
+        Seconds since the last completed generation or warm-up.
+        """
+        return time.monotonic() - self._last_activity
+
+    def close(self):
+        pass
+
+
+def _preload(session, base_url: str, model: str, keep_alive: str, timeout: float):
+    # A generate request without a prompt only loads the model
+    response = session.post(
+        f"{base_url.rstrip('/')}/api/generate",
+        json={"model": model, "keep_alive": keep_alive},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+
+
+class AkinusBackend(LLMBackend):
+    """
+    Delegates to `akinus.ai.ollama.ollama_query` (the historical call path).
+    The function is looked up on every call, so it can be patched.
+
+    `ollama_query` takes no generation options, so of a profile only the
+    stop sequences apply (client-side, after the fact).
+
+    Warm-up talks to the Ollama server at `ollama_url` directly, since
+    `ollama_query` cannot load a model without generating.
+    """
+    name = "akinus"
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+        *,
+        ollama_url: Optional[str] = None,
+        keep_alive: str = "5m",
+    ):
+        super().__init__(profiles)
+        self.ollama_url = ollama_url
+        self.keep_alive = keep_alive
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        from akinus.ai.ollama import ollama_query
+
+        # No `format` on this path: ask for JSON in the prompt only
+        profile = self.profiles.get(site)
+        fmt = profile.format_for(site) if profile else None
+        if fmt is not None:
+            system = f"{system}\n\n{json_instruction(fmt)}" if system else json_instruction(fmt)
+
+        self._count_system(system)
+        response = await ollama_query(with_system(system, prompt), model=model, **options)
+
+        if profile and profile.stop:
+            response = apply_stop(response, profile.stop)
+
+        self._record_output(site, response)
+        return response
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        if not (self.ollama_url and model):
+            return False
+
+        import requests
+
+        with requests.Session() as session:
+            await asyncio.to_thread(
+                _preload, session, self.ollama_url, model, self.keep_alive, 300.0
+            )
+
+        self._last_activity = time.monotonic()
+        return True
+
+
+class OllamaBackend(LLMBackend):
+    """
+    Ollama HTTP API over one pooled keep-alive `requests.Session`.
+
+    Blocking requests run on worker threads; at most `pool_size` are in
+    flight, matching the number of pooled connections. The system prompt
+    is sent as Ollama's `system` field: with the model kept loaded
+    (`keep_alive`), the server reuses the evaluated static prefix.
+
+    The site's GenerationProfile becomes `options` (num_predict, stop,
+    temperature) and, for JSON profiles, `format`.
+    """
+    name = "ollama"
+    supports_system = True
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        *,
+        default_model: Optional[str] = None,
+        pool_size: int = 4,
+        keep_alive: str = "5m",
+        timeout: float = 300.0,
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+    ):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        super().__init__(profiles)
+        self.base_url = base_url.rstrip("/")
+        self.default_model = default_model
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.session.post(
+            f"{self.base_url}{path}",
+            json=payload,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _generate_payload(
+        self,
+        prompt: str,
+        model: Optional[str],
+        site: Optional[str],
+        system: Optional[str],
+        options: Dict[str, Any],
+        stream: bool,
+    ) -> Dict[str, Any]:
+        payload = {
+            "model": model or self.default_model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+        }
+
+        profile = self.profiles.get(site)
+        if profile:
+            options = {**profile.options(), **options}
+            fmt = profile.format_for(site)
+            if fmt is not None:
+                payload["format"] = fmt
+                system = f"{system}\n\n{json_instruction(fmt)}" if system else json_instruction(fmt)
+
+        if system:
+            payload["system"] = system
+            self._count_system(system)
+        if options:
+            payload["options"] = options
+
+        return payload
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        payload = self._generate_payload(prompt, model, site, system, options, stream=False)
+
+        async with self._get_slots():
+            data = await asyncio.to_thread(self._post, "/api/generate", payload)
+
+        response = data.get("response", "")
+        self._record_output(site, response, data)
+        return response
+
+    async def stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> AsyncIterator[str]:
+        """
+        Stream NDJSON chunks from a worker thread. Closing the generator
+        closes the HTTP response, which makes the server stop generating.
+
+        The thread is never waited for: when the consumer stops early or
+        is cancelled (e.g. by a timeout) while the request is still
+        blocked on a silent server, the thread is left to finish on its
+        own and closes its response as soon as one arrives.
+        """
+        payload = self._generate_payload(prompt, model, site, system, options, stream=True)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+        holder: Dict[str, Any] = {}
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # loop already closed
+
+        def pump():
+            try:
+                with self.session.post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=True,
+                ) as response:
+                    holder["response"] = response
+                    if stopped.is_set():
+                        return  # abandoned while waiting for headers
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if stopped.is_set():
+                            break
+                        if line:
+                            put(json.loads(line))
+            except Exception as e:
+                if not stopped.is_set():
+                    put(e)
+            finally:
+                put(None)
+
+        text = ""
+        last: Dict[str, Any] = {}
+
+        async with self._get_slots():
+            threading.Thread(target=pump, name="ollama-stream", daemon=True).start()
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+
+                    last = item
+                    chunk = item.get("response", "")
+                    if chunk:
+                        text += chunk
+                        yield chunk
+                    if item.get("done"):
+                        break
+            finally:
+                stopped.set()
+                response = holder.get("response")
+                if response is not None and not last.get("done"):
+                    response.close()
+                self._record_output(site, text, last if last.get("done") else None)
+
+    def embed(self, text: str, *, model: str) -> np.ndarray:
+        return self.embed_many([text], model=model)[0]
+
+    def embed_many(self, texts: List[str], *, model: str) -> List[np.ndarray]:
+        data = self._post(
+            "/api/embed",
+            {"model": model, "input": texts, "keep_alive": self.keep_alive},
+        )
+        return [np.asarray(v, dtype=np.float32) for v in data["embeddings"]]
+
+    def embedder(self, model: str) -> EmbeddingBackend:
+        return OllamaHTTPEmbedder(self, model)
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        model = model or self.default_model
+        if not model:
+            return False
+
+        await asyncio.to_thread(
+            _preload, self.session, self.base_url, model, self.keep_alive, self.timeout
+        )
+        self._last_activity = time.monotonic()
+        return True
+
+    def close(self):
+        self.session.close()
+
+
+class OllamaHTTPEmbedder(EmbeddingBackend):
+    """
+    Embeddings through an `OllamaBackend`'s pooled session.
+    A batch is one request (`input` as a list). With `owns_backend`
+    the backend is closed along with the embedder.
+    """
+    supports_batch = True
+
+    def __init__(self, backend: OllamaBackend, model: str, *, owns_backend: bool = False):
+        self.backend = backend
+        self.model = model
+        self.owns_backend = owns_backend
+        self.name = f"ollama:{model}"
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.backend.embed(text, model=self.model)
+
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        return self.backend.embed_many(texts, model=self.model)
+
+    def close(self):
+        if self.owns_backend:
+            self.backend.close()
+
+
+# ----------------------------
+# Fake backends (benchmarks, tests)
+# ----------------------------
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic in-process backend.
+
+    `responses` maps a substring of the prompt to the reply (first match
+    wins) or is a callable `prompt -> reply`; otherwise `default` is
+    returned. Every call sleeps `latency` seconds and is recorded,
+    with the site's profile options merged in.
+    """
+    name = "fake"
+    supports_system = True
+
+    def __init__(
+        self,
+        responses: Union[Dict[str, str], Callable[[str], str], None] = None,
+        *,
+        default: str = "Miscellaneous",
+        latency: float = 0.0,
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+    ):
+        super().__init__(profiles)
+        self.responses = responses or {}
+        self.default = default
+        self.latency = latency
+        self.calls: List[Dict[str, Any]] = []
+        self.chunks_streamed = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        profile = self.profiles.get(site)
+        if profile:
+            options = {**profile.options(), **options}
+
+        self.calls.append(
+            {"prompt": prompt, "model": model, "site": site, "system": system, "options": options}
+        )
+        self._count_system(system)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if callable(self.responses):
+            reply = self.responses(prompt)
+        else:
+            reply = next(
+                (r for needle, r in self.responses.items() if needle in prompt),
+                self.default,
+            )
+
+        self._record_output(site, reply)
+        return reply
+
+    async def stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> AsyncIterator[str]:
+        """
+        The reply line by line; `latency` is spread over the lines.
+        `chunks_streamed` counts lines actually handed out.
+        """
+        latency, self.latency = self.latency, 0.0
+        try:
+            reply = await self.generate(prompt, model=model, site=site, system=system, **options)
+        finally:
+            self.latency = latency
+
+        lines = re.findall(r"[^\n]*\n|[^\n]+", reply)
+        for line in lines:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(lines))
+            self.chunks_streamed += 1
+            yield line
+
+
+class FakeEmbedder(HashingEmbedder):
+    """
+    Hashing embedder with simulated per-call latency.
+    """
+
+    def __init__(self, dim: int = 512, latency: float = 0.0):
+        super().__init__(dim=dim)
+        self.latency = latency
+        self.name = f"fake-{dim}"
+        self.calls = 0
+
+    def embed(self, text: str) -> np.ndarray:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return super().embed(text)
+
+
+# ----------------------------
+# Factory
+# ----------------------------
+
+def get_backend(settings: Dict[str, Any]) -> LLMBackend:
+    """
+    Build the LLM backend selected by `ai.backend`
+    ("akinus", "ollama", "balanced" or "fake").
+    """
+    ai_settings = settings.get("ai", {})
+    backend = ai_settings.get("backend", "akinus")
+    profiles = profiles_from_settings(settings)
+
+    if backend == "akinus":
+        return AkinusBackend(
+            profiles,
+            ollama_url=ai_settings.get("ollama_url"),
+            keep_alive=ai_settings.get("keep_alive", "5m"),
+        )
+
+    if backend == "ollama":
+        return OllamaBackend(
+            ai_settings.get("ollama_url", "http://localhost:11434"),
+            default_model=ai_settings.get("model"),
+            pool_size=int(ai_settings.get("ollama_pool_size", 4)),
+            keep_alive=ai_settings.get("keep_alive", "5m"),
+            profiles=profiles,
+        )
+
+    if backend == "balanced":
+        from AI_Organize.ai.balancer import BalancedBackend
+        return BalancedBackend.from_settings(settings, profiles)
+
+    if backend == "fake":
+        return FakeBackend(
+            default=ai_settings.get("fake_response", "Miscellaneous"),
+            latency=float(ai_settings.get("fake_latency", 0.0)),
+            profiles=profiles,
+        )
+
+    raise ValueError(f"Unknown LLM backend: {backend}")
@@ -0,0 +1,314 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import threading
+import time
+import numpy as np
+
+from AI_Organize.ai.backends import LLMBackend, OllamaBackend, OllamaHTTPEmbedder
+from AI_Organize.ai.embeddings import EmbeddingBackend
+from AI_Organize.ai.generation import GenerationProfile
+
+
+BALANCE_STRATEGIES = ("least-outstanding", "round-robin")
+
+
+class NoEndpointError(RuntimeError):
+    """
+    Raised when no endpoint serves the requested model.
+    """
+
+
+class Endpoint:
+    """
+    One Ollama host. Its pooled OllamaBackend caps concurrent requests
+    at `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        weight: float = 1.0,
+        max_concurrency: int = 4,
+        models: Optional[List[str]] = None,
+        keep_alive: str = "5m",
+        timeout: float = 300.0,
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+    ):
+        self.url = url
+        self.weight = max(float(weight), 0.01)
+        self.max_concurrency = max_concurrency
+        self.models = set(models or [])
+
+        self.backend = OllamaBackend(
+            url,
+            pool_size=max_concurrency,
+            keep_alive=keep_alive,
+            timeout=timeout,
+            profiles=profiles,
+        )
+
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.current_weight = 0.0   # smooth weighted round-robin state
+
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    def serves(self, model: Optional[str]) -> bool:
+        return not self.models or model is None or model in self.models
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+
+class BalancedBackend(LLMBackend):
+    """
+    Spreads generation and embedding calls over several Ollama hosts.
+
+    - dispatch: "least-outstanding" (fewest in-flight requests per unit
+      of weight) or "round-robin" (smooth weighted round-robin)
+    - passive health checks: `eject_after` consecutive failures take a
+      host out of rotation for `eject_seconds`; it is retried afterwards
+    - a failed call is retried once on every other eligible host
+
+    Bookkeeping is locked: embeddings are dispatched from worker threads.
+    """
+    name = "balanced"
+    supports_system = True
+
+    def __init__(
+        self,
+        endpoints: List[Endpoint],
+        *,
+        default_model: Optional[str] = None,
+        strategy: str = "least-outstanding",
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not endpoints:
+            raise ValueError("BalancedBackend needs at least one endpoint")
+        if strategy not in BALANCE_STRATEGIES:
+            raise ValueError(f"Unknown balance strategy: {strategy}")
+
+        super().__init__(profiles)
+        self.endpoints = endpoints
+        self.default_model = default_model
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.clock = clock
+
+        # Endpoints report into the balancer's counters
+        for ep in endpoints:
+            ep.backend.profiles = self.profiles
+            ep.backend.prompt_stats = self.prompt_stats
+            ep.backend.generation_stats = self.generation_stats
+
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], profiles=None) -> "BalancedBackend":
+        """
+        Build from `ai.endpoints`: [{url, weight, max_concurrency, models}]
+        plus ai.balance_strategy, ai.eject_after, ai.eject_seconds.
+        """
+        ai_settings = settings.get("ai", {})
+        endpoints = [
+            Endpoint(
+                e["url"],
+                weight=float(e.get("weight", 1.0)),
+                max_concurrency=int(e.get("max_concurrency", ai_settings.get("ollama_pool_size", 4))),
+                models=e.get("models"),
+                keep_alive=ai_settings.get("keep_alive", "5m"),
+                profiles=profiles,
+            )
+            for e in ai_settings.get("endpoints", [])
+        ]
+        return cls(
+            endpoints,
+            default_model=ai_settings.get("model"),
+            strategy=ai_settings.get("balance_strategy", "least-outstanding"),
+            eject_after=int(ai_settings.get("eject_after", 3)),
+            eject_seconds=float(ai_settings.get("eject_seconds", 30.0)),
+            profiles=profiles,
+        )
+
+    # -------- Dispatch --------
+
+    def _acquire(self, model: Optional[str], exclude: set) -> Endpoint:
+        with self._lock:
+            now = self.clock()
+            eligible = [
+                ep for ep in self.endpoints
+                if ep.serves(model) and id(ep) not in exclude
+            ]
+            if not eligible:
+                raise NoEndpointError(f"No endpoint serves model {model!r}")
+
+            # Every eligible host ejected: fall back to all of them
+            candidates = [ep for ep in eligible if ep.healthy(now)] or eligible
+
+            if self.strategy == "round-robin":
+                total = sum(ep.weight for ep in candidates)
+                for ep in candidates:
+                    ep.current_weight += ep.weight
+                chosen = max(candidates, key=lambda ep: ep.current_weight)
+                chosen.current_weight -= total
+            else:
+                chosen = min(candidates, key=lambda ep: (ep.outstanding / ep.weight, ep.requests))
+
+            chosen.outstanding += 1
+            chosen.requests += 1
+            return chosen
+
+    def _release(self, ep: Endpoint, error: Optional[BaseException]):
+        with self._lock:
+            ep.outstanding -= 1
+            self._record(ep, error)
+
+    def _record(self, ep: Endpoint, error: Optional[BaseException]):
+        # Caller holds the lock
+        if error is None:
+            ep.consecutive_failures = 0
+            return
+
+        ep.errors += 1
+        ep.consecutive_failures += 1
+        if ep.consecutive_failures >= self.eject_after and ep.healthy(self.clock()):
+            ep.ejected_until = self.clock() + self.eject_seconds
+            ep.ejections += 1
+
+    async def _dispatch(self, model: Optional[str], call):
+        """
+        Run `call(ep)` on a chosen host, failing over to the others. A
+        call cancelled by the caller's timeout counts as that host
+        failing, and the host is released either way.
+        """
+        tried: set = set()
+        while True:
+            ep = self._acquire(model, tried)
+            error: Optional[BaseException] = None
+            try:
+                return await call(ep)
+            except asyncio.CancelledError as e:
+                error = e
+                raise
+            except Exception as e:
+                error = e
+                tried.add(id(ep))
+                if not self._can_fail_over(model, tried):
+                    raise
+            finally:
+                self._release(ep, error)
+
+    def _dispatch_sync(self, model: Optional[str], call):
+        tried: set = set()
+        while True:
+            ep = self._acquire(model, tried)
+            error: Optional[BaseException] = None
+            try:
+                return call(ep)
+            except Exception as e:
+                error = e
+                tried.add(id(ep))
+                if not self._can_fail_over(model, tried):
+                    raise
+            finally:
+                self._release(ep, error)
+
+    def _can_fail_over(self, model: Optional[str], tried: set) -> bool:
+        return any(ep.serves(model) and id(ep) not in tried for ep in self.endpoints)
+
+    # -------- Generation --------
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        model = model or self.default_model
+        return await self._dispatch(
+            model,
+            lambda ep: ep.backend.generate(
+                prompt, model=model, site=site, system=system, **options
+            ),
+        )
+
+    async def stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> AsyncIterator[str]:
+        # No failover mid-stream: chunks may already have been consumed
+        model = model or self.default_model
+        ep = self._acquire(model, set())
+        error: Optional[BaseException] = None
+        chunks = ep.backend.stream(prompt, model=model, site=site, system=system, **options)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except (asyncio.CancelledError, Exception) as e:
+            # Closing the stream early (GeneratorExit) is not a failure
+            error = e
+            raise
+        finally:
+            try:
+                await chunks.aclose()
+            finally:
+                self._release(ep, error)
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        """
+        Warm every host that serves `model`.
+        """
+        model = model or self.default_model
+        warmed = False
+        for ep in self.endpoints:
+            if ep.serves(model):
+                try:
+                    warmed = await ep.backend.warm_up(model) or warmed
+                except Exception as e:
+                    with self._lock:
+                        self._record(ep, e)
+        return warmed
+
+    def idle_for(self) -> float:
+        return min(ep.backend.idle_for() for ep in self.endpoints)
+
+    # -------- Embeddings --------
+
+    def embed(self, text: str, *, model: str) -> np.ndarray:
+        return self.embed_many([text], model=model)[0]
+
+    def embed_many(self, texts: List[str], *, model: str) -> List[np.ndarray]:
+        return self._dispatch_sync(model, lambda ep: ep.backend.embed_many(texts, model=model))
+
+    def embedder(self, model: str) -> EmbeddingBackend:
+        return OllamaHTTPEmbedder(self, model)
+
+    # -------- Reporting --------
+
+    def report(self) -> List[str]:
+        now = self.clock()
+        return [
+            f"{ep.url}: requests={ep.requests} errors={ep.errors} "
+            f"ejections={ep.ejections} {'up' if ep.healthy(now) else 'ejected'}"
+            for ep in self.endpoints
+        ]
+
+    def close(self):
+        for ep in self.endpoints:
+            ep.backend.close()
@@ -0,0 +1,351 @@
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+import numpy as np
+
+from AI_Organize.ai.backends import LLMBackend
+from AI_Organize.ai.embeddings import EmbeddingBackend
+from AI_Organize.ai.generation import GenerationProfile
+from AI_Organize.ai.response_cache import cache_key
+
+
+CASSETTE_LATENCIES = ("original", "none")
+
+
+class CassetteMissError(RuntimeError):
+    """
+    Raised on replay when a request was never recorded.
+    """
+
+
+def _generate_key(
+    model: Optional[str],
+    prompt: str,
+    site: Optional[str],
+    system: Optional[str],
+    options: Dict[str, Any],
+) -> str:
+    return cache_key(model, prompt, {"site": site, "system": system, **options})
+
+
+def _encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32).copy()
+
+
+class Cassette:
+    """
+    Recorded model traffic, one JSON object per line (gzip-compressed
+    when the path ends in ".gz"):
+
+        {"kind": "header", "model"}
+        {"kind": "generate", "key", "model", "site", "response", "seconds"}
+        {"kind": "embed", "key", "embedder", "vector", "seconds"}
+
+The header names the run's default model, so a replay never has to
+ask the model server for it.
+
+    Keys hash the full request (see `cache_key`); vectors are base64
+    float32. A key recorded several times replays its responses in
+    order, then keeps returning the last one.
+
+    Every entry is flushed as written, and compressed as a gzip member
+    of its own, so the recording of an interrupted run still loads up
+    to its last complete entry.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.model: Optional[str] = None
+        self.embedder_name: Optional[str] = None
+
+        self._entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Counter = Counter()
+        self._out = None
+        self._lock = threading.Lock()   # embeddings are recorded from worker threads
+
+        # (kind, "recorded" | "replayed" | "misses") -> count
+        self.stats: Counter = Counter()
+
+    @property
+    def compressed(self) -> bool:
+        return self.path.suffix == ".gz"
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        cassette = cls(path)
+        if cassette.compressed:
+            f = gzip.open(path, "rt", encoding="utf-8")
+        else:
+            f = open(path, "r", encoding="utf-8")
+
+        with f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break   # cut off mid-entry
+                    cassette._index(entry)
+            except EOFError:
+                pass            # last gzip member cut off
+        return cassette
+
+    @classmethod
+    def record_to(cls, path: Path) -> "Cassette":
+        """
+        Start a new recording at `path`, replacing any previous one.
+        """
+        cassette = cls(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cassette._out = open(path, "wb")
+        return cassette
+
+    def _index(self, entry: Dict[str, Any]):
+        if entry["kind"] == "header":
+            self.model = entry.get("model")
+            return
+        self._entries[(entry["kind"], entry["key"])].append(entry)
+        if entry["kind"] == "embed" and self.embedder_name is None:
+            self.embedder_name = entry.get("embedder")
+
+    def add(self, entry: Dict[str, Any]):
+        with self._lock:
+            self._write(entry)
+            self.stats[(entry["kind"], "recorded")] += 1
+
+    def record_model(self, model: Optional[str]):
+        """
+        Write the header naming the run's default model.
+        """
+        with self._lock:
+            self._write({"kind": "header", "model": model})
+        self.model = model
+
+    def _write(self, entry: Dict[str, Any]):
+        data = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        if self.compressed:
+            data = gzip.compress(data)
+        self._out.write(data)
+        self._out.flush()
+
+    def next(self, kind: str, key: str) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries.get((kind, key))
+            if not entries:
+                self.stats[(kind, "misses")] += 1
+                raise CassetteMissError(f"No recorded {kind} response for key {key[:12]}")
+
+            index = min(self._cursor[(kind, key)], len(entries) - 1)
+            self._cursor[(kind, key)] += 1
+            self.stats[(kind, "replayed")] += 1
+            return entries[index]
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    def report(self) -> List[str]:
+        return [
+            f"{kind}: {outcome}={n}"
+            for (kind, outcome), n in sorted(self.stats.items())
+        ]
+
+    def close(self):
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+
+# ----------------------------
+# Record
+# ----------------------------
+
+class RecordingBackend(LLMBackend):
+    """
+    Passes every generation call to `inner` and records the response
+    with its wall-clock latency.
+    """
+
+    def __init__(self, inner: LLMBackend, cassette: Cassette):
+        super().__init__()
+        self.inner = inner
+        self.cassette = cassette
+        self.name = inner.name
+        self.supports_system = inner.supports_system
+        self.profiles = inner.profiles
+        self.prompt_stats = inner.prompt_stats
+        self.generation_stats = inner.generation_stats
+
+    async def _recorded(self, call, prompt, model, site, system, options) -> str:
+        started = time.perf_counter()
+        response = await call()
+        self.cassette.add({
+            "kind": "generate",
+            "key": _generate_key(model, prompt, site, system, options),
+            "model": model,
+            "site": site,
+            "response": response,
+            "seconds": round(time.perf_counter() - started, 4),
+        })
+        return response
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        def call():
+            return self.inner.generate(prompt, model=model, site=site, system=system, **options)
+
+        return await self._recorded(call, prompt, model, site, system, options)
+
+    async def generate_until(
+        self,
+        prompt: str,
+        *,
+        done: Callable[[str], bool],
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        def call():
+            return self.inner.generate_until(
+                prompt, done=done, model=model, site=site, system=system, **options
+            )
+
+        return await self._recorded(call, prompt, model, site, system, options)
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        return await self.inner.warm_up(model)
+
+    def idle_for(self) -> float:
+        return self.inner.idle_for()
+
+    def close(self):
+        self.inner.close()
+        self.cassette.close()
+
+
+class RecordingEmbedder(EmbeddingBackend):
+    """
+    Records every vector `inner` returns. A batch's latency is split
+    evenly over its texts.
+    """
+
+    def __init__(self, inner: EmbeddingBackend, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self.name = inner.name
+        self.supports_batch = inner.supports_batch
+
+    def _record(self, texts: List[str], vectors: List[np.ndarray], seconds: float):
+        for text, vector in zip(texts, vectors):
+            self.cassette.add({
+                "kind": "embed",
+                "key": cache_key(self.name, text, {}),
+                "embedder": self.name,
+                "vector": _encode_vector(vector),
+                "seconds": round(seconds / len(texts), 4),
+            })
+
+    def embed(self, text: str) -> np.ndarray:
+        started = time.perf_counter()
+        vector = self.inner.embed(text)
+        self._record([text], [vector], time.perf_counter() - started)
+        return vector
+
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        if not texts:
+            return []
+        started = time.perf_counter()
+        vectors = self.inner.embed_many(texts)
+        self._record(texts, vectors, time.perf_counter() - started)
+        return vectors
+
+    def close(self):
+        self.inner.close()
+
+
+# ----------------------------
+# Replay
+# ----------------------------
+
+class ReplayBackend(LLMBackend):
+    """
+    Serves recorded responses without a model server, either with the
+    recorded latencies (`latency="original"`) or none at all.
+    """
+    name = "replay"
+    supports_system = True
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        latency: str = "original",
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+    ):
+        if latency not in CASSETTE_LATENCIES:
+            raise ValueError(f"Unknown replay latency: {latency}")
+
+        super().__init__(profiles)
+        self.cassette = cassette
+        self.latency = latency
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        entry = self.cassette.next("generate", _generate_key(model, prompt, site, system, options))
+        self._count_system(system)
+
+        if self.latency == "original":
+            await asyncio.sleep(entry["seconds"])
+
+        self._record_output(site, entry["response"])
+        return entry["response"]
+
+    def close(self):
+        self.cassette.close()
+
+
+class ReplayEmbedder(EmbeddingBackend):
+    """
+    Serves recorded vectors under the recording embedder's name, so
+    vectors already stored in memory stay comparable.
+    """
+
+    def __init__(self, cassette: Cassette, *, latency: str = "original"):
+        if latency not in CASSETTE_LATENCIES:
+            raise ValueError(f"Unknown replay latency: {latency}")
+
+        self.cassette = cassette
+        self.latency = latency
+        self.name = cassette.embedder_name or "replay"
+
+    def embed(self, text: str) -> np.ndarray:
+        entry = self.cassette.next("embed", cache_key(self.name, text, {}))
+        if self.latency == "original":
+            time.sleep(entry["seconds"])
+        return _decode_vector(entry["vector"])
@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import numpy as np
+
+from AI_Organize.core.models import FileContext
+from AI_Organize.ai.embeddings import EmbeddingBackend
+from AI_Organize.ai.filename_templates import filename_template
+
+
+@dataclass
+class FileCluster:
+    """
+    A group of files expected to share one placement decision.
+
+    The first file is the representative that goes through
+    classification; the decision is applied to every member.
+    """
+    key: str
+    files: List[FileContext] = field(default_factory=list)
+
+    @property
+    def representative(self) -> FileContext:
+        return self.files[0]
+
+    @property
+    def others(self) -> List[FileContext]:
+        return self.files[1:]
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+
+def cluster_files(
+    files: List[FileContext],
+    *,
+    embedder: Optional[EmbeddingBackend] = None,
+    similarity_threshold: float = 0.9,
+) -> List[FileCluster]:
+    """
+    Group files by name template (which includes the extension).
+
+    When an embedder is given, template clusters with the same extension
+    whose representatives are at least `similarity_threshold` cosine-similar
+    are merged as well. Only one embedding per template cluster is computed.
+
+    Cluster order follows the first appearance of each group in `files`.
+    """
+    clusters = _template_clusters(files)
+
+    if embedder is None or len(clusters) < 2:
+        return clusters
+
+    vectors = [embedder.embed(_cluster_text(c)) for c in clusters]
+    return _merge_similar(clusters, vectors, similarity_threshold)
+
+
+async def cluster_files_async(
+    files: List[FileContext],
+    service=None,
+    *,
+    similarity_threshold: float = 0.9,
+) -> List[FileCluster]:
+    """
+    Like `cluster_files`, but the representatives are embedded
+    through an EmbeddingService (one batch, off the event loop).
+    """
+    clusters = _template_clusters(files)
+
+    if service is None or len(clusters) < 2:
+        return clusters
+
+    vectors = await service.embed_many([_cluster_text(c) for c in clusters])
+    return _merge_similar(clusters, vectors, similarity_threshold)
+
+
+def _template_clusters(files: List[FileContext]) -> List[FileCluster]:
+    by_template: Dict[str, FileCluster] = {}
+
+    for file_ctx in files:
+        key = filename_template(file_ctx.name)
+        by_template.setdefault(key, FileCluster(key=key)).files.append(file_ctx)
+
+    return list(by_template.values())
+
+
+def _cluster_text(cluster: FileCluster) -> str:
+    rep = cluster.representative
+    return f"{rep.stem} {rep.extension} {rep.mime_type or ''}"
+
+
+def _merge_similar(
+    clusters: List[FileCluster],
+    raw_vectors: List[np.ndarray],
+    similarity_threshold: float,
+) -> List[FileCluster]:
+    vectors = []
+    for raw in raw_vectors:
+        vec = np.asarray(raw, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        vectors.append(vec / norm if norm else vec)
+
+    merged: List[FileCluster] = []
+    merged_vectors: List[np.ndarray] = []
+
+    for cluster, vec in zip(clusters, vectors):
+        ext = cluster.representative.extension.lower()
+        target = None
+
+        for existing, existing_vec in zip(merged, merged_vectors):
+            if existing.representative.extension.lower() != ext:
+                continue
+            if len(existing_vec) == len(vec) and float(existing_vec @ vec) >= similarity_threshold:
+                target = existing
+                break
+
+        if target is None:
+            merged.append(cluster)
+            merged_vectors.append(vec)
+        else:
+            target.files.extend(cluster.files)
+
+    return merged
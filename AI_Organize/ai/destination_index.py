@@ -0,0 +1,141 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+import asyncio
+import hashlib
+import numpy as np
+
+from AI_Organize.core.models import DirectoryContext
+from AI_Organize.ai.embeddings import EmbeddingBackend
+
+
+class DestinationIndex:
+    """
+    Cached embeddings of destination-folder descriptions.
+
+    Each destination's summary is embedded once per fingerprint of its
+    description (the scanner only regenerates a description when the
+    directory's own fingerprint changes). Vectors are kept in one
+    normalized matrix so a file is scored against every destination with
+    a single matrix-vector product.
+    """
+
+    def __init__(self, embedder: EmbeddingBackend):
+        self.embedder = embedder
+
+        # path -> (fingerprint, folder name, unit vector)
+        self._entries: Dict[Path, Tuple[str, str, np.ndarray]] = {}
+
+        self._names: List[str] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, directories: List[DirectoryContext]) -> int:
+        """
+        Sync the index with the given destinations.
+        Returns the number of descriptions (re-)embedded.
+        """
+        embedded = 0
+
+        for d, fingerprint in self._stale(directories):
+            try:
+                vec = self.embedder.embed(d.description)
+            except Exception:
+                continue  # embedding unavailable; retried on the next update
+
+            embedded += self._set(d, fingerprint, vec)
+
+        return embedded
+
+    async def update_async(self, directories: List[DirectoryContext], service) -> int:
+        """
+        Like `update`, but all changed descriptions are embedded
+        concurrently through an EmbeddingService (one batch).
+        """
+        stale = self._stale(directories)
+        if not stale:
+            return 0
+
+        vectors = await asyncio.gather(
+            *(service.embed(d.description) for d, _ in stale),
+            return_exceptions=True,
+        )
+
+        embedded = 0
+        for (d, fingerprint), vec in zip(stale, vectors):
+            if isinstance(vec, BaseException):
+                continue  # embedding unavailable; retried on the next update
+            embedded += self._set(d, fingerprint, vec)
+
+        return embedded
+
+    def _stale(self, directories: List[DirectoryContext]) -> List[Tuple[DirectoryContext, str]]:
+        """
+        Drop vanished destinations; return those whose description changed.
+        """
+        stale = []
+        seen = set()
+
+        for d in directories:
+            if not d.description:
+                continue
+
+            seen.add(d.path)
+            fingerprint = hashlib.sha256(d.description.encode()).hexdigest()
+
+            cached = self._entries.get(d.path)
+            if not (cached and cached[0] == fingerprint):
+                stale.append((d, fingerprint))
+
+        for path in list(self._entries):
+            if path not in seen:
+                del self._entries[path]
+                self._dirty = True
+
+        return stale
+
+    def _set(self, d: DirectoryContext, fingerprint: str, vec) -> int:
+        vec = np.asarray(vec, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if not norm:
+            return 0
+
+        self._entries[d.path] = (fingerprint, d.name, vec / norm)
+        self._dirty = True
+        return 1
+
+    def score(self, embedding: np.ndarray) -> List[Tuple[str, float]]:
+        """
+        Return (folder, cosine similarity) for every destination, best first.
+        """
+        if self._dirty:
+            self._rebuild()
+
+        if not self._names:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm or len(query) != self._matrix.shape[1]:
+            return []
+
+        sims = self._matrix @ (query / norm)
+        order = np.argsort(sims)[::-1]
+        return [(self._names[i], float(sims[i])) for i in order]
+
+    def _rebuild(self):
+        entries = list(self._entries.values())
+        self._names = [name for _, name, _ in entries]
+
+        dims = {len(vec) for _, _, vec in entries}
+        if len(dims) > 1:
+            raise ValueError("Destination embeddings have mixed dimensions")
+
+        self._matrix = (
+            np.vstack([vec for _, _, vec in entries])
+            if entries
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+        self._dirty = False
@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import numpy as np
+
+from AI_Organize.ai.embeddings import EmbeddingBackend
+
+
+class EmbeddingService:
+    """
+    Async front-end for an embedding backend.
+
+    Requests from concurrent tasks are collected for up to `window`
+    seconds (or until `max_batch` are queued) and sent together:
+    - backends with `supports_batch` get one `embed_many` call
+    - single-input backends get one worker-thread call per text
+    Either way the event loop is never blocked on an embedding, and each
+    caller's future resolves with its own vector.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingBackend,
+        *,
+        max_batch: int = 32,
+        window: float = 0.005,
+    ):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.window = window
+
+        self._queue: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        self.requests = 0
+        self.batches = 0
+
+    @property
+    def name(self) -> str:
+        return self.embedder.name
+
+    async def embed(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._queue.append((text, future))
+        self.requests += 1
+
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        return list(await asyncio.gather(*(self.embed(t) for t in texts)))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        self.batches += 1
+
+        # Identical texts in one batch are embedded once
+        waiters: Dict[str, List[asyncio.Future]] = {}
+        for text, future in batch:
+            waiters.setdefault(text, []).append(future)
+        texts = list(waiters)
+
+        if getattr(self.embedder, "supports_batch", False):
+            try:
+                vectors = await asyncio.to_thread(self.embedder.embed_many, texts)
+                results = list(zip(texts, vectors, [None] * len(texts)))
+            except Exception as e:
+                results = [(t, None, e) for t in texts]
+        else:
+            outcomes = await asyncio.gather(
+                *(asyncio.to_thread(self.embedder.embed, t) for t in texts),
+                return_exceptions=True,
+            )
+            results = [
+                (t, None, o) if isinstance(o, BaseException) else (t, o, None)
+                for t, o in zip(texts, outcomes)
+            ]
+
+        for text, vector, error in results:
+            for future in waiters[text]:
+                if future.done():
+                    continue  # caller went away
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(np.asarray(vector, dtype=np.float32))
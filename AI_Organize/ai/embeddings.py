@@ -0,0 +1,233 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import hashlib
+import re
+import zlib
+import numpy as np
+
+
+# Share of the shared directory context in a combined file embedding
+DEFAULT_CONTEXT_WEIGHT = 0.2
+
+
+# ----------------------------
+# Backend interface
+# ----------------------------
+
+class EmbeddingBackend:
+    """
+    Base class for embedding backends.
+
+    `name` tags every vector stored in memory so vectors produced by
+    different backends (or dimensions) are never compared.
+    `supports_batch` is True when `embed_many` is a single native request.
+    """
+    name = "base"
+    supports_batch = False
+
+    def embed(self, text: str) -> np.ndarray:
+        raise NotImplementedError
+
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        return [self.embed(t) for t in texts]
+
+    def close(self):
+        """Release connections the embedder owns."""
+
+
+class OllamaEmbedder(EmbeddingBackend):
+    """
+    Embeddings from the Ollama model server (network round-trip).
+    """
+    name = "ollama"
+
+    def embed(self, text: str) -> np.ndarray:
+        from akinus.ai.ollama import embed_with_ollama
+        return np.asarray(embed_with_ollama(text), dtype=np.float32)
+
+
+class HashingEmbedder(EmbeddingBackend):
+    """
+    Local feature-hashing embedder (no model, no network).
+
+    Word tokens and character n-grams of each token are hashed into a
+    fixed-size signed vector, then L2-normalized. Deterministic across
+    processes (crc32, not Python's salted hash).
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: tuple = (3, 5)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        lo, hi = self.ngram_range
+
+        for token in re.findall(r"\w+", text.lower()):
+            features.append(f"w:{token}")
+
+            padded = f"<{token}>"
+            for n in range(lo, hi + 1):
+                for i in range(len(padded) - n + 1):
+                    features.append(padded[i:i + n])
+
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode()) for f in self._features(text)),
+            dtype=np.uint32,
+        )
+
+        vec = np.zeros(self.dim, dtype=np.float32)
+        if hashes.size == 0:
+            return vec
+
+        index = (hashes >> 1) % self.dim
+        sign = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+        np.add.at(vec, index, sign)
+
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+
+# ----------------------------
+# Shared context
+# ----------------------------
+
+class ContextEmbeddingCache:
+    """
+    Embeds shared context (e.g. all destination descriptions) once per
+    distinct text. Entries are keyed by (backend name, sha256 of the text),
+    so a changed directory description produces a new entry.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def _key(self, name: str, text: str) -> tuple:
+        return (name, hashlib.sha256(text.encode()).hexdigest())
+
+    def _lookup(self, key: tuple) -> Optional[np.ndarray]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        return None
+
+    def _store(self, key: tuple, vec) -> np.ndarray:
+        vec = np.asarray(vec, dtype=np.float32)
+        self._entries[key] = vec
+
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return vec
+
+    def get(self, embedder: EmbeddingBackend, texts: List[str]) -> Optional[np.ndarray]:
+        if not texts:
+            return None
+
+        text = "\n".join(texts)
+        key = self._key(embedder.name, text)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        return self._store(key, embedder.embed(text))
+
+    async def aget(self, service, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Same as `get`, embedding through an async EmbeddingService.
+        """
+        if not texts:
+            return None
+
+        text = "\n".join(texts)
+        key = self._key(service.name, text)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        return self._store(key, await service.embed(text))
+
+
+def combine_embeddings(
+    file_vec: np.ndarray,
+    context_vec: Optional[np.ndarray],
+    weight: float = DEFAULT_CONTEXT_WEIGHT,
+) -> np.ndarray:
+    """
+    Blend a per-file embedding with the shared context embedding.
+
+    Both vectors are L2-normalized first, then combined as
+        v = (1 - weight) * file + weight * context
+    and renormalized. With weight=0.2 the file signal dominates while the
+    context still nudges files toward folders described in this tree.
+    Falls back to the file vector when there is no compatible context.
+    """
+    file_vec = np.asarray(file_vec, dtype=np.float32)
+
+    if context_vec is None or weight <= 0 or len(context_vec) != len(file_vec):
+        return file_vec
+
+    file_norm = np.linalg.norm(file_vec)
+    context_norm = np.linalg.norm(context_vec)
+    if not file_norm or not context_norm:
+        return file_vec
+
+    combined = (1 - weight) * (file_vec / file_norm) + weight * (context_vec / context_norm)
+    norm = np.linalg.norm(combined)
+    return combined / norm if norm else file_vec
+
+
+# ----------------------------
+# Factory
+# ----------------------------
+
+def get_embedder(settings: Dict[str, Any], llm_backend: Any = None) -> EmbeddingBackend:
+    """
+    Build the embedding backend selected by `ai.embedding_backend`
+    ("ollama", "hashing", "ollama-http" or "fake").
+
+    "ollama-http" reuses `llm_backend`'s pooled session(s) when it is an
+    OllamaBackend or a BalancedBackend; otherwise the embedder owns a
+    backend of its own and closes it in `close()`.
+    """
+    ai_settings = settings.get("ai", {})
+    backend = ai_settings.get("embedding_backend", "ollama")
+
+    if backend == "hashing":
+        return HashingEmbedder(dim=int(ai_settings.get("embedding_dim", 512)))
+
+    if backend == "ollama":
+        return OllamaEmbedder()
+
+    if backend == "ollama-http":
+        from AI_Organize.ai.backends import OllamaBackend
+        from AI_Organize.ai.balancer import BalancedBackend
+
+        model = ai_settings.get("embedding_model", "nomic-embed-text")
+        if isinstance(llm_backend, (OllamaBackend, BalancedBackend)):
+            return llm_backend.embedder(model)
+
+        from AI_Organize.ai.backends import OllamaHTTPEmbedder
+
+        own_backend = OllamaBackend(
+            ai_settings.get("ollama_url", "http://localhost:11434"),
+            keep_alive=ai_settings.get("keep_alive", "5m"),
+        )
+        return OllamaHTTPEmbedder(own_backend, model, owns_backend=True)
+
+    if backend == "fake":
+        from AI_Organize.ai.backends import FakeEmbedder
+
+        return FakeEmbedder(
+            dim=int(ai_settings.get("embedding_dim", 512)),
+            latency=float(ai_settings.get("fake_embedding_latency", 0.0)),
+        )
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
@@ -1,7 +1,13 @@
 from pathlib import Path
+from typing import Awaitable, Callable
 import re
 
+from AI_Organize.ai.backends import AkinusBackend, LLMBackend
+from AI_Organize.ai.generation import parse_json_list
+from AI_Organize.ai.prompts import summary_prompt, summary_system_prompt
+
 MAX_CHARS = 4000  # hard safety cap
+MAX_BULLETS = 3
 
 # Read a snippet of the file content for AI context (only for text-like files)
 def read_file_snippet(path: Path) -> str | None:
@@ -19,39 +25,50 @@ def read_file_snippet(path: Path) -> str | None:
     except Exception:
         return None
 
-# Summarize file content using AI (returns bullet points or None)
+# Summarize file content using AI (returns bullet points or None).
+# `ai_call` receives the static rules as `system=` and, when streaming,
+# a `done=` stop condition (three complete bullets). `json_output` drops
+# the bullet format from the rules when the summary profile asks for JSON.
 async def summarize_file_content(
     *,
     filename: str,
     content: str,
     model: str,
+    ai_call: LLMBackend | Callable[..., Awaitable[str]] | None = None,
+    stream: bool = True,
+    json_output: bool = False,
 ) -> str:
-    from akinus.ai.ollama import ollama_query
-
-    prompt = f"""
-Summarize the file below.
-
-STRICT RULES:
-- Do NOT include reasoning, thinking, analysis, or explanations
-- Do NOT include phrases like "thinking", "analysis", or "done"
-- Output ONLY bullet points
-- Maximum 3 bullet points
-- Each bullet must be 1 sentence
-
-File name:
-{filename}
+    if ai_call is None:
+        ai_call = AkinusBackend()
+
+    prompt = summary_prompt(filename=filename, content=content)
+    raw = await ai_call(
+        prompt,
+        model=model,
+        system=summary_system_prompt(json_output),
+        done=_enough_bullets if stream else None,
+    )
+    return _clean_bullets(raw)
 
-File content:
-{content}
 
-Bullet-point summary:
-"""
-    raw = await ollama_query(prompt, model=model)
-    return _clean_bullets(raw)
+def _enough_bullets(text: str) -> bool:
+    if text.lstrip().startswith("{"):
+        return False
+    complete = text[: text.rfind("\n") + 1]
+    return sum(
+        1 for line in complete.splitlines()
+        if line.strip().startswith(("-", "*", "•"))
+    ) >= MAX_BULLETS
 
 
 # Clean AI output to ensure it follows the bullet-point format and removes any unwanted text
 def _clean_bullets(text: str) -> str:
+    structured = parse_json_list(text, "bullets")
+    if structured:
+        return "\n".join(
+            b if b.startswith(("-", "*", "•")) else f"- {b}" for b in structured[:MAX_BULLETS]
+        )
+
     lines = text.splitlines()
 
     clean = []
@@ -74,4 +91,4 @@ def _clean_bullets(text: str) -> str:
     if not clean:
         return "- General file with minimal or unclear content."
 
-    return "\n".join(clean[:3])
\ No newline at end of file
+    return "\n".join(clean[:MAX_BULLETS])
\ No newline at end of file
@@ -0,0 +1,108 @@
+from collections import Counter
+from pathlib import PurePath
+from typing import Dict, List, Tuple
+import re
+
+from AI_Organize.core.memory import MemoryStore
+
+
+# ----------------------------
+# Normalization
+# ----------------------------
+
+# Order matters: the most specific patterns are collapsed first.
+_TEMPLATE_PATTERNS = [
+    (
+        re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"),
+        "<uuid>",
+    ),
+    # 2024-03-01, 2024_03_01, 20240301
+    (
+        re.compile(r"(?<!\d)(?:19|20)\d{2}[-_.]?(?:0[1-9]|1[0-2])[-_.]?(?:0[1-9]|[12]\d|3[01])(?!\d)"),
+        "<date>",
+    ),
+    # 01-03-2024, 01.03.2024
+    (
+        re.compile(r"(?<!\d)\d{2}[-_.]\d{2}[-_.](?:19|20)\d{2}(?!\d)"),
+        "<date>",
+    ),
+    # 2024-03 (year-month)
+    (
+        re.compile(r"(?<!\d)(?:19|20)\d{2}[-_.](?:0[1-9]|1[0-2])(?!\d)"),
+        "<date>",
+    ),
+    (
+        re.compile(
+            r"(?<![a-z])(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)"
+            r"(?:uary|ruary|ch|il|e|y|ust|tember|ober|ember)?(?![a-z])"
+        ),
+        "<month>",
+    ),
+    # Hex blobs must contain at least one letter and one digit
+    (
+        re.compile(r"(?<![0-9a-z])(?=[0-9a-f]*[a-f])(?=[0-9a-f]*\d)[0-9a-f]{8,}(?![0-9a-z])"),
+        "<hex>",
+    ),
+    (re.compile(r"\d+"), "<n>"),
+]
+
+
+def filename_template(name: str) -> str:
+    """
+    Normalize a file name into a template.
+
+    Examples:
+        Scan_2024-03-01_0012.pdf -> scan_<date>_<n>.pdf
+        IMG_4411.HEIC            -> img_<n>.heic
+    """
+    path = PurePath(name.lower())
+    stem, suffix = path.stem, path.suffix
+
+    for pattern, placeholder in _TEMPLATE_PATTERNS:
+        stem = pattern.sub(placeholder, stem)
+
+    return f"{stem}{suffix}"
+
+
+# ----------------------------
+# Index
+# ----------------------------
+
+class TemplateIndex:
+    """
+    Maps filename templates to target-folder counts from recorded decisions.
+
+    Lookups are a single dict access; `refresh()` only reads decisions
+    recorded since the previous refresh.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, Counter] = {}
+        self.last_id = 0
+
+    def refresh(self, memory: MemoryStore, scope: str = "project") -> int:
+        rows = memory.get_decisions_since(self.last_id, scope=scope)
+
+        for row_id, row in rows:
+            if row["name_template"]:
+                self.add(row["name_template"], row["target_folder"])
+            self.last_id = row_id
+
+        return len(rows)
+
+    def add(self, template: str, folder: str, count: int = 1):
+        self._counts.setdefault(template, Counter())[folder] += count
+
+    def lookup(self, name: str) -> List[Tuple[str, float, int]]:
+        """
+        Return (folder, share, total) for the file's template, best first.
+        """
+        counts = self._counts.get(filename_template(name))
+        if not counts:
+            return []
+
+        total = sum(counts.values())
+        return [
+            (folder, count / total, total)
+            for folder, count in counts.most_common()
+        ]
@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import json
+
+
+# ----------------------------
+# Structured output (JSON) per call site
+# ----------------------------
+
+# Schemas sent as Ollama's `format`; the parsers accept either this
+# form or the historical plain-text one.
+JSON_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "classify": {
+        "type": "object",
+        "properties": {"folders": {"type": "array", "items": {"type": "string"}}},
+        "required": ["folders"],
+    },
+    "summary": {
+        "type": "object",
+        "properties": {"bullets": {"type": "array", "items": {"type": "string"}}},
+        "required": ["bullets"],
+    },
+    "directory_summary": {
+        "type": "object",
+        "properties": {"summary": {"type": "string"}},
+        "required": ["summary"],
+    },
+}
+
+
+def json_instruction(fmt: Any) -> str:
+    """
+    Appended to the system prompt when a JSON format is requested.
+    """
+    if isinstance(fmt, dict):
+        return "Respond ONLY with JSON matching this schema:\n" + json.dumps(fmt)
+    return "Respond ONLY with JSON."
+
+
+def parse_json_list(raw: str, key: str) -> Optional[List[str]]:
+    """
+    Return `raw[key]` if `raw` is a JSON object holding a list there,
+    otherwise None (caller falls back to line parsing).
+    """
+    text = raw.strip()
+    if not text.startswith("{"):
+        return None
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+
+    values = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(values, list):
+        return None
+
+    return [str(v).strip() for v in values if str(v).strip()]
+
+
+def parse_json_text(raw: str, key: str) -> Optional[str]:
+    """
+    Return `raw[key]` if `raw` is a JSON object holding non-empty text
+    there, otherwise None (caller keeps the plain response).
+    """
+    text = raw.strip()
+    if not text.startswith("{"):
+        return None
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+
+    value = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    return value.strip()
+
+
+# ----------------------------
+# Generation profiles
+# ----------------------------
+
+@dataclass
+class GenerationProfile:
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    stop: List[str] = field(default_factory=list)
+    json: bool = False
+
+    def options(self) -> Dict[str, Any]:
+        """
+        Ollama `options` for this profile.
+        """
+        opts: Dict[str, Any] = {}
+        if self.max_tokens is not None:
+            opts["num_predict"] = self.max_tokens
+        if self.temperature is not None:
+            opts["temperature"] = self.temperature
+        if self.stop:
+            opts["stop"] = list(self.stop)
+        return opts
+
+    def format_for(self, site: Optional[str]) -> Any:
+        """
+        Ollama `format`: the site's schema, plain "json", or None.
+        """
+        if not self.json:
+            return None
+        return JSON_SCHEMAS.get(site, "json")
+
+
+# Call sites and their defaults. No output budget by default: reasoning
+# models spend part of it thinking, and a cap sized for the answer alone
+# leaves them with nothing to say. Set max_tokens per site for models
+# that answer directly.
+DEFAULT_PROFILES = {
+    "classify": GenerationProfile(temperature=0.0),
+    "summary": GenerationProfile(temperature=0.2),
+    "directory_summary": GenerationProfile(temperature=0.2),
+}
+
+
+def profiles_from_settings(settings: Dict[str, Any]) -> Dict[str, GenerationProfile]:
+    """
+    Build profiles from `ai.generation`:
+        {site: {max_tokens, temperature, stop, json}}
+    Unset keys keep the site's default.
+    """
+    cfg = settings.get("ai", {}).get("generation", {})
+    profiles = dict(DEFAULT_PROFILES)
+
+    for site, values in cfg.items():
+        default = profiles.get(site, GenerationProfile())
+        max_tokens = values.get("max_tokens", default.max_tokens)
+        temperature = values.get("temperature", default.temperature)
+
+        profiles[site] = GenerationProfile(
+            max_tokens=int(max_tokens) if max_tokens is not None else None,
+            temperature=float(temperature) if temperature is not None else None,
+            stop=list(values.get("stop", default.stop)),
+            json=bool(values.get("json", default.json)),
+        )
+
+    return profiles
+
+
+def apply_stop(text: str, stop: List[str]) -> str:
+    """
+    Client-side stop sequences, for backends that cannot send them.
+    """
+    cut = len(text)
+    for s in stop:
+        idx = text.find(s)
+        if s and idx != -1:
+            cut = min(cut, idx)
+    return text[:cut]
@@ -0,0 +1,263 @@
+from typing import Dict, List, Optional, Tuple
+import re
+import numpy as np
+
+from AI_Organize.core.memory import MemoryStore
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def name_tokens(name: str) -> List[str]:
+    """
+    Split a file name into lowercase word tokens.
+    Pure digit runs are dropped; they rarely generalize.
+    """
+    return [
+        t.lower()
+        for t in re.findall(r"[a-zA-Z0-9]{3,}", name)
+        if not t.isdigit()
+    ]
+
+
+def _grow(arr: np.ndarray, rows: int, cols: int | None = None) -> np.ndarray:
+    """
+    Return `arr` padded with zeros to at least (rows, cols),
+    doubling capacity so repeated growth stays amortized O(1).
+    """
+    if arr.ndim == 1:
+        if rows <= arr.shape[0]:
+            return arr
+        return np.pad(arr, (0, max(rows, arr.shape[0] * 2) - arr.shape[0]))
+
+    new_rows = arr.shape[0] if rows <= arr.shape[0] else max(rows, arr.shape[0] * 2)
+    new_cols = arr.shape[1] if cols <= arr.shape[1] else max(cols, arr.shape[1] * 2)
+    if (new_rows, new_cols) == arr.shape:
+        return arr
+    return np.pad(arr, ((0, new_rows - arr.shape[0]), (0, new_cols - arr.shape[1])))
+
+
+# ----------------------------
+# Classifier
+# ----------------------------
+
+class LocalClassifier:
+    """
+    Small in-process folder classifier trained from past decisions.
+
+    Two NumPy models are blended:
+    - multinomial naive Bayes over name tokens and the extension
+    - similarity-weighted kNN vote over stored embeddings
+
+    Training is incremental: `refresh()` only reads decisions newer than
+    the last one seen.
+    """
+
+    EXTENSION_WEIGHT = 2.0  # extension is a strong, cheap signal
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 1.0,
+        k: int = 7,
+        knn_weight: float = 0.5,
+    ):
+        self.alpha = alpha
+        self.k = k
+        self.knn_weight = knn_weight
+
+        self.folders: List[str] = []
+        self._folder_index: Dict[str, int] = {}
+        self._vocab: Dict[str, int] = {}
+
+        self._class_counts = np.zeros(8)
+        self._feature_counts = np.zeros((8, 64))
+
+        # kNN storage (single embedding dimension per classifier)
+        self._emb_dim: Optional[int] = None
+        self._emb_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._emb_labels = np.zeros(0, dtype=np.int64)
+        self._emb_weights = np.zeros(0, dtype=np.float32)
+        self._emb_count = 0
+
+        self.n_samples = 0
+        self.last_id = 0
+
+    # -------- Training --------
+
+    def refresh(self, memory: MemoryStore, scope: str = "project") -> int:
+        """
+        Train on decisions recorded since the last refresh.
+        Returns the number of new samples.
+        """
+        rows = memory.get_decisions_since(self.last_id, scope=scope)
+
+        for row_id, row in rows:
+            same_backend = row["embedding_backend"] == memory.embedding_backend
+            self.partial_fit(
+                tokens=row["tokens"],
+                extension=row["extension"],
+                target_folder=row["target_folder"],
+                embedding=row["embedding"] if same_backend else None,
+                weight=row["confidence"],
+            )
+            self.last_id = row_id
+
+        return len(rows)
+
+    def partial_fit(
+        self,
+        *,
+        tokens: List[str],
+        extension: Optional[str],
+        target_folder: str,
+        embedding: Optional[np.ndarray] = None,
+        weight: float = 1.0,
+    ):
+        label = self._label(target_folder)
+        weight = max(float(weight), 0.0)
+
+        features = self._features(tokens, extension, grow=True)
+        self._feature_counts = _grow(
+            self._feature_counts, len(self.folders), len(self._vocab)
+        )
+        for idx, value in features.items():
+            self._feature_counts[label, idx] += value * weight
+        self._class_counts[label] += weight
+
+        if embedding is not None and len(embedding):
+            self._add_embedding(embedding, label, weight)
+
+        self.n_samples += 1
+
+    # -------- Prediction --------
+
+    def predict(
+        self,
+        *,
+        tokens: List[str],
+        extension: Optional[str],
+        embedding: Optional[np.ndarray] = None,
+        limit: int = 3,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (folder, probability) pairs, best first.
+        """
+        n_classes = len(self.folders)
+        if n_classes == 0:
+            return []
+
+        probs = self._naive_bayes(tokens, extension)
+
+        knn = self._knn(embedding) if embedding is not None else None
+        if knn is not None:
+            probs = (1 - self.knn_weight) * probs + self.knn_weight * knn
+
+        order = np.argsort(probs)[::-1][:limit]
+        return [(self.folders[i], float(probs[i])) for i in order if probs[i] > 0]
+
+    # -------- Internal --------
+
+    def _label(self, folder: str) -> int:
+        idx = self._folder_index.get(folder)
+        if idx is None:
+            idx = len(self.folders)
+            self.folders.append(folder)
+            self._folder_index[folder] = idx
+            self._class_counts = _grow(self._class_counts, idx + 1)
+        return idx
+
+    def _features(
+        self,
+        tokens: List[str],
+        extension: Optional[str],
+        *,
+        grow: bool = False,
+    ) -> Dict[int, float]:
+        keys = [(f"t:{t}", 1.0) for t in tokens]
+        if extension:
+            keys.append((f"e:{extension.lower()}", self.EXTENSION_WEIGHT))
+
+        features: Dict[int, float] = {}
+        for key, value in keys:
+            idx = self._vocab.get(key)
+            if idx is None:
+                if not grow:
+                    continue  # unseen feature carries no evidence
+                idx = len(self._vocab)
+                self._vocab[key] = idx
+            features[idx] = features.get(idx, 0.0) + value
+        return features
+
+    def _naive_bayes(self, tokens: List[str], extension: Optional[str]) -> np.ndarray:
+        n_classes = len(self.folders)
+        n_features = max(len(self._vocab), 1)
+
+        class_counts = self._class_counts[:n_classes]
+        log_prior = np.log(class_counts + self.alpha) - np.log(
+            class_counts.sum() + self.alpha * n_classes
+        )
+
+        features = self._features(tokens, extension)
+        if not features:
+            log_post = log_prior
+        else:
+            idx = np.fromiter(features.keys(), dtype=np.int64)
+            values = np.fromiter(features.values(), dtype=np.float64)
+
+            counts = self._feature_counts[:n_classes, :n_features]
+            totals = counts.sum(axis=1) + self.alpha * n_features
+            log_likelihood = np.log(counts[:, idx] + self.alpha) - np.log(totals)[:, None]
+            log_post = log_prior + log_likelihood @ values
+
+        log_post -= log_post.max()
+        probs = np.exp(log_post)
+        return probs / probs.sum()
+
+    def _add_embedding(self, embedding: np.ndarray, label: int, weight: float):
+        vec = np.asarray(embedding, dtype=np.float32)
+        if self._emb_dim is None:
+            self._emb_dim = len(vec)
+            self._emb_matrix = np.zeros((16, self._emb_dim), dtype=np.float32)
+        if len(vec) != self._emb_dim:
+            return  # incompatible embedding (different model)
+
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return
+
+        n = self._emb_count
+        self._emb_matrix = _grow(self._emb_matrix, n + 1, self._emb_dim)
+        self._emb_labels = _grow(self._emb_labels, n + 1)
+        self._emb_weights = _grow(self._emb_weights, n + 1)
+
+        self._emb_matrix[n] = vec / norm
+        self._emb_labels[n] = label
+        self._emb_weights[n] = weight
+        self._emb_count += 1
+
+    def _knn(self, embedding: np.ndarray) -> Optional[np.ndarray]:
+        n = self._emb_count
+        if n == 0 or len(embedding) != self._emb_dim:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+
+        sims = self._emb_matrix[:n] @ (query / norm)
+        k = min(self.k, n)
+        top = np.argpartition(sims, -k)[-k:]
+
+        votes = np.clip(sims[top], 0.0, None) * self._emb_weights[top]
+        if votes.sum() <= 0:
+            return None
+
+        scores = np.bincount(
+            self._emb_labels[top],
+            weights=votes,
+            minlength=len(self.folders),
+        )
+        return scores / scores.sum()
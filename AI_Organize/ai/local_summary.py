@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+import math
+import re
+import sqlite3
+
+
+# ai.summary_mode values: LLM only, local only, or local with LLM escalation
+SUMMARY_MODES = ("llm", "local", "local-then-llm")
+
+MAX_SENTENCES = 200        # bound work on long samples
+MAX_TERMS_PER_DOC = 200    # keeps the vocabulary table small
+MAX_BULLET_CHARS = 200
+
+_STOPWORDS = frozenset(
+    """
+    the and for are but not you all any can had her was one our out has have
+    from with this that they will would there their what about which when
+    make like time just know take into year your some could them than then
+    these those been more also only other such were each most over very
+    shall should here where does done being after before while because
+    """.split()
+)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_TERM_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9]{2,}")
+
+
+def _terms(text: str) -> List[str]:
+    return [
+        t for t in (m.lower() for m in _TERM_RE.findall(text))
+        if t not in _STOPWORDS
+    ]
+
+
+@dataclass
+class LocalSummary:
+    bullets: str
+    keywords: List[str] = field(default_factory=list)
+
+    def as_context(self) -> str:
+        """
+        Text suitable as `extra_context` for embeddings and prompts.
+        """
+        if not self.keywords:
+            return self.bullets
+        return f"{self.bullets}\n- Keywords: {', '.join(self.keywords)}"
+
+
+class LocalSummarizer:
+    """
+    Extractive TF-IDF summarizer and keyword extractor (no LLM).
+
+    Document frequencies are kept in the project DB (`term_stats`) and
+    grow with every summarized file, so IDF reflects this project's files.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS term_stats (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS term_corpus (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                documents INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("INSERT OR IGNORE INTO term_corpus (id, documents) VALUES (1, 0)")
+        conn.commit()
+
+    # -------- Statistics --------
+
+    def _document_frequencies(self, terms: List[str]) -> Dict[str, int]:
+        if not terms:
+            return {}
+        placeholders = ",".join("?" * len(terms))
+        cur = self.conn.execute(
+            f"SELECT term, df FROM term_stats WHERE term IN ({placeholders})",
+            terms,
+        )
+        return dict(cur.fetchall())
+
+    def _document_count(self) -> int:
+        return self.conn.execute(
+            "SELECT documents FROM term_corpus WHERE id = 1"
+        ).fetchone()[0]
+
+    def _add_document(self, terms: List[str]):
+        self.conn.executemany(
+            "INSERT INTO term_stats (term, df) VALUES (?, 1) "
+            "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+            [(t,) for t in terms],
+        )
+        self.conn.execute("UPDATE term_corpus SET documents = documents + 1 WHERE id = 1")
+        self.conn.commit()
+
+    # -------- Summarization --------
+
+    def summarize(
+        self,
+        content: str,
+        *,
+        max_sentences: int = 3,
+        max_keywords: int = 8,
+    ) -> LocalSummary:
+        sentences = [
+            s.strip(" -*•\t")
+            for s in _SENTENCE_RE.split(content)
+            if len(s.strip()) >= 20
+        ][:MAX_SENTENCES]
+
+        tf: Dict[str, int] = {}
+        for term in _terms(content):
+            tf[term] = tf.get(term, 0) + 1
+
+        if not tf:
+            return LocalSummary(bullets="- General file with minimal or unclear content.")
+
+        # Cap the vocabulary contributed by one document
+        vocab = sorted(tf, key=lambda t: -tf[t])[:MAX_TERMS_PER_DOC]
+
+        df = self._document_frequencies(vocab)
+        n_docs = self._document_count()
+        weights = {
+            t: (1 + math.log(tf[t])) * (math.log((n_docs + 1) / (df.get(t, 0) + 1)) + 1)
+            for t in vocab
+        }
+
+        self._add_document(vocab)
+
+        keywords = sorted(weights, key=lambda t: -weights[t])[:max_keywords]
+
+        scored = []
+        for idx, sentence in enumerate(sentences):
+            terms = _terms(sentence)
+            if not terms:
+                continue
+            score = sum(weights.get(t, 0.0) for t in terms) / math.sqrt(len(terms))
+            scored.append((score, idx, sentence))
+
+        top = sorted(scored, reverse=True)[:max_sentences]
+        top.sort(key=lambda x: x[1])  # keep document order
+
+        bullets = [
+            f"- {sentence[:MAX_BULLET_CHARS].rstrip()}"
+            for _, _, sentence in top
+        ]
+        if not bullets:
+            bullets = [f"- Mentions: {', '.join(keywords)}"]
+
+        return LocalSummary(bullets="\n".join(bullets), keywords=keywords)
@@ -1,31 +1,52 @@
 from typing import List, Dict, Any
 from pathlib import Path
+import asyncio
 import re
 import numpy as np
 
 from AI_Organize.core.models import FileContext, DirectoryContext
 from AI_Organize.core.memory import MemoryStore
 from AI_Organize.ai.file_context import read_file_snippet, summarize_file_content
+from AI_Organize.ai.local_classifier import LocalClassifier, name_tokens
+from AI_Organize.ai.embeddings import (
+    ContextEmbeddingCache,
+    DEFAULT_CONTEXT_WEIGHT,
+    EmbeddingBackend,
+    combine_embeddings,
+    get_embedder,
+)
+from AI_Organize.ai.filename_templates import TemplateIndex
+from AI_Organize.ai.shortlist import shortlist_folders
+from AI_Organize.ai.destination_index import DestinationIndex
+from AI_Organize.ai.local_summary import LocalSummarizer
+from AI_Organize.ai.resilience import Resilience
+from AI_Organize.ai.backends import LLMBackend, get_backend
+from AI_Organize.ai.embedding_service import EmbeddingService
+from AI_Organize.ai.prompts import classify_prompt, classify_system_prompt
+from AI_Organize.ai.generation import parse_json_list
+from AI_Organize.ai.routing import ModelRouter
+
+
+# Directory context is identical for every file in a run; embed it once
+_CONTEXT_CACHE = ContextEmbeddingCache()
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def _tokenize(text: str) -> List[str]:
-    return [t.lower() for t in re.findall(r"[a-zA-Z0-9]{3,}", text)]
-
-
 def _build_embedding_text(
     file_ctx: FileContext,
-    dir_descriptions: list[str],
     extra_context: str | None = None,
 ) -> str:
+    """
+    Per-file embedding input: name, extension, mime type and (optionally)
+    the content summary. Shared directory context is embedded separately.
+    """
     parts = [
         file_ctx.name,
         file_ctx.extension,
         file_ctx.mime_type or "",
-        " ".join(dir_descriptions),
     ]
     if extra_context:
         parts.append(extra_context)
@@ -33,6 +54,37 @@ def _build_embedding_text(
     return "\n".join(p for p in parts if p)
 
 
+def memory_embedding_text(file_ctx: FileContext) -> str:
+    """
+    Input of the vectors stored with memory decisions. Memory is queried
+    with a vector built from the same text, so a file seen before scores
+    (close to) 1.0 against its own decision.
+    """
+    return _build_embedding_text(file_ctx)
+
+
+async def _embed_file(
+    service: EmbeddingService,
+    file_ctx: FileContext,
+    dir_descriptions: list[str],
+    settings: Dict[str, Any],
+    extra_context: str | None = None,
+) -> np.ndarray:
+    """
+    Embed the file's own text and blend in the cached shared-context vector.
+    """
+    file_vec, context_vec = await asyncio.gather(
+        service.embed(_build_embedding_text(file_ctx, extra_context)),
+        _CONTEXT_CACHE.aget(service, dir_descriptions),
+    )
+
+    return combine_embeddings(
+        file_vec,
+        context_vec,
+        settings.get("ai", {}).get("context_weight", DEFAULT_CONTEXT_WEIGHT),
+    )
+
+
 def _confidence_from_similarity(
     memory_score: float,
     ai_score: float,
@@ -47,6 +99,184 @@ def _confidence_from_similarity(
     return min(1.0, (memory_score * 0.75) + (ai_score * 0.25))
 
 
+def _memory_fastpath(
+    hits: List[tuple],
+    *,
+    settings: Dict[str, Any],
+    directories: List[DirectoryContext],
+    root: Path | None,
+) -> Dict[str, Any] | None:
+    """
+    Return a direct suggestion when the top memory hit is strong enough
+    to skip the LLM entirely, otherwise None.
+    """
+    memory_settings = settings.get("memory", {})
+    if not hits or not memory_settings.get("fastpath_enabled", True):
+        return None
+
+    score, meta = hits[0]
+    min_similarity = memory_settings.get("fastpath_similarity", 0.97)
+    min_confidence = memory_settings.get("fastpath_confidence", 0.9)
+
+    if score < min_similarity or meta["confidence"] < min_confidence:
+        return None
+
+    folder = meta["target_folder"]
+
+    # Only shortcut to folders that still exist
+    if not _folder_exists(folder, directories, root):
+        return None
+
+    auto_threshold = settings.get("behavior", {}).get("auto_move_threshold", 0.95)
+    confidence = min(float(score), float(meta["confidence"]))
+
+    return {
+        "folder": folder,
+        "confidence": round(confidence, 3),
+        "source": "memory-fastpath",
+        "auto_move_eligible": confidence >= auto_threshold,
+    }
+
+
+def _local_model_suggestions(
+    classifier: LocalClassifier,
+    *,
+    file_ctx: FileContext,
+    tokens: List[str],
+    embedding: np.ndarray,
+    settings: Dict[str, Any],
+    directories: List[DirectoryContext],
+    root: Path | None,
+    max_suggestions: int,
+) -> List[Dict[str, Any]]:
+    """
+    Return local-model suggestions when the model is trained and confident
+    enough to replace the LLM call, otherwise an empty list.
+    """
+    local_settings = settings.get("local_model", {})
+    if not local_settings.get("enabled", True):
+        return []
+
+    if classifier.n_samples < local_settings.get("min_samples", 20):
+        return []
+
+    predictions = [
+        (folder, prob)
+        for folder, prob in classifier.predict(
+            tokens=tokens,
+            extension=file_ctx.extension,
+            embedding=embedding,
+            limit=max_suggestions,
+        )
+        if _folder_exists(folder, directories, root)
+    ]
+
+    threshold = local_settings.get("confidence_threshold", 0.9)
+    if not predictions or predictions[0][1] < threshold:
+        return []
+
+    auto_threshold = settings.get("behavior", {}).get("auto_move_threshold", 0.95)
+
+    return [
+        {
+            "folder": folder,
+            "confidence": round(prob, 3),
+            "source": "local-model",
+            "auto_move_eligible": prob >= auto_threshold,
+        }
+        for folder, prob in predictions
+    ]
+
+
+def _template_fastpath(
+    hits: List[tuple],
+    *,
+    settings: Dict[str, Any],
+    directories: List[DirectoryContext],
+    root: Path | None,
+) -> Dict[str, Any] | None:
+    """
+    Return a direct, auto-move eligible suggestion when the file's name
+    template has enough consistent history, otherwise None.
+    """
+    template_settings = settings.get("templates", {})
+    if not hits or not template_settings.get("enabled", True):
+        return None
+
+    folder, share, total = hits[0]
+
+    if total < template_settings.get("min_count", 3):
+        return None
+    if share < template_settings.get("min_share", 0.9):
+        return None
+    if not _folder_exists(folder, directories, root):
+        return None
+
+    return {
+        "folder": folder,
+        "confidence": round(share, 3),
+        "source": "template",
+        "auto_move_eligible": True,
+    }
+
+
+def _destination_fastpath(
+    scores: List[tuple],
+    *,
+    settings: Dict[str, Any],
+    max_suggestions: int,
+) -> List[Dict[str, Any]]:
+    """
+    Return destination-similarity suggestions without an LLM call when the
+    best destination clearly stands out, otherwise an empty list.
+
+    These are never auto-move eligible; the user still confirms them.
+    """
+    dest_settings = settings.get("destinations", {})
+    if not scores or not dest_settings.get("enabled", True):
+        return []
+
+    best = scores[0][1]
+    runner_up = scores[1][1] if len(scores) > 1 else 0.0
+
+    if best < dest_settings.get("skip_llm_similarity", 0.75):
+        return []
+    if best - runner_up < dest_settings.get("skip_llm_margin", 0.1):
+        return []
+
+    min_similarity = dest_settings.get("min_similarity", 0.35)
+
+    return [
+        {
+            "folder": folder,
+            "confidence": round(sim, 3),
+            "source": "destination",
+            "auto_move_eligible": False,
+        }
+        for folder, sim in scores[:max_suggestions]
+        if sim >= min_similarity
+    ]
+
+
+def _with_stages(
+    suggestions: List[Dict[str, Any]],
+    stages: List[str],
+) -> List[Dict[str, Any]]:
+    for s in suggestions:
+        s["stages"] = list(stages)
+    return suggestions
+
+
+def _folder_exists(
+    folder: str,
+    directories: List[DirectoryContext],
+    root: Path | None,
+) -> bool:
+    if root is not None:
+        return (root / folder).is_dir()
+    return folder in {_sanitize_folder(d.name) for d in directories if d.name}
+
+
 def _sanitize_folder(name: str) -> str:
     name = name.strip().strip("\"'`")
     name = re.sub(r"[^\w\-\/ ]+", "", name)
@@ -59,13 +289,9 @@ def _sanitize_folder(name: str) -> str:
 
 async def suggest_folders(
     *,
-    file_ctx: FileContext,
-    directories: List[DirectoryContext],
-    memory: MemoryStore,
     settings: Dict[str, Any],
-    max_suggestions: int = 3,
-    model: str = None,
-    root: Path = None,
+    backend: LLMBackend | None = None,
+    **kwargs,
 ) -> List[Dict[str, Any]]:
     """
     Return ranked folder suggestions for a file.
@@ -77,14 +303,57 @@ async def suggest_folders(
             "confidence": 0.97,
             "source": "project+global",
             "auto_move_eligible": True,
+            "stages": ["template", "metadata", "llm"],
         },
         ...
     ]
+
+    Takes the keyword arguments of `_suggest_folders`. Without a
+    `backend`, one is built for this call and closed afterwards.
     """
-    from akinus.ai.ollama import ollama_query, embed_with_ollama
+    if backend is not None:
+        return await _suggest_folders(settings=settings, backend=backend, **kwargs)
+
+    backend = get_backend(settings)
+    try:
+        return await _suggest_folders(settings=settings, backend=backend, **kwargs)
+    finally:
+        backend.close()
+
+
+async def _suggest_folders(
+    *,
+    file_ctx: FileContext,
+    directories: List[DirectoryContext],
+    memory: MemoryStore,
+    settings: Dict[str, Any],
+    max_suggestions: int = 3,
+    model: str = None,
+    root: Path = None,
+    classifier: LocalClassifier | None = None,
+    embedder: EmbeddingBackend | None = None,
+    templates: TemplateIndex | None = None,
+    destinations: DestinationIndex | None = None,
+    summarizer: LocalSummarizer | None = None,
+    resilience: Resilience | None = None,
+    backend: LLMBackend,
+    embedding_service: EmbeddingService | None = None,
+    router: ModelRouter | None = None,
+) -> List[Dict[str, Any]]:
     from akinus.utils.logger import log
     auto_threshold = settings.get("behavior", {}).get("auto_move_threshold", 0.95)
 
+    if embedding_service is None:
+        if embedder is None:
+            embedder = get_embedder(settings)
+        embedding_service = EmbeddingService(embedder)
+
+    if resilience is None:
+        resilience = Resilience.from_settings(settings)
+
+    if router is None:
+        router = ModelRouter.from_settings(settings)
+
     # ----------------------------
     # Build embedding
     # ----------------------------
@@ -93,34 +362,215 @@ async def suggest_folders(
         d.description for d in directories if d.description
     ]
 
-    file_summary = None
-    content = read_file_snippet(file_ctx.path)
+    # Names of the decision stages that ran, in order (returned per suggestion)
+    stages: List[str] = []
+
+    # ----------------------------
+    # Filename templates (constant time)
+    # ----------------------------
 
-    if content:
-        file_summary = await summarize_file_content(
-            filename=file_ctx.name,
-            content=content,
-            model=model,
+    template_hits = []
+    if templates is not None:
+        stages.append("template")
+        templates.refresh(memory)
+        template_hits = templates.lookup(file_ctx.name)
+
+        fast = _template_fastpath(
+            template_hits,
+            settings=settings,
+            directories=directories,
+            root=root,
         )
+        if fast:
+            await log(
+                "INFO",
+                "organizer",
+                f"[TEMPLATE MATCH] file={file_ctx.name} folder={fast['folder']} "
+                f"confidence={fast['confidence']}",
+            )
+            return _with_stages([fast], stages)
+
+    tokens = name_tokens(file_ctx.name)
+
+    scored_embedding = None
+    scored_destinations: List = []
+    memory_vector: np.ndarray | None = None
+
+    def _score_destinations(embedding):
+        """
+        destinations.score, computed once per embedding (the cheap-signal
+        probe and the final ranking use the same one).
+        """
+        nonlocal scored_embedding, scored_destinations
+        if embedding is not scored_embedding:
+            scored_embedding, scored_destinations = embedding, destinations.score(embedding)
+        return scored_destinations
+
+    async def _cheap_signals(extra_context: str | None):
+        """
+        Embed the file and try memory and the local model.
+
+        Returns (embedding, project_hits, direct_suggestions, best_confidence),
+        where best_confidence is the strongest cheap signal seen.
+        """
+        nonlocal memory_vector
+        try:
+            # Memory and the local model compare against stored vectors, which
+            # hold metadata only; the context-blended vector ranks destinations
+            if memory_vector is None:
+                memory_vector = await embedding_service.embed(memory_embedding_text(file_ctx))
+            embedding = await _embed_file(
+                embedding_service,
+                file_ctx,
+                dir_descriptions,
+                settings,
+                extra_context=extra_context,
+            )
+        except Exception as e:
+            # Degraded: names, extensions and templates still work
+            await log(
+                "WARNING",
+                "organizer",
+                f"[EMBEDDING UNAVAILABLE] file={file_ctx.name} error={e}",
+            )
+            embedding = None
 
-    embedding_text = _build_embedding_text(
-        file_ctx,
-        dir_descriptions,
-        extra_context=file_summary,
-    )
-    embedding = embed_with_ollama(embedding_text)
+        project_hits = (
+            memory.get_similar(memory_vector, scope="project", limit=5)
+            if memory_vector is not None
+            else []
+        )
 
-    tokens = _tokenize(file_ctx.name)
+        fast = _memory_fastpath(
+            project_hits,
+            settings=settings,
+            directories=directories,
+            root=root,
+        )
+        if fast:
+            await log(
+                "INFO",
+                "organizer",
+                f"[MEMORY FASTPATH] file={file_ctx.name} folder={fast['folder']} "
+                f"confidence={fast['confidence']} stages={'+'.join(stages)}",
+            )
+            return embedding, project_hits, [fast], fast["confidence"]
+
+        if classifier is not None:
+            classifier.refresh(memory)
+            local = _local_model_suggestions(
+                classifier,
+                file_ctx=file_ctx,
+                tokens=tokens,
+                embedding=memory_vector,
+                settings=settings,
+                directories=directories,
+                root=root,
+                max_suggestions=max_suggestions,
+            )
+            if local:
+                await log(
+                    "INFO",
+                    "organizer",
+                    f"[LOCAL MODEL] file={file_ctx.name} folder={local[0]['folder']} "
+                    f"confidence={local[0]['confidence']} stages={'+'.join(stages)}",
+                )
+                return embedding, project_hits, local, local[0]["confidence"]
+
+        best = 0.0
+        if project_hits:
+            score, meta = project_hits[0]
+            best = float(score) * float(meta["confidence"])
+        if template_hits:
+            _, share, total = template_hits[0]
+            best = max(best, share * total / (total + 1))
+        if destinations is not None and embedding is not None:
+            scored = _score_destinations(embedding)
+            if scored:
+                best = max(best, scored[0][1])
+
+        return embedding, project_hits, None, best
 
     # ----------------------------
-    # Query memory
+    # Staged decision: metadata first, content summary only if needed
     # ----------------------------
 
-    project_hits = memory.get_similar(embedding, scope="project", limit=5)
+    ai_settings = settings.get("ai", {})
+    lazy_summary = ai_settings.get("lazy_summary", True)
+    summary_threshold = ai_settings.get("lazy_summary_threshold", 0.8)
+    probe_metadata_first = lazy_summary or settings.get("memory", {}).get(
+        "fastpath_skip_summary", False
+    )
+
+    content = read_file_snippet(file_ctx.path)
+    file_summary = None
+    needs_summary = bool(content)
+
+    if probe_metadata_first or not content:
+        stages.append("metadata")
+        embedding, project_hits, direct, best_conf = await _cheap_signals(None)
+        if direct:
+            return _with_stages(direct, stages)
+
+        if content and lazy_summary and best_conf >= summary_threshold:
+            needs_summary = False
+            await log(
+                "INFO",
+                "organizer",
+                f"[SUMMARY SKIPPED] file={file_ctx.name} best_confidence={best_conf:.2f}",
+            )
+
+    # Validated once when settings load (see cli.organize.run)
+    summary_mode = ai_settings.get("summary_mode", "local-then-llm")
+
+    if needs_summary and summary_mode != "llm":
+        stages.append("summary-local")
+        if summarizer is None:
+            summarizer = LocalSummarizer(memory.project_conn)
+
+        local_summary = summarizer.summarize(content)
+        file_ctx.keywords = local_summary.keywords
+        file_summary = local_summary.as_context()
+
+        embedding, project_hits, direct, best_conf = await _cheap_signals(file_summary)
+        if direct:
+            return _with_stages(direct, stages)
+
+        # Escalate to the LLM summary only when the local one did not settle it
+        needs_summary = (
+            summary_mode == "local-then-llm" and best_conf < summary_threshold
+        )
+
+    if needs_summary:
+        stages.append("summary")
+        summary_tier, summary_model = router.route("summary", model)
+        summary_profile = backend.profiles.get("summary")
+        try:
+            file_summary = await summarize_file_content(
+                filename=file_ctx.name,
+                content=content,
+                model=summary_model,
+                ai_call=router.timed(
+                    summary_tier, resilience.wrap("summary", backend.for_site("summary"))
+                ),
+                stream=ai_settings.get("stream_responses", True),
+                json_output=bool(summary_profile and summary_profile.json),
+            )
+        except Exception as e:
+            # Keep whatever (local) summary we already have
+            await log(
+                "WARNING",
+                "organizer",
+                f"[SUMMARY UNAVAILABLE] file={file_ctx.name} error={e}",
+            )
+
+        embedding, project_hits, direct, best_conf = await _cheap_signals(file_summary)
+        if direct:
+            return _with_stages(direct, stages)
 
     # 🔒 Only consult global memory if project memory has signal
     if project_hits:
-        global_hits = memory.get_similar(embedding, scope="global", limit=5)
+        global_hits = memory.get_similar(memory_vector, scope="global", limit=5)
     else:
         global_hits = []
 
@@ -148,11 +598,49 @@ async def suggest_folders(
     for hit in global_hits:
         _accumulate(hit, "global")
 
+    for folder, share, total in template_hits:
+        # Shrink the share toward zero while history is thin
+        _accumulate((share * total / (total + 1), {"target_folder": folder}), "template")
+
+    # ----------------------------
+    # Destination descriptions (one matrix-vector product)
+    # ----------------------------
+
+    destination_scores: Dict[str, float] = {}
+
+    if (
+        destinations is not None
+        and embedding is not None
+        and settings.get("destinations", {}).get("enabled", True)
+    ):
+        scored = _score_destinations(embedding)
+        destination_scores = dict(scored)
+
+        if not suggestions:
+            direct = _destination_fastpath(
+                scored,
+                settings=settings,
+                max_suggestions=max_suggestions,
+            )
+            if direct:
+                await log(
+                    "INFO",
+                    "organizer",
+                    f"[DESTINATION MATCH] file={file_ctx.name} folder={direct[0]['folder']} "
+                    f"similarity={direct[0]['confidence']}",
+                )
+                return _with_stages(direct, stages)
+
+        min_similarity = settings.get("destinations", {}).get("min_similarity", 0.35)
+        for folder, sim in scored[:max_suggestions]:
+            if sim >= min_similarity:
+                _accumulate((sim, {"target_folder": folder}), "destination")
+
     # ----------------------------
     # AI fallback / enrichment
     # ----------------------------
 
-    known_folders = sorted(
+    all_known_folders = sorted(
         {
             _sanitize_folder(d.name)
             for d in directories
@@ -160,93 +648,128 @@ async def suggest_folders(
         }
     )
 
-    ai_prompt = f"""
-You are organizing files on a Linux system.
-
-STRICT RULES:
-- Respond ONLY with folder names
-- One folder name per line
-- NO explanations
-- NO reasoning
-- NO extra text
-
-You may suggest folders that don't exist yet but you must strictly adhere to the following rules:
-
-Folder creation rules:
-- Prefer existing folders when they make sense
-- You may suggest creating ONE new folder ONLY IF:
-  - No existing folder fits the file well, AND
-  - The file content clearly indicates a category
-- If the file is generic, ambiguous, or trivial, DO NOT invent a folder. In this case, suggest "Miscellaneous" if the folder does not already exist. 
-
-Some questions that might help you decide on folder suggestions:
-- Does the file name indicate a specific category or topic?
-- Do the file extension and type suggest a particular use or category?
-- If the file content is readable, what is it about? Does it indicate a clear category?
-- Are there existing folders that match the file's name, type, or content? If so, prefer those.
-
-Example good response:
-Documents
-Photos/Vacation
-Music/Rock
-
-Example Decisions:
-- If the file is "report.docx" and there is an existing folder "Work", then since "report.docx" is a common work-related file, you should suggest "Work".
-- If the file is "summer.jpg" and there is an existing folder "Photos/Vacation", then you should suggest "Photos/Vacation" because the file name indicates it's a photo and the name "summer" suggests it could be a vacation photo.
-- If the file is "notes.txt" and there are no existing folders, but the content of "notes.txt" is about a project on machine learning, then you may suggest creating a new folder "Projects/Machine-Learning" because the content indicates a clear category and there are no existing folders that fit.
-- If the file is "randomfile.bin" and there are existing folders "Documents", "Photos", and "Music", but the file name and content are generic and do not clearly fit any category, then you should suggest "Miscellaneous" if it doesn't already exist because the file is ambiguous and does not indicate a clear category.
-- If the file is "budget.xlsx" and there is an existing folder "Finance", then you should suggest "Finance" because the file name and type indicate it's related to financial documents, and there is an existing folder that fits well.
-- If the file is "project_plan.docx" and there are existing folders "Work" and "Projects", then you should suggest "Projects" because the file name indicates it's a project-related document, and "Projects" is a more specific match than "Work".
-- If the file is "vacation_video.mp4" and there is an existing folder "Videos", then you should suggest "Videos" because the file type indicates it's a video, and there is an existing folder that fits well, even though the file name suggests it could be a vacation video.
-- If the file is "todo.txt" and there are no existing folders, but the content of "todo.txt" is a list of tasks for home improvement, then you may suggest creating a new folder "Home-Improvement" because the content indicates a clear category and there are no existing folders that fit.
-- If the file is "todo.txt" and there is an existing folder named ToDo, but the content of "todo.txt" is a list of tasks for home improvement, then you should suggest "ToDo" because the existing folder name is more specific than creating a new one.
-- If the file is 123.txt and there is a folder named Text_Files, but the content of 123.txt is just a random assortment of numbers with no clear theme, then you should suggest "Text_Files" because the file is generic and does not indicate a clear category, and there is an existing folder that fits reasonably well.
-
-This is a list of known folders that exist in the file's current directory:
-{chr(10).join(known_folders)}
-
-This is the file metadata:
-- Name: {file_ctx.name}
-- Type: {file_ctx.mime_type or "unknown"}
-
-This is the summary of the file content:
-{file_summary or "- No readable content available."}
-
-Respond now:
-"""
-    await log(
-        "DEBUG",
-        "organizer",
-        f"\n\t----[AI PROMPT]---- \
-            \n\tfile={file_ctx.name}\n\tprompt={ai_prompt.replace(chr(10), ' | ')} \
-            \n\tmodel={model or 'default'} \
-        ",
+    # Keep the prompt flat regardless of how many folders exist
+    known_folders = shortlist_folders(
+        all_known_folders,
+        query_tokens=tokens + name_tokens(file_summary or ""),
+        memory_scores={f: e["memory_score"] for f, e in suggestions.items()},
+        description_scores=destination_scores,
+        top_k=ai_settings.get("folder_shortlist_size", 40),
+        token_budget=ai_settings.get("folder_prompt_token_budget", 600),
     )
-    raw_ai = await ollama_query(ai_prompt, model=model)
-    await log(
-        "DEBUG",
-        "organizer",
-        f"\n\t----[AI RESPONSE]---- \
-            \n\tfile={file_ctx.name}\n\tresponse={raw_ai.replace(chr(10), ' | ')} \
-            \n\tmodel={model or 'default'} \
-        ",
-    )
-
-    known_folder_names = {
-        _sanitize_folder(d.name)
-        for d in directories
-        if d.name
-    }
 
-    raw_lines = extract_folder_lines(raw_ai)
-    ai_lines = [_sanitize_folder(l) for l in raw_lines]
+    folder_list_note = ""
+    if len(known_folders) < len(all_known_folders):
+        folder_list_note = (
+            f"\n(Showing the {len(known_folders)} of {len(all_known_folders)} "
+            "folders most relevant to this file.)"
+        )
 
+    ai_prompt = classify_prompt(
+        known_folders=known_folders,
+        file_name=file_ctx.name,
+        mime_type=file_ctx.mime_type,
+        file_summary=file_summary,
+        folder_list_note=folder_list_note,
+    )
     known_folder_set = {
         _sanitize_folder(d.name)
         for d in directories
         if d.name and d.path.parent == root
     }
 
+    async def _classify_with(tier: str, tier_model: str | None) -> str | None:
+        """
+        Ask one model tier; None when the model server is unavailable.
+        """
+        await log(
+            "DEBUG",
+            "organizer",
+            f"\n\t----[AI PROMPT]---- \
+                \n\tfile={file_ctx.name}\n\tprompt={ai_prompt.replace(chr(10), ' | ')} \
+                \n\tmodel={tier_model or 'default'} tier={tier} \
+            ",
+        )
+        profile = backend.profiles.get("classify")
+        try:
+            raw = await resilience.call(
+                "classify",
+                router.timed(tier, backend.for_site("classify")),
+                ai_prompt,
+                tier_model,
+                system=classify_system_prompt(bool(profile and profile.json)),
+                done=(
+                    _enough_folders(max_suggestions)
+                    if ai_settings.get("stream_responses", True)
+                    else None
+                ),
+            )
+        except Exception as e:
+            # Degraded mode: rank memory, template and destination signals only
+            stages.append("degraded")
+            await log(
+                "WARNING",
+                "organizer",
+                f"[LLM UNAVAILABLE] file={file_ctx.name} error={e} "
+                f"circuit={resilience.breaker.state}",
+            )
+            return None
+
+        await log(
+            "DEBUG",
+            "organizer",
+            f"\n\t----[AI RESPONSE]---- \
+                \n\tfile={file_ctx.name}\n\tresponse={raw.replace(chr(10), ' | ')} \
+                \n\tmodel={tier_model or 'default'} tier={tier} \
+            ",
+        )
+        return raw
+
+    stages.append("llm")
+    tier, classify_model = router.route("classify", model)
+    raw_ai = await _classify_with(tier, classify_model)
+    ai_lines = [_sanitize_folder(l) for l in extract_folder_lines(raw_ai or "")]
+
+    # A cheap tier's answer is re-asked on the large tier when it is
+    # empty, contradicts memory, or stays below the confidence bar
+    if raw_ai is not None and router.can_escalate(tier, classify_model, model):
+        remembered = [
+            e for e in suggestions.values()
+            if e["memory_score"] > 0 and {"project", "global"} & e["sources"]
+        ]
+        strongest = max(remembered, key=lambda e: e["memory_score"], default=None)
+        memory_folder = strongest["folder"] if strongest else None
+        best_confidence = max(
+            (
+                _confidence_from_similarity(
+                    suggestions.get(f, {}).get("memory_score", 0.0),
+                    0.7 if f in known_folder_set else 0.4,
+                )
+                for f in ai_lines[:max_suggestions]
+            ),
+            default=0.0,
+        )
+
+        if router.should_escalate(
+            ai_lines[:max_suggestions],
+            best_confidence=best_confidence,
+            memory_folder=memory_folder,
+            memory_score=strongest["memory_score"] if strongest else 0.0,
+        ):
+            escalated_tier, escalated_model = router.escalation(model)
+            router.record_escalation("classify")
+            stages.append("escalated")
+            await log(
+                "INFO",
+                "organizer",
+                f"[MODEL ESCALATION] file={file_ctx.name} from={tier} to={escalated_tier} "
+                f"folders={ai_lines[:max_suggestions]} best_confidence={best_confidence:.2f} "
+                f"memory_folder={memory_folder}",
+            )
+            escalated = await _classify_with(escalated_tier, escalated_model)
+            if escalated is not None:
+                ai_lines = [_sanitize_folder(l) for l in extract_folder_lines(escalated)]
+
     no_existing_folders = not known_folder_set
 
     for idx, folder in enumerate(ai_lines[:max_suggestions]):
@@ -323,15 +846,34 @@ Respond now:
         ),
     )
 
-    return ranked[:max_suggestions]
+    return _with_stages(ranked[:max_suggestions], stages)
+
+
+def _enough_folders(count: int):
+    """
+    Stop condition for streamed classification: `count` folder lines
+    parsed from the completed lines so far. Structured (JSON) output
+    is only parsed once complete.
+    """
+    def done(text: str) -> bool:
+        if text.lstrip().startswith("{"):
+            return False
+        complete = text[: text.rfind("\n") + 1]
+        return len(extract_folder_lines(complete)) >= count
+
+    return done
 
 
-# Extract plausible folder names from AI response, ignoring junk
 def extract_folder_lines(raw: str) -> list[str]:
     """
     Extract plausible folder names from an LLM response.
-    Ignores reasoning, explanations, and junk.
+    Reads the structured form ({"folders": [...]}) when present;
+    otherwise ignores reasoning, explanations, and junk.
     """
+    structured = parse_json_list(raw, "folders")
+    if structured is not None:
+        return structured
+
     lines = []
     for line in raw.splitlines():
         line = line.strip()
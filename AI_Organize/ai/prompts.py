@@ -0,0 +1,148 @@
+from typing import List, Optional
+
+from AI_Organize.ai.shortlist import estimate_tokens
+
+
+# ----------------------------
+# Static instructions (sent as the system prompt)
+# ----------------------------
+#
+# These never change between calls. Keeping them out of the per-file
+# prompt lets backends with a native system prompt reuse the already
+# evaluated prefix instead of re-processing it for every file.
+
+CLASSIFY_RULES = """
+You are organizing files on a Linux system.
+
+STRICT RULES:
+- Suggest ONLY folder names
+- NO explanations
+- NO reasoning
+- NO extra text
+
+You may suggest folders that don't exist yet but you must strictly adhere to the following rules:
+
+Folder creation rules:
+- Prefer existing folders when they make sense
+- You may suggest creating ONE new folder ONLY IF:
+  - No existing folder fits the file well, AND
+  - The file content clearly indicates a category
+- If the file is generic, ambiguous, or trivial, DO NOT invent a folder. In this case, suggest "Miscellaneous" if the folder does not already exist.
+
+Some questions that might help you decide on folder suggestions:
+- Does the file name indicate a specific category or topic?
+- Do the file extension and type suggest a particular use or category?
+- If the file content is readable, what is it about? Does it indicate a clear category?
+- Are there existing folders that match the file's name, type, or content? If so, prefer those.
+
+Example Decisions:
+- If the file is "report.docx" and there is an existing folder "Work", then since "report.docx" is a common work-related file, you should suggest "Work".
+- If the file is "summer.jpg" and there is an existing folder "Photos/Vacation", then you should suggest "Photos/Vacation" because the file name indicates it's a photo and the name "summer" suggests it could be a vacation photo.
+- If the file is "notes.txt" and there are no existing folders, but the content of "notes.txt" is about a project on machine learning, then you may suggest creating a new folder "Projects/Machine-Learning" because the content indicates a clear category and there are no existing folders that fit.
+- If the file is "randomfile.bin" and there are existing folders "Documents", "Photos", and "Music", but the file name and content are generic and do not clearly fit any category, then you should suggest "Miscellaneous" if it doesn't already exist because the file is ambiguous and does not indicate a clear category.
+- If the file is "budget.xlsx" and there is an existing folder "Finance", then you should suggest "Finance" because the file name and type indicate it's related to financial documents, and there is an existing folder that fits well.
+- If the file is "project_plan.docx" and there are existing folders "Work" and "Projects", then you should suggest "Projects" because the file name indicates it's a project-related document, and "Projects" is a more specific match than "Work".
+- If the file is "vacation_video.mp4" and there is an existing folder "Videos", then you should suggest "Videos" because the file type indicates it's a video, and there is an existing folder that fits well, even though the file name suggests it could be a vacation video.
+- If the file is "todo.txt" and there are no existing folders, but the content of "todo.txt" is a list of tasks for home improvement, then you may suggest creating a new folder "Home-Improvement" because the content indicates a clear category and there are no existing folders that fit.
+- If the file is "todo.txt" and there is an existing folder named ToDo, but the content of "todo.txt" is a list of tasks for home improvement, then you should suggest "ToDo" because the existing folder name is more specific than creating a new one.
+- If the file is 123.txt and there is a folder named Text_Files, but the content of 123.txt is just a random assortment of numbers with no clear theme, then you should suggest "Text_Files" because the file is generic and does not indicate a clear category, and there is an existing folder that fits reasonably well.
+""".strip()
+
+# The output format is stated once: as plain lines here, or as the JSON
+# instruction the backend appends when the classify profile asks for JSON.
+CLASSIFY_LINE_FORMAT = """
+Output format: one folder name per line, nothing else.
+
+Example good response:
+Documents
+Photos/Vacation
+Music/Rock
+""".strip()
+
+CLASSIFY_SYSTEM_PROMPT = f"{CLASSIFY_RULES}\n\n{CLASSIFY_LINE_FORMAT}"
+
+
+SUMMARY_RULES = """
+Summarize the file you are given.
+
+STRICT RULES:
+- Do NOT include reasoning, thinking, analysis, or explanations
+- Do NOT include phrases like "thinking", "analysis", or "done"
+- Maximum 3 bullet points
+- Each bullet must be 1 sentence
+""".strip()
+
+# Dropped, like CLASSIFY_LINE_FORMAT, when the summary profile asks for JSON
+SUMMARY_LINE_FORMAT = """
+Output format: ONLY bullet points, one per line, nothing else.
+""".strip()
+
+SUMMARY_SYSTEM_PROMPT = f"{SUMMARY_RULES}\n\n{SUMMARY_LINE_FORMAT}"
+
+
+# ----------------------------
+# Per-call (variable) prompts
+# ----------------------------
+
+def classify_prompt(
+    *,
+    known_folders: List[str],
+    file_name: str,
+    mime_type: Optional[str],
+    file_summary: Optional[str],
+    folder_list_note: str = "",
+) -> str:
+    return f"""
+This is a list of known folders that exist in the file's current directory:
+{chr(10).join(known_folders)}{folder_list_note}
+
+This is the file metadata:
+- Name: {file_name}
+- Type: {mime_type or "unknown"}
+
+This is the summary of the file content:
+{file_summary or "- No readable content available."}
+
+Respond now:
+"""
+
+
+def summary_prompt(*, filename: str, content: str) -> str:
+    return f"""
+File name:
+{filename}
+
+File content:
+{content}
+
+Bullet-point summary:
+"""
+
+
+def classify_system_prompt(json_output: bool = False) -> str:
+    """
+    Static classify instructions; without the line format when the
+    response is requested as JSON.
+    """
+    return CLASSIFY_RULES if json_output else CLASSIFY_SYSTEM_PROMPT
+
+
+def summary_system_prompt(json_output: bool = False) -> str:
+    """
+    Static summary instructions; without the bullet format when the
+    response is requested as JSON.
+    """
+    return SUMMARY_RULES if json_output else SUMMARY_SYSTEM_PROMPT
+
+
+def with_system(system: Optional[str], prompt: str) -> str:
+    """
+    Inline form for backends without a separate system prompt.
+    """
+    if not system:
+        return prompt
+    return f"{system}\n\n{prompt.lstrip()}"
+
+
+def system_tokens(system: Optional[str]) -> int:
+    return estimate_tokens(system) if system else 0
@@ -0,0 +1,375 @@
+from collections import Counter
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import sqlite3
+import threading
+import time
+
+from AI_Organize.ai.backends import LLMBackend
+from AI_Organize.ai.resilience import queued
+from AI_Organize.ai.shortlist import estimate_tokens
+
+
+def is_throttled(error: BaseException) -> bool:
+    """
+    True for provider back-pressure (HTTP 429/503 or a rate-limit message).
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status in (429, 503):
+        return True
+    text = str(error).lower()
+    return "429" in text or "rate limit" in text or "too many requests" in text
+
+
+def _is_timeout(error: BaseException) -> bool:
+    # Builtin timeouts and client-library ones (e.g. requests.Timeout)
+    return isinstance(error, TimeoutError) or any(
+        "Timeout" in cls.__name__ for cls in type(error).__mro__
+    )
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+# ----------------------------
+# Token buckets
+# ----------------------------
+
+class TokenBucket:
+    """
+    `rate` units per second, bursts up to `capacity`.
+
+    `reserve(n)` takes n units immediately, letting the bucket go into
+    debt, and returns how long the caller must wait before using them.
+    Callers are therefore served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        # An oversized request waits for a full bucket, never longer
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class SharedTokenBucket:
+    """
+    TokenBucket whose state lives in a SQLite row, so every process
+    using the same database draws from one budget. Uses wall-clock time.
+
+    `reserve` may wait on other processes' write locks; the limiter
+    calls it from a worker thread.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        name: str,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            db_path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Read the clock once the lock is held: reservations stay ordered
+                now = self.clock()
+                row = self.conn.execute(
+                    "SELECT tokens, updated FROM rate_limit_buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens = self.capacity if row is None else row[0] + (now - row[1]) * self.rate
+                tokens = min(self.capacity, tokens) - min(amount, self.capacity)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (self.name, tokens, now),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def close(self):
+        self.conn.close()
+
+
+# ----------------------------
+# Adaptive limiter
+# ----------------------------
+
+class AdaptiveLimiter:
+    """
+    One limiter for every LLM call of a run.
+
+    - rate: optional request (per second) and token (per minute) buckets
+    - concurrency: AIMD. Each call that finishes under `latency_target`
+      raises the limit by 1/limit (about +1 per round of calls); a
+      throttle, timeout or slow call multiplies it by `backoff`, at most
+      once per round (calls started before the last decrease are ignored)
+    - a throttled call pauses new calls for Retry-After (or `pause`) seconds
+
+    Waiting for a slot or for the rate budget is marked `queued()`, so
+    a Resilience timeout around the call only covers the call itself.
+    """
+
+    def __init__(
+        self,
+        *,
+        request_bucket: Optional[TokenBucket] = None,
+        token_bucket: Optional[TokenBucket] = None,
+        initial_concurrency: float = 2,
+        min_concurrency: float = 1,
+        max_concurrency: float = 8,
+        latency_target: float = 20.0,
+        backoff: float = 0.5,
+        pause: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.request_bucket = request_bucket
+        self.token_bucket = token_bucket
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = min(max(float(initial_concurrency), min_concurrency), max_concurrency)
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.pause = pause
+        self.clock = clock
+        self.sleep = sleep
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.peak_limit = self.limit
+        self._last_decrease = float("-inf")
+        self._cond: Optional[asyncio.Condition] = None
+
+        # "calls" | "throttled" | "slow" | "errors" | "decreases" | "waited_s" -> total
+        self.stats: Counter = Counter()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], root: Optional[Path] = None) -> Optional["AdaptiveLimiter"]:
+        """
+        Build from the `rate_limit` section, or None when disabled.
+
+            enabled: true | false | "auto" (on for `*-cloud` models)
+            requests_per_second, tokens_per_minute (0 = unlimited)
+            initial_concurrency, min_concurrency, max_concurrency,
+            latency_target_s, backoff, shared (coordinate through
+            <root>/.ai/rate_limit.db)
+        """
+        cfg = settings.get("rate_limit", {})
+        enabled = cfg.get("enabled", "auto")
+        if enabled == "auto":
+            enabled = str(settings.get("ai", {}).get("model", "")).endswith("-cloud")
+        if not enabled:
+            return None
+
+        db_path = root / ".ai" / "rate_limit.db" if root is not None and cfg.get("shared") else None
+
+        def bucket(name: str, rate: float) -> Optional[TokenBucket]:
+            if rate <= 0:
+                return None
+            # One second of requests, one minute of tokens
+            capacity = max(rate, 1.0) if name == "requests" else rate * 60
+            if db_path is not None:
+                return SharedTokenBucket(db_path, name, rate, capacity)
+            return TokenBucket(rate, capacity)
+
+        return cls(
+            request_bucket=bucket("requests", float(cfg.get("requests_per_second", 0))),
+            token_bucket=bucket("tokens", float(cfg.get("tokens_per_minute", 0)) / 60),
+            initial_concurrency=float(cfg.get("initial_concurrency", 2)),
+            min_concurrency=float(cfg.get("min_concurrency", 1)),
+            max_concurrency=float(cfg.get("max_concurrency", 8)),
+            latency_target=float(cfg.get("latency_target_s", 20)),
+            backoff=float(cfg.get("backoff", 0.5)),
+        )
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _rate_wait(self, tokens: int) -> float:
+        wait = max(0.0, self.paused_until - self.clock())
+        for bucket, amount in ((self.request_bucket, 1), (self.token_bucket, tokens)):
+            if isinstance(bucket, SharedTokenBucket):
+                # Blocks on other processes' locks: keep it off the event loop
+                wait = max(wait, await asyncio.to_thread(bucket.reserve, amount))
+            elif bucket is not None:
+                wait = max(wait, bucket.reserve(amount))
+        return wait
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0):
+        """
+        Hold one concurrency slot and the rate budget for a single call.
+        """
+        cond = self._condition()
+        with queued():
+            async with cond:
+                await cond.wait_for(lambda: self.in_flight < int(self.limit))
+                self.in_flight += 1
+
+        error: Optional[BaseException] = None
+        started = self.clock()
+        try:
+            with queued():
+                wait = await self._rate_wait(tokens)
+                if wait > 0:
+                    self.stats["waited_s"] += wait
+                    await self.sleep(wait)
+            started = self.clock()
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            async with cond:
+                self.in_flight -= 1
+                self._observe(started, error)
+                cond.notify_all()
+
+    def _observe(self, started: float, error: Optional[BaseException]):
+        now = self.clock()
+        latency = now - started
+        self.stats["calls"] += 1
+
+        if isinstance(error, asyncio.CancelledError):
+            # Cut off by the caller (timeout or early stop): only slowness counts
+            if latency > self.latency_target:
+                self.stats["slow"] += 1
+                self._decrease(started, now)
+        elif error is not None and is_throttled(error):
+            self.stats["throttled"] += 1
+            self.paused_until = max(self.paused_until, now + (retry_after(error) or self.pause))
+            self._decrease(started, now)
+        elif error is not None:
+            self.stats["errors"] += 1
+            if _is_timeout(error):
+                self._decrease(started, now)
+        elif latency > self.latency_target:
+            self.stats["slow"] += 1
+            self._decrease(started, now)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def _decrease(self, started: float, now: float):
+        if started <= self._last_decrease:
+            return
+        self.limit = max(self.min_concurrency, self.limit * self.backoff)
+        self._last_decrease = now
+        self.stats["decreases"] += 1
+
+    def report(self) -> List[str]:
+        return [
+            f"concurrency={int(self.limit)} peak={int(self.peak_limit)}",
+            f"calls={self.stats['calls']} throttled={self.stats['throttled']} "
+            f"slow={self.stats['slow']} errors={self.stats['errors']} "
+            f"decreases={self.stats['decreases']}",
+            f"rate_wait={self.stats['waited_s']:.1f}s",
+        ]
+
+    def close(self):
+        for bucket in (self.request_bucket, self.token_bucket):
+            if isinstance(bucket, SharedTokenBucket):
+                bucket.close()
+
+
+class RateLimitedBackend(LLMBackend):
+    """
+    Runs every generation call through an AdaptiveLimiter. The token
+    budget is charged with the prompt estimate plus the site's output cap.
+    """
+
+    def __init__(self, inner: LLMBackend, limiter: AdaptiveLimiter):
+        super().__init__()
+        self.inner = inner
+        self.limiter = limiter
+        self.name = f"limited-{inner.name}"
+        self.supports_system = inner.supports_system
+        self.profiles = inner.profiles
+        self.prompt_stats = inner.prompt_stats
+        self.generation_stats = inner.generation_stats
+
+    def _tokens(self, prompt: str, site: Optional[str], system: Optional[str]) -> int:
+        tokens = estimate_tokens(prompt) + (estimate_tokens(system) if system else 0)
+        profile = self.profiles.get(site)
+        if profile is not None and profile.max_tokens:
+            tokens += profile.max_tokens
+        return tokens
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        async with self.limiter.slot(self._tokens(prompt, site, system)):
+            return await self.inner.generate(prompt, model=model, site=site, system=system, **options)
+
+    async def generate_until(
+        self,
+        prompt: str,
+        *,
+        done: Callable[[str], bool],
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        async with self.limiter.slot(self._tokens(prompt, site, system)):
+            return await self.inner.generate_until(
+                prompt, done=done, model=model, site=site, system=system, **options
+            )
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        return await self.inner.warm_up(model)
+
+    def idle_for(self) -> float:
+        return self.inner.idle_for()
+
+    def close(self):
+        self.inner.close()
+        self.limiter.close()
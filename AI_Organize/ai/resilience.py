@@ -0,0 +1,377 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import random
+import threading
+import time
+import numpy as np
+
+from AI_Organize.ai.embeddings import EmbeddingBackend
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling the model server while the breaker is open.
+    """
+
+
+# ----------------------------
+# Circuit breaker
+# ----------------------------
+
+class CircuitBreaker:
+    """
+    Shared breaker for every call to the model server.
+
+    closed    -> calls go through; `failure_threshold` consecutive failures open it
+    open      -> calls are rejected for `reset_timeout` seconds
+    half-open -> one trial call; success closes, failure re-opens
+
+    Thread-safe: blocking call sites run on worker threads.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.failures = 0
+        self.times_opened = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+
+            if self._opened_at is not None or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self._opened_at = self.clock()
+
+
+# ----------------------------
+# Queue time
+# ----------------------------
+
+class _QueueTime:
+    """
+    Seconds one call has spent queued behind a limiter so far.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.since: Optional[float] = None
+
+    def total(self, now: float) -> float:
+        return self.seconds + (now - self.since if self.since is not None else 0.0)
+
+
+_queue_time: ContextVar[Optional[_QueueTime]] = ContextVar("queue_time", default=None)
+
+
+@contextmanager
+def queued():
+    """
+    Mark a wait for capacity (e.g. a rate limiter's queue) so the
+    enclosing `Resilience.call` does not charge it to the call's timeout.
+    """
+    queue = _queue_time.get()
+    if queue is not None:
+        queue.since = time.monotonic()
+    try:
+        yield
+    finally:
+        if queue is not None:
+            queue.seconds += time.monotonic() - queue.since
+            queue.since = None
+
+
+# ----------------------------
+# Per-site policy
+# ----------------------------
+
+@dataclass
+class CallPolicy:
+    timeout: float
+    retries: int = 2
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+
+
+# Call sites and their defaults (seconds)
+DEFAULT_POLICIES = {
+    "classify": CallPolicy(timeout=60.0),
+    "summary": CallPolicy(timeout=30.0),
+    "directory_summary": CallPolicy(timeout=60.0),
+    "embed": CallPolicy(timeout=10.0),
+}
+
+
+class Resilience:
+    """
+    Timeouts, bounded retries with jittered exponential backoff, and one
+    circuit breaker shared by all call sites.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, CallPolicy]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.breaker = breaker or CircuitBreaker()
+        self.rng = rng
+
+        # (site, event) -> count; events: calls, timeouts, errors, retries, rejected
+        self.stats: Counter = Counter()
+
+        # Guards stats and the executor: call_sync runs on worker threads
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _count(self, site: str, event: str):
+        with self._lock:
+            self.stats[(site, event)] += 1
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "Resilience":
+        """
+        Build from the `resilience` settings section:
+            timeouts: {site: seconds}, retries, backoff,
+            failure_threshold, reset_timeout
+        """
+        cfg = settings.get("resilience", {})
+        timeouts = cfg.get("timeouts", {})
+
+        policies = {
+            site: CallPolicy(
+                timeout=float(timeouts.get(site, default.timeout)),
+                retries=int(cfg.get("retries", default.retries)),
+                backoff=float(cfg.get("backoff", default.backoff)),
+            )
+            for site, default in DEFAULT_POLICIES.items()
+        }
+
+        return cls(
+            policies,
+            CircuitBreaker(
+                failure_threshold=int(cfg.get("failure_threshold", 5)),
+                reset_timeout=float(cfg.get("reset_timeout", 30.0)),
+            ),
+        )
+
+    def _delay(self, policy: CallPolicy, attempt: int) -> float:
+        # Full exponential step, jittered into [0.5, 1.0) of it
+        step = min(policy.max_backoff, policy.backoff * (2 ** attempt))
+        return step * (0.5 + self.rng() / 2)
+
+    # -------- Async call sites --------
+
+    async def call(self, site: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        policy = self.policies[site]
+
+        for attempt in range(policy.retries + 1):
+            if not self.breaker.allow():
+                self._count(site, "rejected")
+                raise CircuitOpenError(f"Model server circuit is open ({site})")
+
+            self._count(site, "calls")
+            try:
+                result = await self._with_timeout(fn(*args, **kwargs), policy.timeout)
+            except asyncio.TimeoutError:
+                self._count(site, "timeouts")
+                self.breaker.record_failure()
+                error: Exception = TimeoutError(f"{site} timed out after {policy.timeout}s")
+            except Exception as e:
+                self._count(site, "errors")
+                self.breaker.record_failure()
+                error = e
+            else:
+                self.breaker.record_success()
+                return result
+
+            if attempt == policy.retries:
+                raise error
+
+            self._count(site, "retries")
+            await asyncio.sleep(self._delay(policy, attempt))
+
+    @staticmethod
+    async def _with_timeout(coro: Awaitable[Any], timeout: float) -> Any:
+        """
+        `asyncio.wait_for`, except that time spent inside `queued()`
+        extends the deadline: only the call itself is timed.
+        """
+        queue = _QueueTime()
+        token = _queue_time.set(queue)
+        try:
+            task = asyncio.ensure_future(coro)    # runs with `queue` in its context
+        finally:
+            _queue_time.reset(token)
+
+        started = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                remaining = started + timeout + queue.total(now) - now
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                if done:
+                    return task.result()
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        raise asyncio.TimeoutError
+
+    def wrap(self, site: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """
+        Return `fn` guarded by this site's policy (for `ai_call=` parameters).
+        """
+        async def guarded(*args, **kwargs):
+            return await self.call(site, fn, *args, **kwargs)
+
+        return guarded
+
+    # -------- Blocking call sites --------
+
+    def call_sync(self, site: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Same policy for blocking calls: `fn` runs on a worker thread so the
+        caller stops waiting at the timeout (a hung thread is abandoned).
+        """
+        policy = self.policies[site]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-call")
+            executor = self._executor
+
+        for attempt in range(policy.retries + 1):
+            if not self.breaker.allow():
+                self._count(site, "rejected")
+                raise CircuitOpenError(f"Model server circuit is open ({site})")
+
+            self._count(site, "calls")
+            try:
+                result = executor.submit(fn, *args, **kwargs).result(policy.timeout)
+            except FutureTimeoutError:
+                self._count(site, "timeouts")
+                self.breaker.record_failure()
+                error: Exception = TimeoutError(f"{site} timed out after {policy.timeout}s")
+            except Exception as e:
+                self._count(site, "errors")
+                self.breaker.record_failure()
+                error = e
+            else:
+                self.breaker.record_success()
+                return result
+
+            if attempt == policy.retries:
+                raise error
+
+            self._count(site, "retries")
+            time.sleep(self._delay(policy, attempt))
+
+    def close(self):
+        """
+        Release the worker threads of blocking call sites. Hung calls are
+        abandoned, not waited for.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------- Reporting --------
+
+    @property
+    def had_failures(self) -> bool:
+        with self._lock:
+            counts = list(self.stats.items())
+        return any(
+            count
+            for (_, event), count in counts
+            if event in ("timeouts", "errors", "rejected")
+        )
+
+    def report(self) -> List[str]:
+        """
+        One line for the breaker plus one per site that was used.
+        """
+        lines = [
+            f"circuit={self.breaker.state} opened={self.breaker.times_opened}"
+        ]
+
+        for site in self.policies:
+            counts = {
+                event: self.stats[(site, event)]
+                for event in ("calls", "timeouts", "errors", "retries", "rejected")
+            }
+            if any(counts.values()):
+                lines.append(
+                    f"{site}: " + " ".join(f"{k}={v}" for k, v in counts.items())
+                )
+
+        return lines
+
+
+class ResilientEmbedder(EmbeddingBackend):
+    """
+    Embedding backend guarded by the "embed" policy. Keeps the wrapped
+    backend's name so stored vectors stay comparable.
+    """
+
+    def __init__(self, inner: EmbeddingBackend, resilience: Resilience):
+        self.inner = inner
+        self.resilience = resilience
+        self.name = inner.name
+        self.supports_batch = inner.supports_batch
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.resilience.call_sync("embed", self.inner.embed, text)
+
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        return self.resilience.call_sync("embed", self.inner.embed_many, texts)
+
+    def close(self):
+        self.inner.close()
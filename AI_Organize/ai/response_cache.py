@@ -0,0 +1,241 @@
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import hashlib
+import json
+import re
+import sqlite3
+import time
+
+from AI_Organize.ai.backends import LLMBackend
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapse insignificant whitespace so cosmetic differences
+    (indentation, trailing spaces, blank lines) share one cache entry.
+    """
+    lines = (re.sub(r"\s+", " ", line).strip() for line in prompt.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def cache_key(model: Optional[str], prompt: str, options: Dict[str, Any]) -> str:
+    prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode()).hexdigest()
+    raw = json.dumps([model or "", prompt_hash, options], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent LLM response cache (SQLite).
+
+    Keyed by (model, sha256(normalized prompt), generation options).
+    Entries expire after `ttl` seconds; beyond `max_entries` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        clock=time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+        # (site, "hits" | "misses") -> count
+        self.stats: Counter = Counter()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                site TEXT,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)"
+        )
+        self.conn.commit()
+
+    def get(
+        self,
+        model: Optional[str],
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        *,
+        site: Optional[str] = None,
+    ) -> Optional[str]:
+        key = cache_key(model, prompt, options or {})
+        now = self.clock()
+
+        row = self.conn.execute(
+            "SELECT response, created FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                self.conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self.conn.commit()
+            self.stats[(site, "misses")] += 1
+            return None
+
+        self.conn.execute(
+            "UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key)
+        )
+        self.conn.commit()
+        self.stats[(site, "hits")] += 1
+        return row[0]
+
+    def put(
+        self,
+        model: Optional[str],
+        prompt: str,
+        response: str,
+        options: Optional[Dict[str, Any]] = None,
+        *,
+        site: Optional[str] = None,
+    ):
+        now = self.clock()
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_responses
+                (key, model, site, response, created, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (cache_key(model, prompt, options or {}), model, site, response, now, now),
+        )
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        self.conn.execute(
+            """
+            DELETE FROM llm_responses WHERE key IN (
+                SELECT key FROM llm_responses
+                ORDER BY last_used DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def hit_rate(self, site: Optional[str] = None) -> float:
+        def count(event):
+            return sum(
+                n for (s, e), n in self.stats.items()
+                if e == event and (site is None or s == site)
+            )
+
+        hits, misses = count("hits"), count("misses")
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def report(self) -> List[str]:
+        sites = sorted({s for s, _ in self.stats}, key=str)
+        return [
+            f"{site}: hits={self.stats[(site, 'hits')]} "
+            f"misses={self.stats[(site, 'misses')]} "
+            f"hit_rate={self.hit_rate(site):.0%}"
+            for site in sites
+        ]
+
+    def close(self):
+        self.conn.close()
+
+
+class CachedBackend(LLMBackend):
+    """
+    Serves repeated prompts from a ResponseCache. Only calls tagged with
+    one of `sites` are cached; everything else goes straight through.
+    """
+
+    def __init__(self, inner: LLMBackend, cache: ResponseCache, sites: Iterable[str]):
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+        self.sites = set(sites)
+        self.name = f"cached-{inner.name}"
+        self.profiles = inner.profiles
+        self.prompt_stats = inner.prompt_stats
+        self.generation_stats = inner.generation_stats
+
+    def _key_options(
+        self, site: Optional[str], system: Optional[str], options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        # Anything that changes the output is part of the key
+        key_options = dict(options)
+        if system:
+            key_options["system"] = system
+        if site in self.profiles:
+            key_options["profile"] = asdict(self.profiles[site])
+        return key_options
+
+    async def _cached(self, call, prompt, model, site, system, options) -> str:
+        if site not in self.sites:
+            return await call()
+
+        key_options = self._key_options(site, system, options)
+
+        cached = self.cache.get(model, prompt, key_options, site=site)
+        if cached is not None:
+            return cached
+
+        response = await call()
+        if response:
+            self.cache.put(model, prompt, response, key_options, site=site)
+        return response
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        def call():
+            return self.inner.generate(prompt, model=model, site=site, system=system, **options)
+
+        return await self._cached(call, prompt, model, site, system, options)
+
+    async def generate_until(
+        self,
+        prompt: str,
+        *,
+        done: Callable[[str], bool],
+        model: Optional[str] = None,
+        site: Optional[str] = None,
+        system: Optional[str] = None,
+        **options,
+    ) -> str:
+        def call():
+            return self.inner.generate_until(
+                prompt, done=done, model=model, site=site, system=system, **options
+            )
+
+        return await self._cached(call, prompt, model, site, system, options)
+
+    async def warm_up(self, model: Optional[str]) -> bool:
+        return await self.inner.warm_up(model)
+
+    def idle_for(self) -> float:
+        return self.inner.idle_for()
+
+    def close(self):
+        self.inner.close()
+        self.cache.close()
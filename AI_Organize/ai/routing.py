@@ -0,0 +1,143 @@
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import time
+
+
+DEFAULT_TIER = "default"
+
+
+class ModelRouter:
+    """
+    Maps each call site to a model tier.
+
+    `tiers` maps a tier name to a model; a tier without a model uses
+    the run's default (`ai.model`). Classification routed to a cheaper
+    tier is retried on `escalate_to` when its answer looks unreliable
+    (see `should_escalate`).
+
+    Disabled, every site uses the default model.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[Dict[str, Optional[str]]] = None,
+        sites: Optional[Dict[str, str]] = None,
+        *,
+        escalate_to: str = "large",
+        escalate_below: float = 0.6,
+        memory_floor: float = 0.8,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.tiers = dict(tiers or {})
+        self.sites = dict(sites or {})
+        self.escalate_to = escalate_to
+        self.escalate_below = escalate_below
+        self.memory_floor = memory_floor
+        self.enabled = enabled
+        self.clock = clock
+
+        # (tier, "calls" | "errors" | "seconds") -> total
+        self.stats: Counter = Counter()
+        # site -> number of escalations
+        self.escalations: Counter = Counter()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "ModelRouter":
+        """
+        Build from the `routing` settings section:
+            enabled, tiers: {tier: model | null}, sites: {site: tier},
+            escalate_to, escalate_below, memory_floor
+        """
+        cfg = settings.get("routing", {})
+        return cls(
+            cfg.get("tiers", {}),
+            cfg.get("sites", {}),
+            escalate_to=cfg.get("escalate_to", "large"),
+            escalate_below=float(cfg.get("escalate_below", 0.6)),
+            memory_floor=float(cfg.get("memory_floor", 0.8)),
+            enabled=bool(cfg.get("enabled", False)),
+        )
+
+    def route(self, site: str, default_model: Optional[str]) -> Tuple[str, Optional[str]]:
+        """
+        (tier, model) for a call site.
+        """
+        if not self.enabled or site not in self.sites:
+            return DEFAULT_TIER, default_model
+        return self._tier(self.sites[site], default_model)
+
+    def escalation(self, default_model: Optional[str]) -> Tuple[str, Optional[str]]:
+        if not self.enabled:
+            return DEFAULT_TIER, default_model
+        return self._tier(self.escalate_to, default_model)
+
+    def record_escalation(self, site: str):
+        """
+        Count an escalated call at `site` (shown by `report`).
+        """
+        self.escalations[site] += 1
+
+    def _tier(self, tier: str, default_model: Optional[str]) -> Tuple[str, Optional[str]]:
+        return tier, self.tiers.get(tier) or default_model
+
+    def can_escalate(self, tier: str, model: Optional[str], default_model: Optional[str]) -> bool:
+        return self.enabled and self.escalation(default_model) != (tier, model)
+
+    def should_escalate(
+        self,
+        folders: List[str],
+        *,
+        best_confidence: float,
+        memory_folder: Optional[str],
+        memory_score: float = 1.0,
+    ) -> bool:
+        """
+        The cheap answer is not trusted when it is empty, disagrees with
+        the folder memory would pick, or stays below `escalate_below`.
+        Memory only disagrees when its hit reaches `memory_floor`; a
+        weak, loosely similar match is no evidence against the answer.
+        """
+        if not folders:
+            return True
+        if memory_folder and memory_score >= self.memory_floor and memory_folder not in folders:
+            return True
+        return best_confidence < self.escalate_below
+
+    def timed(self, tier: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """
+        Return `fn` with its calls and latency counted under `tier`.
+        """
+        async def call(*args, **kwargs):
+            self.stats[(tier, "calls")] += 1
+            started = self.clock()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                self.stats[(tier, "errors")] += 1
+                raise
+            finally:
+                self.stats[(tier, "seconds")] += self.clock() - started
+
+        return call
+
+    def report(self) -> List[str]:
+        """
+        One line per tier that was used, plus escalations.
+        """
+        lines = []
+        for tier in sorted({t for t, _ in self.stats}):
+            calls = self.stats[(tier, "calls")]
+            model = self.tiers.get(tier) or "default"
+            lines.append(
+                f"{tier} ({model}): calls={calls} errors={self.stats[(tier, 'errors')]} "
+                f"avg_latency={self.stats[(tier, 'seconds')] / calls:.2f}s"
+            )
+
+        if self.escalations:
+            lines.append(
+                "escalations: "
+                + " ".join(f"{site}={n}" for site, n in sorted(self.escalations.items()))
+            )
+
+        return lines
@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional
+import re
+
+
+CHARS_PER_TOKEN = 4  # rough average for folder names and English text
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN + 1)
+
+
+def _folder_tokens(folder: str) -> List[str]:
+    # Split on separators and camelCase boundaries: "TaxReturns/2024" -> tax, returns
+    spaced = re.sub(r"([a-z])([A-Z])", r"\1 \2", folder)
+    return [t.lower() for t in re.findall(r"[a-zA-Z]{3,}", spaced)]
+
+
+def _lexical_score(query: set, folder: str) -> float:
+    """
+    Fraction of the folder's tokens that overlap the query tokens.
+    Prefix containment counts, so "photo" matches "photos".
+    """
+    tokens = _folder_tokens(folder)
+    if not tokens or not query:
+        return 0.0
+
+    hits = 0
+    for token in tokens:
+        if token in query or any(
+            q.startswith(token) or token.startswith(q) for q in query
+        ):
+            hits += 1
+
+    return hits / len(tokens)
+
+
+def shortlist_folders(
+    folders: List[str],
+    *,
+    query_tokens: List[str],
+    memory_scores: Optional[Dict[str, float]] = None,
+    description_scores: Optional[Dict[str, float]] = None,
+    top_k: int = 40,
+    token_budget: Optional[int] = None,
+) -> List[str]:
+    """
+    Rank candidate folders for a file and keep the best `top_k` that fit
+    within `token_budget` prompt tokens.
+
+    Score = lexical overlap + memory score + description similarity.
+    When everything fits, all folders are returned in their original order
+    so small trees see an unchanged prompt.
+    """
+    memory_scores = memory_scores or {}
+    description_scores = description_scores or {}
+
+    total_tokens = sum(estimate_tokens(f) for f in folders)
+    if len(folders) <= top_k and (token_budget is None or total_tokens <= token_budget):
+        return list(folders)
+
+    query = {t.lower() for t in query_tokens}
+
+    ranked = sorted(
+        folders,
+        key=lambda f: (
+            -(
+                _lexical_score(query, f)
+                + memory_scores.get(f, 0.0)
+                + description_scores.get(f, 0.0)
+            ),
+            f,
+        ),
+    )
+
+    selected: List[str] = []
+    used = 0
+    for folder in ranked:
+        if len(selected) >= top_k:
+            break
+
+        cost = estimate_tokens(folder)
+        if token_budget is not None and used + cost > token_budget:
+            break
+
+        selected.append(folder)
+        used += cost
+
+    return selected
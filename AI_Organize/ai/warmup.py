@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import time
+
+from AI_Organize.ai.backends import LLMBackend
+
+
+class ModelWarmer:
+    """
+    Loads the run's models in the background and keeps them loaded.
+
+    `start()` sends one warm-up per model right away (so the cold load
+    overlaps the directory scan), then re-sends them whenever the
+    backend has been idle for `refresh_interval` seconds, e.g. while the
+    user sits at a prompt. Failures are recorded, never raised.
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        models: Iterable[Optional[str]],
+        *,
+        refresh_interval: float = 240.0,
+    ):
+        self.backend = backend
+        self.models: List[str] = sorted({m for m in models if m})
+        self.refresh_interval = refresh_interval
+
+        self.warmed: Dict[str, float] = {}     # model -> seconds to load
+        self.failed: Dict[str, str] = {}       # model -> last error
+        self.refreshes = 0
+        self.ready = asyncio.Event()
+
+        self._task: Optional[asyncio.Task] = None
+
+    async def warm_up(self):
+        async def one(model: str):
+            started = time.perf_counter()
+            try:
+                if await self.backend.warm_up(model):
+                    self.warmed[model] = time.perf_counter() - started
+                    self.failed.pop(model, None)
+            except Exception as e:
+                self.failed[model] = str(e) or type(e).__name__
+
+        await asyncio.gather(*(one(m) for m in self.models))
+
+    def start(self):
+        if self._task is None and self.models:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        await self.warm_up()
+        self.ready.set()
+
+        if self.refresh_interval <= 0:
+            return
+
+        while True:
+            await asyncio.sleep(self.refresh_interval / 2)
+            if self.backend.idle_for() >= self.refresh_interval:
+                await self.warm_up()
+                self.refreshes += 1
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def report(self) -> List[str]:
+        lines = [f"{m}: loaded in {s:.2f}s" for m, s in sorted(self.warmed.items())]
+        lines += [f"{m}: failed ({e})" for m, e in sorted(self.failed.items())]
+        if self.refreshes:
+            lines.append(f"keep-alive refreshes={self.refreshes}")
+        return lines
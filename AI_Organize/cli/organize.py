@@ -1,13 +1,37 @@
 import asyncio
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from AI_Organize.core.scanner import scan_directory_async, IgnoreRules
-from AI_Organize.core.models import DirectoryContext, build_file_context
+from AI_Organize.core.models import DirectoryContext, FileContext, build_file_context
 from AI_Organize.core.memory import MemoryStore
+from AI_Organize.core.rules import RULES_FILE_NAME, Rule, load_rules
 from AI_Organize.core.trash import move_to_trash, cleanup_trash
-from AI_Organize.ai.organizer import suggest_folders
+from AI_Organize.core.dedup import SingleFlight, find_duplicates
+from AI_Organize.ai.organizer import memory_embedding_text, suggest_folders
+from AI_Organize.ai.local_classifier import LocalClassifier, name_tokens
+from AI_Organize.ai.embeddings import HashingEmbedder, get_embedder
+from AI_Organize.ai.resilience import Resilience, ResilientEmbedder
+from AI_Organize.ai.backends import get_backend
+from AI_Organize.ai.response_cache import CachedBackend, ResponseCache
+from AI_Organize.ai.routing import ModelRouter
+from AI_Organize.ai.balancer import BalancedBackend
+from AI_Organize.ai.rate_limit import AdaptiveLimiter, RateLimitedBackend
+from AI_Organize.ai.cassette import (
+    Cassette,
+    RecordingBackend,
+    RecordingEmbedder,
+    ReplayBackend,
+    ReplayEmbedder,
+)
+from AI_Organize.ai.generation import profiles_from_settings
+from AI_Organize.ai.warmup import ModelWarmer
+from AI_Organize.ai.embedding_service import EmbeddingService
+from AI_Organize.ai.filename_templates import TemplateIndex, filename_template
+from AI_Organize.ai.clustering import FileCluster, cluster_files, cluster_files_async
+from AI_Organize.ai.destination_index import DestinationIndex
+from AI_Organize.ai.local_summary import SUMMARY_MODES, LocalSummarizer
 
 # ----------------------------
 # Settings
@@ -17,11 +41,111 @@ DEFAULT_SETTINGS = {
     "ai": {
         "model": "gpt-oss:120b-cloud",
         "enable_directory_summaries": True,
+        "backend": "akinus",
+        "ollama_url": "http://localhost:11434",
+        "ollama_pool_size": 4,
+        "keep_alive": "5m",
+        "endpoints": [],
+        "balance_strategy": "least-outstanding",
+        "eject_after": 3,
+        "eject_seconds": 30,
+        "embedding_backend": "ollama",
+        "embedding_model": "nomic-embed-text",
+        "embedding_batch_size": 32,
+        "embedding_batch_window_ms": 5,
+        "embedding_dim": 512,
+        "context_weight": 0.2,
+        "folder_shortlist_size": 40,
+        "folder_prompt_token_budget": 600,
+        "lazy_summary": True,
+        "lazy_summary_threshold": 0.80,
+        "summary_mode": "local-then-llm",
+        "stream_responses": True,
+        "warm_up": True,
+        "keep_alive_refresh_s": 240,
+        "generation": {
+            "classify": {"max_tokens": None, "temperature": 0.0, "stop": [], "json": False},
+            "summary": {"max_tokens": None, "temperature": 0.2, "stop": [], "json": False},
+            "directory_summary": {"max_tokens": None, "temperature": 0.2, "stop": [], "json": False},
+        },
     },
     "behavior": {
         "auto_move_enabled": True,
         "auto_move_threshold": 0.95,
         "ask_global_threshold": 0.60,
+        "prefetch_depth": 2,
+    },
+    "memory": {
+        "fastpath_enabled": True,
+        "fastpath_similarity": 0.97,
+        "fastpath_confidence": 0.90,
+        "fastpath_skip_summary": False,
+    },
+    "templates": {
+        "enabled": True,
+        "min_count": 3,
+        "min_share": 0.90,
+    },
+    "destinations": {
+        "enabled": True,
+        "min_similarity": 0.35,
+        "skip_llm_similarity": 0.75,
+        "skip_llm_margin": 0.10,
+    },
+    "clustering": {
+        "enabled": True,
+        "use_embeddings": False,
+        "similarity": 0.90,
+    },
+    "dedup": {
+        "enabled": True,
+    },
+    "local_model": {
+        "enabled": True,
+        "min_samples": 20,
+        "confidence_threshold": 0.90,
+    },
+    "resilience": {
+        "timeouts": {
+            "classify": 60,
+            "summary": 30,
+            "directory_summary": 60,
+            "embed": 10,
+        },
+        "retries": 2,
+        "backoff": 0.5,
+        "failure_threshold": 5,
+        "reset_timeout": 30,
+    },
+    "cache": {
+        "enabled": False,
+        "sites": ["classify", "summary", "directory_summary"],
+        "ttl_hours": 168,
+        "max_entries": 5000,
+    },
+    "rate_limit": {
+        "enabled": "auto",
+        "requests_per_second": 0,
+        "tokens_per_minute": 0,
+        "initial_concurrency": 2,
+        "min_concurrency": 1,
+        "max_concurrency": 8,
+        "latency_target_s": 20,
+        "backoff": 0.5,
+        "shared": False,
+    },
+    "cassette": {
+        "mode": "off",
+        "path": ".ai/cassette.jsonl.gz",
+        "latency": "original",
+    },
+    "routing": {
+        "enabled": False,
+        "tiers": {"small": "llama3.2:3b", "large": None},
+        "sites": {"directory_summary": "small", "summary": "small", "classify": "small"},
+        "escalate_to": "large",
+        "escalate_below": 0.6,
+        "memory_floor": 0.8,
     },
     "trash": {"retention_days": 14},
 }
@@ -61,6 +185,61 @@ def load_settings(project_root=None) -> Dict[str, Any]:
 # CLI Orchestrator
 # ----------------------------
 
+async def _move_files(files: List[FileContext], dest: Path):
+    """
+    Move files into `dest` (created if needed), skipping files already there.
+    """
+    from akinus.utils.logger import log
+
+    dest.mkdir(parents=True, exist_ok=True)
+
+    for file_ctx in files:
+        if file_ctx.path.parent.resolve() == dest.resolve():
+            continue
+
+        file_ctx.path.rename(dest / file_ctx.name)
+        await log(
+            "INFO",
+            "organize",
+            f"[FILE-MOVED] {file_ctx.name} → {dest}",
+        )
+
+
+async def _ainput(prompt: str = "") -> str:
+    """
+    input() on a worker thread, so the event loop (and prefetching)
+    keeps running while the user reads and decides.
+    """
+    return await asyncio.to_thread(input, prompt)
+
+
+async def _keep_copies(copies: List[FileContext], root: Path) -> List[FileContext]:
+    """
+    Offer identical copies for the trash.
+    Returns the copies that should be moved along with their original.
+    """
+    from akinus.utils.logger import log
+
+    if not copies:
+        return []
+
+    resp = (await _ainput(
+        f"Trash {len(copies)} identical cop{'y' if len(copies) == 1 else 'ies'} "
+        "instead of moving? [y/N]: "
+    )).strip().lower()
+    if resp != "y":
+        return copies
+
+    for copy in copies:
+        move_to_trash(copy.path, root)
+        await log(
+            "INFO",
+            "organize",
+            f"[DUPLICATE-TRASH] file={copy.name}",
+        )
+    return []
+
+
 def status(msg: str):
     print("\r" + " " * 100, end="")   # clear line
     print(f"\r{msg}", end="", flush=True)
@@ -81,8 +260,6 @@ async def run(
      # -- Lazy imports from akinus modules --
     from akinus.utils.app_details import PROJECT_ROOT as DEFAULT_ROOT, APP_NAME
     from AI_Organize.cli.model_resolution import resolve_ollama_model
-    from akinus.ai.ollama import embed_with_ollama
-    from akinus.ai.ollama import ollama_query
 
     root = project_root or DEFAULT_ROOT
 
@@ -103,9 +280,25 @@ async def run(
     settings["behavior"].setdefault("auto_move_enabled", True)
     settings["behavior"].setdefault("auto_move_threshold", 0.95)
     settings["behavior"].setdefault("ask_global_threshold", 0.75)
+    settings["behavior"].setdefault("prefetch_depth", 2)
     settings.setdefault("trash", {})
     settings["trash"].setdefault("retention_days", 30)
     settings.setdefault("ai", {})
+    settings.setdefault("memory", {})
+    settings.setdefault("local_model", {})
+    settings.setdefault("templates", {})
+    settings.setdefault("clustering", {})
+    settings.setdefault("destinations", {})
+    settings.setdefault("dedup", {})
+    settings.setdefault("resilience", {})
+    settings.setdefault("cache", {})
+    settings.setdefault("rate_limit", {})
+    settings.setdefault("cassette", {})
+    settings.setdefault("routing", {})
+
+    summary_mode = settings["ai"].get("summary_mode", "local-then-llm")
+    if summary_mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {summary_mode}")
     # --------------------------------
 
     use_ai = True
@@ -125,6 +318,15 @@ async def run(
         if model is not None:
             return model
 
+        # ⏯️ REPLAY: the recorded model, without contacting the server
+        if cassette_mode == "replay":
+            model = cassette.model or settings["ai"].get("model")
+            if not model:
+                raise RuntimeError(
+                    f"Cassette {cassette_path} names no model; set ai.model to replay it"
+                )
+            return model
+
         # 🧪 TEST MODE: never prompt
         if is_test:
             await log(
@@ -133,9 +335,11 @@ async def run(
                 "Test mode detected - using default model without resolution",
             )
             model = settings["ai"]["model"]
-            return model
+        else:
+            model = await resolve_ollama_model(settings, root)
 
-        model = await resolve_ollama_model(settings, root)
+        if cassette_mode == "record":
+            cassette.record_model(model)
         return model
     # --------------------------------------
 
@@ -156,64 +360,171 @@ async def run(
         )
 
     ignore = IgnoreRules(ignore_patterns or [])
-    memory = MemoryStore(root / ".ai" / "project.db")
 
-    cleanup_trash(
-        retention_days=settings["trash"]["retention_days"],
-        project_root=root,
-    )
+    # One breaker for every call to the model server
+    resilience = Resilience.from_settings(settings)
 
-    # await log(
-    #     "DEBUG",
-    #     "organize",
-    #     f"\n\tSettings: {json.dumps(settings, indent=2)}\n"
-    # )
+    # Call site -> model tier; cheap tiers escalate to the large one
+    router = ModelRouter.from_settings(settings)
 
-    use_directory_ai = bool(settings.get("ai", {}).get("enable_directory_summaries", True))
+    # Model traffic can be recorded to a cassette and replayed offline
+    cassette_settings = settings["cassette"]
+    cassette_mode = cassette_settings.get("mode", "off")
+    cassette_path = root / cassette_settings.get("path", ".ai/cassette.jsonl.gz")
+    cassette = None
 
-    directories = await scan_directory_async(
-        root,
-        ignore=ignore,
-        max_depth=max_depth,
-        ai_call=ollama_query if use_directory_ai else None,
-        model=await ensure_model() if use_directory_ai else None,
-    )
+    if cassette_mode == "replay":
+        cassette = Cassette.load(cassette_path)
+        replay_latency = cassette_settings.get("latency", "original")
+        backend = ReplayBackend(
+            cassette, latency=replay_latency, profiles=profiles_from_settings(settings)
+        )
+        embedder = ReplayEmbedder(cassette, latency=replay_latency)
+    else:
+        backend = get_backend(settings)
+        embedder = get_embedder(settings, backend)
+    balancer = backend if isinstance(backend, BalancedBackend) else None
+    local_embeddings = isinstance(embedder, HashingEmbedder)
+
+    if cassette_mode == "record":
+        cassette = Cassette.record_to(cassette_path)
+        backend = RecordingBackend(backend, cassette)
+        embedder = RecordingEmbedder(embedder, cassette)
+
+    if not local_embeddings:
+        # Network-backed embeddings go through the breaker
+        embedder = ResilientEmbedder(embedder, resilience)
+
+    # One limiter for every LLM call; on by default for cloud models.
+    # Applied below the cache so cache hits never wait.
+    limiter = AdaptiveLimiter.from_settings(settings, root)
+    if limiter is not None:
+        backend = RateLimitedBackend(backend, limiter)
+
+    # Opt-in: identical prompts are answered from disk
+    cache_settings = settings["cache"]
+    response_cache = None
+    if cache_settings.get("enabled", False):
+        response_cache = ResponseCache(
+            root / ".ai" / "llm_cache.db",
+            ttl=float(cache_settings.get("ttl_hours", 168)) * 3600,
+            max_entries=int(cache_settings.get("max_entries", 5000)),
+        )
+        backend = CachedBackend(
+            backend,
+            response_cache,
+            cache_settings.get("sites", ["classify", "summary", "directory_summary"]),
+        )
 
-    for directory in directories:
-        for filename in list(directory.files):
-            file_path = directory.path / filename
-            if not file_path.exists():
-                continue
+    warmer = None
+    try:
+        # Load every model the run will use while the directory scan runs;
+        # keep them loaded through long interactive pauses. A replay
+        # loads nothing.
+        if settings["ai"].get("warm_up", True) and cassette_mode != "replay":
+            default_model = await ensure_model()
+            warm_models = {default_model, router.escalation(default_model)[1]}
+            warm_models.update(
+                router.route(site, default_model)[1]
+                for site in ("directory_summary", "summary", "classify")
+            )
+            warmer = ModelWarmer(
+                backend,
+                warm_models,
+                refresh_interval=float(settings["ai"].get("keep_alive_refresh_s", 240)),
+            )
+            warmer.start()
 
-            if directory.path == root / ".ai":
-                continue
+        # Embeddings from concurrent tasks are batched off the event loop
+        embedding_service = EmbeddingService(
+            embedder,
+            max_batch=int(settings["ai"].get("embedding_batch_size", 32)),
+            window=float(settings["ai"].get("embedding_batch_window_ms", 5)) / 1000,
+        )
+        memory = MemoryStore(
+            root / ".ai" / "project.db",
+            embedding_backend=embedder.name,
+        )
+        rules = load_rules(root / ".ai" / RULES_FILE_NAME)
+        classifier = LocalClassifier()
+        templates = TemplateIndex()
+        destination_index = DestinationIndex(embedder)
+        summarizer = LocalSummarizer(memory.project_conn)
+
+        if len(rules):
+            await log("INFO", "organize", f"Loaded {len(rules)} placement rules")
+
+        cluster_settings = settings["clustering"]
+        cluster_enabled = cluster_settings.get("enabled", True)
+
+        dedup_enabled = settings["dedup"].get("enabled", True)
+        flights = SingleFlight()
+
+        async def embed_for_memory(file_ctx: FileContext):
+            try:
+                return await embedding_service.embed(memory_embedding_text(file_ctx))
+            except Exception:
+                return None
+
+        async def remember(**decision):
+            """
+            Record a decision in memory; skipped while embeddings are unavailable.
+            """
+            if decision["embedding"] is None:
+                await log(
+                    "WARNING",
+                    "organize",
+                    f"[MEMORY SKIPPED] folder={decision['target_folder']} reason=embedding_unavailable",
+                )
+                return
+            memory.record_decision(**decision)
 
-            if filename == "project.db":
-                continue
+        cleanup_trash(
+            retention_days=settings["trash"]["retention_days"],
+            project_root=root,
+        )
 
-            # Skip internal files
-            if file_path.name in {
-                "project.db",
-                ".ai_directory_summary.json",
-                "README.md",
-            }:
-                continue
+        # await log(
+        #     "DEBUG",
+        #     "organize",
+        #     f"\n\tSettings: {json.dumps(settings, indent=2)}\n"
+        # )
+
+        use_directory_ai = bool(settings.get("ai", {}).get("enable_directory_summaries", True))
+
+        directory_ai_call = None
+        directory_model = None
+        if use_directory_ai:
+            directory_tier, directory_model = router.route("directory_summary", await ensure_model())
+            directory_ai_call = router.timed(
+                directory_tier,
+                resilience.wrap("directory_summary", backend.for_site("directory_summary")),
+            )
 
-            file_ctx = build_file_context(file_path)
+        directories = await scan_directory_async(
+            root,
+            ignore=ignore,
+            max_depth=max_depth,
+            ai_call=directory_ai_call,
+            model=directory_model,
+        )
 
-            status(f"📁 Processing file: {file_ctx.name}")
+        # Scanned summaries describe destination folders
+        descriptions = {d.path: d.description for d in directories if d.description}
 
-            # await log(
-            #     "DEBUG",
-            #     "organize",
-            #     f"\n\tDirectory Context: {[d for d in directories]}",
-            # )
+        if warmer is not None:
+            await log(
+                "INFO",
+                "organize",
+                f"[WARM-UP] models={warmer.models} ready_after_scan={warmer.ready.is_set()}",
+            )
 
+        async def classify(file_ctx: FileContext, content_key) -> List[Dict[str, Any]]:
             valid_destinations = [
                 DirectoryContext(
                     path=p,
                     name=p.name,
-                    description=None,
+                    description=descriptions.get(p.resolve()),
                     files=[],
                     subdirectories=[],
                 )
@@ -223,293 +534,616 @@ async def run(
                 and p.name != ".ai"
             ]
 
+            await destination_index.update_async(valid_destinations, embedding_service)
+
             # await log(
             #     "DEBUG",
             #     "organize",
             #     f"\n\tValid destinations for '{file_ctx.name}': {[d.path for d in valid_destinations]}",
             # )
 
-            suggestions = await suggest_folders(
-                file_ctx=file_ctx,
-                directories=valid_destinations,
-                memory=memory,
-                settings=settings,
-                model=await ensure_model(),
-                root=root,
-            )
-
-            if not suggestions:
-                await log(
-                    "INFO",
-                    "organize",
-                    f"[NO SUGGESTIONS] file={file_ctx.name}",
-                )
-                clear_status()
-                print(f"\nNo suggestions for '{file_ctx.name}'. Skipping.")
-                continue
-
-            best = suggestions[0]
-
-            await log(
-                "INFO",
-                "organize",
-                (
-                    f"[AI ANALYSIS] "
-                    f"file={file_ctx.name} | "
-                    f"top_choice={best['folder']} | "
-                    f"confidence={best['confidence']} | "
-                    f"source={best['source']} | "
-                    f"auto_move_eligible={best['auto_move_eligible']}"
+            model_name = await ensure_model()
+
+            # Identical content elsewhere in the scan was already classified
+            if content_key in classified_content:
+                return [dict(s) for s in classified_content[content_key]]
+
+            # Requests for the same content share one in-flight classification
+            suggestions = await flights.do(
+                content_key,
+                lambda: suggest_folders(
+                    file_ctx=file_ctx,
+                    directories=valid_destinations,
+                    memory=memory,
+                    settings=settings,
+                    model=model_name,
+                    root=root,
+                    classifier=classifier,
+                    embedder=embedder,
+                    embedding_service=embedding_service,
+                    templates=templates,
+                    destinations=destination_index,
+                    summarizer=summarizer,
+                    resilience=resilience,
+                    backend=backend,
+                    router=router,
                 ),
             )
+            if isinstance(content_key, str):
+                classified_content[content_key] = suggestions
+            return [dict(s) for s in suggestions]
+
+        async def rule_choice(rule: Rule) -> List[Dict[str, Any]]:
+            """
+            The rule's target as the only suggestion (auto-move off).
+            """
+            return [{
+                "folder": rule.target,
+                "confidence": rule.confidence,
+                "source": "rule",
+                "stages": ["rule"],
+                "auto_move_eligible": False,
+            }]
+
+        def candidate_files(directory: DirectoryContext):
+            for filename in list(directory.files):
+                file_path = directory.path / filename
+                if not file_path.exists():
+                    continue
 
-            # Build embedding once (used for memory)
-            embedding_text = f"{file_ctx.name} {file_ctx.extension} {file_ctx.mime_type or ''}"
-            embedding = embed_with_ollama(embedding_text)
+                # Skip internal files
+                if file_path.name in {
+                    "project.db",
+                    ".ai_directory_summary.json",
+                    "README.md",
+                }:
+                    continue
 
-            # ----------------------------
-            # Auto-move path
-            # ----------------------------
-            if (
-                auto_enabled
-                and best["auto_move_eligible"]
-                and (root / best["folder"]).exists()
-            ):
-                clear_status()
-                print(
-                    f"\nAuto-moving '{file_ctx.name}' to '{best['folder']}' "
-                    f"(confidence: {best['confidence']})\n"
-                )
-                dest = root / best["folder"]
-                dest.mkdir(parents=True, exist_ok=True)
-                file_path.rename(dest / file_path.name)
-                await log(
-                    "INFO",
-                    "organize",
-                    f"[FILE-MOVED] {file_ctx.name} → {dest}",
-                )
+                yield build_file_context(file_path)
+
+        # ----------------------------
+        # Identical files across the whole scan (sha256 -> suggestions)
+        # ----------------------------
+        content_digests: Dict[Path, str] = {}
+        classified_content: Dict[str, List[Dict[str, Any]]] = {}
+        if dedup_enabled:
+            scanned = [
+                f
+                for d in directories
+                if d.path != root / ".ai"
+                for f in candidate_files(d)
+            ]
+            for digest, group in find_duplicates(scanned).items():
+                for file_ctx in group:
+                    content_digests[file_ctx.path] = digest
 
-                memory.record_decision(
-                    embedding=embedding,
-                    extension=file_ctx.extension,
-                    tokens=[],
-                    target_folder=best["folder"],
-                    directory_description=directory.description,
-                    confidence=best["confidence"],
-                )
+        prefetch_depth = int(settings["behavior"].get("prefetch_depth", 2))
+        prefetch_hits = 0
 
-                await log(
-                    "INFO",
-                    "organize",
-                    (
-                        f"[AUTO-MOVE] "
-                        f"file={file_ctx.name} | "
-                        f"destination={best['folder']} | "
-                        f"confidence={best['confidence']} | "
-                        f"threshold={auto_threshold}"
-                    ),
-                )
+        for directory in directories:
+            if directory.path == root / ".ai":
                 continue
-            
-            if auto_enabled:
-                if not best["auto_move_eligible"]:
+
+            pending = []
+            ruled: List[FileContext] = []
+            rule_for: Dict[Path, Rule] = {}
+
+            for file_ctx in candidate_files(directory):
+                # ----------------------------
+                # Deterministic rules (no AI)
+                # ----------------------------
+                rule = rules.match(file_ctx)
+                if rule is not None and not auto_enabled:
+                    # Auto-move off: the rule's target is offered as the
+                    # only choice, still without any AI call
+                    ruled.append(file_ctx)
+                    rule_for[file_ctx.path] = rule
                     await log(
                         "INFO",
                         "organize",
-                        f"[AUTO-MOVE SKIPPED] file={file_ctx.name} reason=not_eligible",
+                        f"[RULE-MATCH] file={file_ctx.name} | rule={rule.name} | auto_move=off",
+                    )
+                    continue
+
+                if rule is not None:
+                    await _move_files([file_ctx], root / rule.target)
+                    rules.record_applied(rule)
+
+                    await remember(
+                        embedding=await embed_for_memory(file_ctx),
+                        extension=file_ctx.extension,
+                        tokens=name_tokens(file_ctx.name),
+                        target_folder=rule.target,
+                        directory_description=directory.description,
+                        confidence=rule.confidence,
+                        name_template=filename_template(file_ctx.name),
                     )
-                elif best["confidence"] < auto_threshold:
+
                     await log(
                         "INFO",
                         "organize",
                         (
-                            f"[AUTO-MOVE SKIPPED] "
-                            f"file={file_ctx.name} "
-                            f"confidence={best['confidence']} < threshold={auto_threshold}"
+                            f"[RULE-MOVE] "
+                            f"file={file_ctx.name} | "
+                            f"rule={rule.name} | "
+                            f"destination={rule.target}"
                         ),
                     )
+                    continue
+
+                pending.append(file_ctx)
 
             # ----------------------------
-            # Interactive path
+            # Identical copies reuse the original's classification
             # ----------------------------
-            clear_status()
-            print(f"\nFile: {file_ctx.name}")
-            print("Suggested destinations:")
-            for i, s in enumerate(suggestions, 1):
-                print(
-                    f"  [{i}] {s['folder']} "
-                    f"(confidence: {s['confidence']})"
-                )
+            copies_of: Dict[Path, List[FileContext]] = {}
+            content_keys: Dict[Path, str] = {}
+            if dedup_enabled:
+                by_digest: Dict[str, List[FileContext]] = {}
+                for f in pending:
+                    if f.path in content_digests:
+                        by_digest.setdefault(content_digests[f.path], []).append(f)
+
+                for digest, group in by_digest.items():
+                    # Copies in other directories share the classification
+                    original, *copies = group
+                    content_keys[original.path] = digest
+                    if not copies:
+                        continue
+                    copies_of[original.path] = copies
+
+                    await log(
+                        "INFO",
+                        "organize",
+                        f"[DUPLICATES] file={original.name} copies={len(copies)} sha256={digest[:12]}",
+                    )
 
-            print("\n[Enter] accept #1 | [1-3] choose | [o] Other Folder | [n] New Folder | [d] delete | [s] skip")
-            choice = input("> ").strip().lower() or "1"
+                copy_paths = {c.path for group in copies_of.values() for c in group}
+                pending = [f for f in pending if f.path not in copy_paths]
 
-            if choice == "s":
-                await log(
-                    "INFO",
-                    "organize",
-                    f"[SKIP] file={file_ctx.name}",
-                )
-                continue
+            # ----------------------------
+            # Group similar files; classify each group once
+            # ----------------------------
+            if cluster_enabled:
+                use_embeddings = cluster_settings.get("use_embeddings", False)
+                try:
+                    clusters = await cluster_files_async(
+                        pending,
+                        embedding_service if use_embeddings else None,
+                        similarity_threshold=cluster_settings.get("similarity", 0.9),
+                    )
+                except Exception:
+                    # Embeddings unavailable: name templates alone still group files
+                    clusters = cluster_files(pending)
+            else:
+                clusters = [FileCluster(key=f.name, files=[f]) for f in pending]
+
+            # Rule matches waiting for confirmation come first, one per prompt
+            clusters = [FileCluster(key=f.name, files=[f]) for f in ruled] + clusters
+
+            # Classification of upcoming clusters runs while the user answers
+            # the current prompt (index -> task)
+            prefetched: Dict[int, asyncio.Task] = {}
+
+            def prefetch(index: int):
+                if index < len(clusters) and index not in prefetched:
+                    ctx = clusters[index].representative
+                    if ctx.path in rule_for:
+                        prefetched[index] = asyncio.create_task(rule_choice(rule_for[ctx.path]))
+                        return
+                    prefetched[index] = asyncio.create_task(
+                        classify(ctx, content_keys.get(ctx.path, ctx.path))
+                    )
 
-            if choice == "d":
-                # Skip files outside project root data scope (tests + safety)
-                if file_path.name.lower() in {"readme.md", "license", ".gitignore"}:
+            def invalidate_prefetch():
+                """
+                An answer changed the context (new destination folder, or a
+                choice other than the top suggestion): drop speculative results.
+                """
+                for task in prefetched.values():
+                    task.cancel()
+                prefetched.clear()
+                classified_content.clear()
+
+            for index, cluster in enumerate(clusters):
+                file_ctx = cluster.representative
+                file_path = file_ctx.path
+                copies = [c for f in cluster.files for c in copies_of.get(f.path, [])]
+
+                if len(cluster) > 1:
                     await log(
-                        "WARNING",
+                        "INFO",
                         "organize",
-                        f"[DELETE] file={file_ctx.name}",
+                        f"[CLUSTER] key={cluster.key} files={len(cluster)} representative={file_ctx.name}",
                     )
-                    continue
-                clear_status()
-                print(
-                    "Type DELETE to confirm moving to trash "
-                    "(anything else cancels):"
-                )
-                if input("> ") == "DELETE":
-                    move_to_trash(file_path, root)
-                continue
 
-            if choice == "n":
-                clear_status()
-                print("Enter new folder name:")
-                raw = input("> ").strip()
+                status(f"📁 Processing file: {file_ctx.name}")
 
-                # Remove surrounding quotes if present
-                if (
-                    (raw.startswith('"') and raw.endswith('"')) or
-                    (raw.startswith("'") and raw.endswith("'"))
-                ):
-                    new_folder = raw[1:-1].strip()
-                else:
-                    new_folder = raw
+                # await log(
+                #     "DEBUG",
+                #     "organize",
+                #     f"\n\tDirectory Context: {[d for d in directories]}",
+                # )
 
-                if new_folder:
-                    dest = root / new_folder
-                    dest.mkdir(parents=True, exist_ok=True)
+                # Resolve the model before any concurrent work (may prompt);
+                # rule matches alone never need it
+                upcoming = clusters[index : index + 1 + prefetch_depth]
+                if any(c.representative.path not in rule_for for c in upcoming):
+                    await ensure_model()
 
-                    if file_path.parent.resolve() != dest.resolve():
-                        file_path.rename(dest / file_path.name)
-                        await log(
-                            "INFO",
-                            "organize",
-                            f"[FILE-MOVED] {file_ctx.name} → {dest}",
-                        )
+                for ahead in range(index, index + 1 + prefetch_depth):
+                    prefetch(ahead)
 
-                    memory.record_decision(
-                        embedding=embedding,
-                        extension=file_ctx.extension,
-                        tokens=[],
-                        target_folder=new_folder,
-                        directory_description=directory.description,
-                        confidence=0.5,
+                task = prefetched.pop(index)
+                if task.done() and file_path not in rule_for:
+                    prefetch_hits += 1
+
+                suggestions = await task
+
+                if not suggestions:
+                    await log(
+                        "INFO",
+                        "organize",
+                        f"[NO SUGGESTIONS] file={file_ctx.name}",
                     )
+                    clear_status()
+                    print(f"\nNo suggestions for '{file_ctx.name}'. Skipping.")
+                    continue
+
+                best = suggestions[0]
 
                 await log(
                     "INFO",
                     "organize",
                     (
-                        f"[NEW-FOLDER] "
+                        f"[AI ANALYSIS] "
                         f"file={file_ctx.name} | "
-                        f"folder={new_folder} | "
-                        f"confidence=0.5"
+                        f"top_choice={best['folder']} | "
+                        f"confidence={best['confidence']} | "
+                        f"source={best['source']} | "
+                        f"stages={'+'.join(best.get('stages', []))} | "
+                        f"auto_move_eligible={best['auto_move_eligible']}"
                     ),
                 )
 
-                continue
+                # Build embedding once (used for memory)
+                embedding = await embed_for_memory(file_ctx)
 
-            if choice == "o":
-                clear_status()
-                print("Enter exact folder name (relative to current directory):")
-                other_folder = input("> ").strip()
-                if other_folder:
-                    dest = root / other_folder
-                    dest.mkdir(parents=True, exist_ok=True)
-                    file_path.rename(dest / file_path.name)
-                    await log(
-                        "INFO",
-                        "organize",
-                        f"[FILE-MOVED] {file_ctx.name} → {dest}",
+                # ----------------------------
+                # Auto-move path
+                # ----------------------------
+                if (
+                    auto_enabled
+                    and best["auto_move_eligible"]
+                    and (root / best["folder"]).exists()
+                ):
+                    clear_status()
+                    similar = f" and {len(cluster.others)} similar file(s)" if cluster.others else ""
+                    if copies:
+                        similar += f" (+{len(copies)} identical cop{'y' if len(copies) == 1 else 'ies'})"
+                    print(
+                        f"\nAuto-moving '{file_ctx.name}'{similar} to '{best['folder']}' "
+                        f"(confidence: {best['confidence']})\n"
                     )
+                    await _move_files(cluster.files + copies, root / best["folder"])
 
-                    memory.record_decision(
+                    await remember(
                         embedding=embedding,
                         extension=file_ctx.extension,
-                        tokens=[],
-                        target_folder=other_folder,
+                        tokens=name_tokens(file_ctx.name),
+                        target_folder=best["folder"],
                         directory_description=directory.description,
-                        confidence=0.5,  # Medium confidence for user-created folders
+                        confidence=best["confidence"],
+                        name_template=filename_template(file_ctx.name),
                     )
 
-                await log(
-                    "INFO",
-                    "organize",
-                    (
-                        f"[MANUAL-MOVE] "
-                        f"file={file_ctx.name} | "
-                        f"destination={other_folder} | "
-                        f"confidence=0.5"
-                    ),
-                )
+                    await log(
+                        "INFO",
+                        "organize",
+                        (
+                            f"[AUTO-MOVE] "
+                            f"file={file_ctx.name} | "
+                            f"destination={best['folder']} | "
+                            f"confidence={best['confidence']} | "
+                            f"threshold={auto_threshold}"
+                        ),
+                    )
+                    continue
+            
+                if auto_enabled:
+                    if not best["auto_move_eligible"]:
+                        await log(
+                            "INFO",
+                            "organize",
+                            f"[AUTO-MOVE SKIPPED] file={file_ctx.name} reason=not_eligible",
+                        )
+                    elif best["confidence"] < auto_threshold:
+                        await log(
+                            "INFO",
+                            "organize",
+                            (
+                                f"[AUTO-MOVE SKIPPED] "
+                                f"file={file_ctx.name} "
+                                f"confidence={best['confidence']} < threshold={auto_threshold}"
+                            ),
+                        )
 
-                continue
+                # ----------------------------
+                # Interactive path
+                # ----------------------------
+                clear_status()
+                print(f"\nFile: {file_ctx.name}")
+                if cluster.others:
+                    preview = ", ".join(f.name for f in cluster.others[:3])
+                    more = "" if len(cluster.others) <= 3 else ", ..."
+                    print(f"  + {len(cluster.others)} similar file(s): {preview}{more}")
+                    print("  (your choice applies to all of them)")
+                if copies:
+                    preview = ", ".join(f.name for f in copies[:3])
+                    more = "" if len(copies) <= 3 else ", ..."
+                    print(f"  + {len(copies)} identical cop{'y' if len(copies) == 1 else 'ies'}: {preview}{more}")
+                print("Suggested destinations:")
+                for i, s in enumerate(suggestions, 1):
+                    print(
+                        f"  [{i}] {s['folder']} "
+                        f"(confidence: {s['confidence']})"
+                    )
 
-            if choice.isdigit():
-                idx = int(choice) - 1
-                if 0 <= idx < len(suggestions):
-                    sel = suggestions[idx]
-                    target = sel["folder"]
+                print("\n[Enter] accept #1 | [1-3] choose | [o] Other Folder | [n] New Folder | [d] delete | [s] skip")
+                choice = (await _ainput("> ")).strip().lower() or "1"
 
-                    dest = root / target
-                    dest.mkdir(parents=True, exist_ok=True)
-                    file_path.rename(dest / file_path.name)
+                if choice == "s":
                     await log(
                         "INFO",
                         "organize",
-                        f"[FILE-MOVED] {file_ctx.name} → {dest}",
+                        f"[SKIP] file={file_ctx.name}",
+                    )
+                    continue
+
+                if choice == "d":
+                    # Skip files outside project root data scope (tests + safety)
+                    if file_path.name.lower() in {"readme.md", "license", ".gitignore"}:
+                        await log(
+                            "WARNING",
+                            "organize",
+                            f"[DELETE] file={file_ctx.name}",
+                        )
+                        continue
+                    clear_status()
+                    print(
+                        "Type DELETE to confirm moving to trash "
+                        "(anything else cancels):"
                     )
+                    if await _ainput("> ") == "DELETE":
+                        for member in cluster.files + copies:
+                            move_to_trash(member.path, root)
+                    continue
+
+                if choice == "n":
+                    clear_status()
+                    print("Enter new folder name:")
+                    raw = (await _ainput("> ")).strip()
 
-                    # Medium-confidence global memory prompt
+                    # Remove surrounding quotes if present
                     if (
-                        ask_global_threshold
-                        <= sel["confidence"]
-                        < auto_threshold
+                        (raw.startswith('"') and raw.endswith('"')) or
+                        (raw.startswith("'") and raw.endswith("'"))
                     ):
-                        resp = input(
-                            "This looks like general knowledge about you.\n"
-                            "Save globally? [y/N]: "
-                        ).strip().lower()
-                        if resp != "y":
-                            sel_conf = sel["confidence"] * 0.99
+                        new_folder = raw[1:-1].strip()
+                    else:
+                        new_folder = raw
+
+                    if new_folder:
+                        invalidate_prefetch()
+                        await _move_files(
+                            cluster.files + await _keep_copies(copies, root),
+                            root / new_folder,
+                        )
+
+                        await remember(
+                            embedding=embedding,
+                            extension=file_ctx.extension,
+                            tokens=name_tokens(file_ctx.name),
+                            target_folder=new_folder,
+                            directory_description=directory.description,
+                            confidence=0.5,
+                            name_template=filename_template(file_ctx.name),
+                        )
+
+                    await log(
+                        "INFO",
+                        "organize",
+                        (
+                            f"[NEW-FOLDER] "
+                            f"file={file_ctx.name} | "
+                            f"folder={new_folder} | "
+                            f"confidence=0.5"
+                        ),
+                    )
+
+                    continue
+
+                if choice == "o":
+                    clear_status()
+                    print("Enter exact folder name (relative to current directory):")
+                    other_folder = (await _ainput("> ")).strip()
+                    if other_folder:
+                        invalidate_prefetch()
+                        await _move_files(
+                            cluster.files + await _keep_copies(copies, root),
+                            root / other_folder,
+                        )
+
+                        await remember(
+                            embedding=embedding,
+                            extension=file_ctx.extension,
+                            tokens=name_tokens(file_ctx.name),
+                            target_folder=other_folder,
+                            directory_description=directory.description,
+                            confidence=0.5,  # Medium confidence for user-created folders
+                            name_template=filename_template(file_ctx.name),
+                        )
+
+                    await log(
+                        "INFO",
+                        "organize",
+                        (
+                            f"[MANUAL-MOVE] "
+                            f"file={file_ctx.name} | "
+                            f"destination={other_folder} | "
+                            f"confidence=0.5"
+                        ),
+                    )
+
+                    continue
+
+                if choice.isdigit():
+                    idx = int(choice) - 1
+                    if 0 <= idx < len(suggestions):
+                        sel = suggestions[idx]
+                        target = sel["folder"]
+
+                        if idx != 0:
+                            invalidate_prefetch()
+                        elif file_path in rule_for:
+                            rules.record_applied(rule_for[file_path])
+
+                        await _move_files(
+                            cluster.files + await _keep_copies(copies, root),
+                            root / target,
+                        )
+
+                        # Medium-confidence global memory prompt
+                        if (
+                            ask_global_threshold
+                            <= sel["confidence"]
+                            < auto_threshold
+                        ):
+                            resp = (await _ainput(
+                                "This looks like general knowledge about you.\n"
+                                "Save globally? [y/N]: "
+                            )).strip().lower()
+                            if resp != "y":
+                                sel_conf = sel["confidence"] * 0.99
+                            else:
+                                sel_conf = sel["confidence"]
                         else:
                             sel_conf = sel["confidence"]
-                    else:
-                        sel_conf = sel["confidence"]
 
-                    memory.record_decision(
-                        embedding=embedding,
-                        extension=file_ctx.extension,
-                        tokens=[],
-                        target_folder=target,
-                        directory_description=directory.description,
-                        confidence=sel_conf,
+                        await remember(
+                            embedding=embedding,
+                            extension=file_ctx.extension,
+                            tokens=name_tokens(file_ctx.name),
+                            target_folder=target,
+                            directory_description=directory.description,
+                            confidence=sel_conf,
+                            name_template=filename_template(file_ctx.name),
+                        )
+
+                    await log(
+                        "INFO",
+                        "organize",
+                        (
+                            f"[USER-SELECT] "
+                            f"file={file_ctx.name} | "
+                            f"destination={target} | "
+                            f"final_confidence={sel_conf}"
+                        ),
                     )
 
-                await log(
-                    "INFO",
-                    "organize",
-                    (
-                        f"[USER-SELECT] "
-                        f"file={file_ctx.name} | "
-                        f"destination={target} | "
-                        f"final_confidence={sel_conf}"
-                    ),
-                )
+        await asyncio.sleep(0.05)
+
+        if rules.hits:
+            await log(
+                "INFO",
+                "organize",
+                "[RULE HITS] " + ", ".join(
+                    f"{name}=matched:{count}/applied:{rules.applied[name]}"
+                    for name, count in rules.hits.most_common()
+                ),
+            )
+
+        if prefetch_hits:
+            await log(
+                "INFO",
+                "organize",
+                f"[PREFETCH] suggestions ready before needed: {prefetch_hits}",
+            )
+
+        resilience_report = resilience.report()
+        await log("INFO", "organize", "[MODEL SERVER] " + " | ".join(resilience_report))
+
+        if response_cache is not None:
+            await log(
+                "INFO",
+                "organize",
+                f"[RESPONSE CACHE] entries={len(response_cache)} | "
+                + " | ".join(response_cache.report()),
+            )
+            cache_hit_rate = response_cache.hit_rate()
+
+        await log("INFO", "organize", f"[PROMPT TOKENS] backend={backend.name} {backend.prompt_report()}")
+        await log("INFO", "organize", "[GENERATION] " + " | ".join(backend.generation_report()))
+        routing_report = router.report()
+        await log("INFO", "organize", "[MODEL ROUTING] " + " | ".join(routing_report))
+        prompt_tokens_saved = backend.prompt_stats["system_tokens_reused"]
+
+        if limiter is not None:
+            await log("INFO", "organize", "[RATE LIMIT] " + " | ".join(limiter.report()))
+
+        if balancer is not None:
+            await log("INFO", "organize", "[ENDPOINTS] " + " | ".join(balancer.report()))
+
+        if cassette is not None:
+            cassette_report = cassette.report()
+            await log(
+                "INFO",
+                "organize",
+                f"[CASSETTE] mode={cassette_mode} path={cassette_path} | "
+                + " | ".join(cassette_report),
+            )
 
-    await asyncio.sleep(0.05)
+        if warmer is not None:
+            await log("INFO", "organize", "[WARM-UP] " + " | ".join(warmer.report()))
+    finally:
+        # Also on errors and Ctrl-C: a recording keeps everything
+        # captured so far, and no worker threads are left behind
+        if warmer is not None:
+            await warmer.stop()
+        backend.close()
+        embedder.close()
+        resilience.close()
 
     clear_status()
     print("✅ Organization complete.")
+    if resilience.had_failures:
+        print("🔌 Model server:")
+        for line in resilience_report:
+            print(f"   {line}")
+    if cassette is not None:
+        print(f"📼 Cassette ({cassette_mode}): {cassette_path}")
+        for line in cassette_report:
+            print(f"   {line}")
+    if response_cache is not None:
+        print(f"🗄️  Response cache hit rate: {cache_hit_rate:.0%}")
+    if limiter is not None and limiter.stats["throttled"]:
+        print("🚦 Rate limit:")
+        for line in limiter.report():
+            print(f"   {line}")
+    if balancer is not None and any(ep.errors for ep in balancer.endpoints):
+        print("🖧 Model servers:")
+        for line in balancer.report():
+            print(f"   {line}")
+    if router.enabled and routing_report:
+        print("🧭 Model tiers:")
+        for line in routing_report:
+            print(f"   {line}")
+    if prompt_tokens_saved:
+        print(f"✂️  Prompt tokens saved by reusing system prompts: ~{prompt_tokens_saved}")
+    if rules.applied:
+        print("📏 Rules applied:")
+        for name, count in rules.applied.most_common():
+            print(f"   {name}: {count}")
     print()
     print("📜 Detailed log for this run is available at:")
     print(f"   {LOG_FILE}")
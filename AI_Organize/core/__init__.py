@@ -1,11 +1,21 @@
 # Auto-generated __init__.py
 
+from . import dedup
+from .dedup import SingleFlight
+from .dedup import find_duplicates
+from .dedup import full_hash
+from .dedup import partial_hash
 from . import memory
 from .memory import MemoryStore
 from . import models
 from .models import DirectoryContext
 from .models import FileContext
 from .models import build_file_context
+from . import rules
+from .rules import Rule
+from .rules import RuleSet
+from .rules import compile_rule
+from .rules import load_rules
 from . import scanner
 from .scanner import IgnoreRules
 from .scanner import scan_directory
@@ -16,18 +26,28 @@ from .trash import get_trash_root
 from .trash import move_to_trash
 
 __all__ = [
+    "dedup",
     "memory",
     "models",
+    "rules",
     "scanner",
     "trash",
     "DirectoryContext",
     "FileContext",
     "IgnoreRules",
     "MemoryStore",
+    "Rule",
+    "RuleSet",
+    "SingleFlight",
     "build_file_context",
     "cleanup_trash",
+    "compile_rule",
+    "find_duplicates",
+    "full_hash",
     "get_trash_root",
+    "load_rules",
     "move_to_trash",
+    "partial_hash",
     "scan_directory",
     "scan_directory_async",
 ]
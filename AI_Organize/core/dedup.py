@@ -0,0 +1,132 @@
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+import asyncio
+import hashlib
+import mmap
+
+from AI_Organize.core.models import FileContext
+
+
+PARTIAL_HASH_BYTES = 64 * 1024
+
+
+# ----------------------------
+# Content hashing
+# ----------------------------
+
+def partial_hash(path: Path, chunk: int = PARTIAL_HASH_BYTES) -> str:
+    """
+    Hash of the first and last `chunk` bytes. Cheap pre-filter only:
+    equal partial hashes do not prove equal content.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        h.update(f.read(chunk))
+
+        size = f.seek(0, 2)
+        if size > chunk:
+            f.seek(max(chunk, size - chunk))
+            h.update(f.read(chunk))
+
+    return h.hexdigest()
+
+
+def full_hash(path: Path) -> str:
+    """
+    SHA-256 of the whole file, read through mmap.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        except ValueError:
+            pass  # empty file: nothing to map
+
+    return h.hexdigest()
+
+
+def find_duplicates(files: List[FileContext]) -> Dict[str, List[FileContext]]:
+    """
+    Group byte-identical files.
+
+    Candidates are narrowed by size, then by partial hash; only files that
+    still collide are fully hashed. Returns {sha256: [files...]} for groups
+    of two or more, each group in input order.
+    """
+    by_size: Dict[int, List[FileContext]] = defaultdict(list)
+    for file_ctx in files:
+        by_size[file_ctx.size_bytes].append(file_ctx)
+
+    duplicates: Dict[str, List[FileContext]] = {}
+
+    for same_size in by_size.values():
+        if len(same_size) < 2:
+            continue
+
+        by_partial: Dict[str, List[FileContext]] = defaultdict(list)
+        for file_ctx in same_size:
+            try:
+                by_partial[partial_hash(file_ctx.path)].append(file_ctx)
+            except OSError:
+                continue
+
+        for candidates in by_partial.values():
+            if len(candidates) < 2:
+                continue
+
+            by_full: Dict[str, List[FileContext]] = defaultdict(list)
+            for file_ctx in candidates:
+                try:
+                    by_full[full_hash(file_ctx.path)].append(file_ctx)
+                except OSError:
+                    continue
+
+            for digest, group in by_full.items():
+                if len(group) > 1:
+                    duplicates[digest] = group
+
+    return duplicates
+
+
+# ----------------------------
+# Request coalescing
+# ----------------------------
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls by key.
+
+    The first caller for a key runs the coroutine; callers arriving while
+    it is in flight await the same future instead of issuing a duplicate
+    call. Once it completes the key is released (results are not cached).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a flight without waiters does not warn
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
@@ -15,6 +15,9 @@ GLOBAL_DB_PATH = Path.home() / ".local" / "share" / "ai_organize" / "global.db"
 AUTO_GLOBAL_THRESHOLD = 0.85
 ASK_GLOBAL_THRESHOLD = 0.60
 
+# Backend tag assumed for vectors stored before backends were pluggable
+LEGACY_EMBEDDING_BACKEND = "ollama"
+
 
 # ----------------------------
 # Helpers
@@ -38,9 +41,26 @@ def _ensure_db(path: Path) -> sqlite3.Connection:
         )
         """
     )
+    _ensure_column(
+        conn,
+        "decisions",
+        "embedding_backend",
+        f"TEXT NOT NULL DEFAULT '{LEGACY_EMBEDDING_BACKEND}'",
+    )
+    _ensure_column(conn, "decisions", "name_template", "TEXT")
     return conn
 
 
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, ddl: str):
+    """
+    Add a column to an existing table if it is missing (lightweight migration).
+    """
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+        conn.commit()
+
+
 def _serialize_embedding(vec: np.ndarray) -> bytes:
     return vec.astype(np.float32).tobytes()
 
@@ -56,9 +76,17 @@ def _deserialize_embedding(blob: bytes) -> np.ndarray:
 class MemoryStore:
     """
     Handles both project and global memory.
+
+    Every stored vector is tagged with the embedding backend that produced
+    it; lookups only ever compare vectors from the same backend.
     """
 
-    def __init__(self, project_db: Path):
+    def __init__(
+        self,
+        project_db: Path,
+        embedding_backend: str = LEGACY_EMBEDDING_BACKEND,
+    ):
+        self.embedding_backend = embedding_backend
         self.project_conn = _ensure_db(project_db)
         self.global_conn = _ensure_db(GLOBAL_DB_PATH)
 
@@ -73,7 +101,9 @@ class MemoryStore:
         conn = self.global_conn if scope == "global" else self.project_conn
 
         cur = conn.execute(
-            "SELECT extension, tokens, target_folder, directory_description, embedding, confidence FROM decisions"
+            "SELECT extension, tokens, target_folder, directory_description, embedding, confidence "
+            "FROM decisions WHERE embedding_backend = ?",
+            (self.embedding_backend,),
         )
 
         from akinus.ai.ollama import cosine_similarity
@@ -111,6 +141,40 @@ class MemoryStore:
         return results[:limit]
 
 
+    def get_decisions_since(
+        self,
+        after_id: int = 0,
+        scope: str = "project",
+    ) -> List[Tuple[int, dict]]:
+        """
+        Return decisions with id > after_id, oldest first.
+        Used to train local models incrementally.
+        """
+        conn = self.global_conn if scope == "global" else self.project_conn
+
+        cur = conn.execute(
+            "SELECT id, extension, tokens, target_folder, embedding, confidence, "
+            "embedding_backend, name_template "
+            "FROM decisions WHERE id > ? ORDER BY id",
+            (after_id,),
+        )
+
+        return [
+            (
+                row_id,
+                {
+                    "extension": ext,
+                    "tokens": tokens.split() if tokens else [],
+                    "target_folder": folder,
+                    "embedding": _deserialize_embedding(emb_blob),
+                    "embedding_backend": backend,
+                    "name_template": template,
+                    "confidence": conf,
+                },
+            )
+            for row_id, ext, tokens, folder, emb_blob, conf, backend, template in cur.fetchall()
+        ]
+
     # -------- Recording --------
 
     def record_decision(
@@ -123,6 +187,7 @@ class MemoryStore:
         directory_description: Optional[str],
         confidence: float,
         ask_user_callback=None,
+        name_template: Optional[str] = None,
     ):
         """
         Record a decision using conservative hybrid rules.
@@ -138,6 +203,7 @@ class MemoryStore:
             target_folder=target_folder,
             directory_description=directory_description,
             confidence=confidence,
+            name_template=name_template,
         )
 
         # Decide global behavior
@@ -151,6 +217,7 @@ class MemoryStore:
                 target_folder=target_folder,
                 directory_description=directory_description,
                 confidence=confidence,
+                name_template=name_template,
             )
 
         elif confidence >= ASK_GLOBAL_THRESHOLD and ask_user_callback:
@@ -171,6 +238,7 @@ class MemoryStore:
                     target_folder=target_folder,
                     directory_description=directory_description,
                     confidence=confidence,
+                    name_template=name_template,
                 )
 
     # -------- Internal --------
@@ -186,12 +254,14 @@ class MemoryStore:
         target_folder: str,
         directory_description: Optional[str],
         confidence: float,
+        name_template: Optional[str] = None,
     ):
         conn.execute(
             """
             INSERT INTO decisions
-            (scope, extension, tokens, target_folder, directory_description, embedding, confidence)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (scope, extension, tokens, target_folder, directory_description, embedding, confidence,
+             embedding_backend, name_template)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 scope,
@@ -201,6 +271,8 @@ class MemoryStore:
                 directory_description,
                 _serialize_embedding(embedding),
                 confidence,
+                self.embedding_backend,
+                name_template,
             ),
         )
         conn.commit()
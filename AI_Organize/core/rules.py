@@ -0,0 +1,231 @@
+from collections import Counter
+from dataclasses import dataclass, field
+import fnmatch
+import heapq
+from pathlib import Path
+import re
+import time
+from typing import Dict, List, Optional, Pattern
+
+from AI_Organize.core.models import FileContext
+
+
+RULES_FILE_NAME = "rules.toml"
+SECONDS_PER_DAY = 86_400
+
+
+# ----------------------------
+# Rule definition
+# ----------------------------
+
+@dataclass
+class Rule:
+    """
+    A deterministic placement rule loaded from `.ai/rules.toml`.
+
+    Every predicate that is set must match (logical AND).
+    Rules are evaluated in file order; the first match wins.
+    """
+    name: str
+    target: str
+    order: int = 0
+    confidence: float = 1.0
+
+    name_pattern: Optional[Pattern[str]] = None   # compiled globs
+    regex: Optional[Pattern[str]] = None
+    extensions: frozenset = field(default_factory=frozenset)
+    mime_patterns: List[str] = field(default_factory=list)
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    min_age_days: Optional[float] = None
+    max_age_days: Optional[float] = None
+
+    def matches(self, file_ctx: FileContext, now: float) -> bool:
+        if self.extensions and file_ctx.extension.lower() not in self.extensions:
+            return False
+
+        if self.name_pattern and not self.name_pattern.match(file_ctx.name):
+            return False
+
+        if self.regex and not self.regex.search(file_ctx.name):
+            return False
+
+        if self.mime_patterns:
+            mime = file_ctx.mime_type or ""
+            if not any(fnmatch.fnmatchcase(mime, p) for p in self.mime_patterns):
+                return False
+
+        if self.min_size is not None and file_ctx.size_bytes < self.min_size:
+            return False
+
+        if self.max_size is not None and file_ctx.size_bytes > self.max_size:
+            return False
+
+        if self.min_age_days is not None or self.max_age_days is not None:
+            try:
+                age_days = (now - file_ctx.path.stat().st_mtime) / SECONDS_PER_DAY
+            except OSError:
+                return False
+
+            if self.min_age_days is not None and age_days < self.min_age_days:
+                return False
+            if self.max_age_days is not None and age_days > self.max_age_days:
+                return False
+
+        return True
+
+
+# ----------------------------
+# Compilation
+# ----------------------------
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value]
+
+
+def _normalize_extension(ext: str) -> str:
+    ext = ext.strip().lower()
+    return ext if ext.startswith(".") else f".{ext}"
+
+
+def _literal_extension(glob: str) -> Optional[str]:
+    """
+    Return the extension of a glob like '*.iso' or 'Invoice_*.pdf'
+    when it is literal, so the rule can be indexed by extension.
+    """
+    suffix = Path(glob).suffix
+    if not suffix or any(ch in suffix for ch in "*?[]"):
+        return None
+    return suffix.lower()
+
+
+def compile_rule(raw: Dict, order: int) -> Rule:
+    """
+    Compile one `[[rules]]` table into a Rule.
+    Raises ValueError on invalid definitions.
+    """
+    name = str(raw.get("name") or f"rule-{order + 1}")
+    target = raw.get("target")
+
+    if not target:
+        raise ValueError(f"Rule '{name}' has no target folder")
+
+    flags = 0 if raw.get("case_sensitive", False) else re.IGNORECASE
+
+    globs = _as_list(raw.get("glob"))
+    name_pattern = None
+    if globs:
+        name_pattern = re.compile(
+            "|".join(f"(?:{fnmatch.translate(g)})" for g in globs),
+            flags,
+        )
+
+    regex = None
+    if raw.get("regex"):
+        try:
+            regex = re.compile(raw["regex"], flags)
+        except re.error as e:
+            raise ValueError(f"Rule '{name}' has an invalid regex: {e}") from e
+
+    extensions = {_normalize_extension(e) for e in _as_list(raw.get("extension"))}
+
+    # A glob set that only ever matches one extension narrows the index too
+    if not extensions and globs:
+        glob_exts = {_literal_extension(g) for g in globs}
+        if None not in glob_exts and len(glob_exts) == 1:
+            extensions = glob_exts
+
+    return Rule(
+        name=name,
+        target=str(target).strip("/"),
+        order=order,
+        confidence=float(raw.get("confidence", 1.0)),
+        name_pattern=name_pattern,
+        regex=regex,
+        extensions=frozenset(extensions),
+        mime_patterns=_as_list(raw.get("mime")),
+        min_size=raw.get("min_size"),
+        max_size=raw.get("max_size"),
+        min_age_days=raw.get("min_age_days"),
+        max_age_days=raw.get("max_age_days"),
+    )
+
+
+# ----------------------------
+# Matcher
+# ----------------------------
+
+class RuleSet:
+    """
+    Compiled, extension-indexed rule matcher with per-rule counters:
+    `hits` counts matches, `applied` the matches that placed a file.
+    """
+
+    def __init__(self, rules: List[Rule] | None = None):
+        self.rules = sorted(rules or [], key=lambda r: r.order)
+        self.hits: Counter = Counter()
+        self.applied: Counter = Counter()
+
+        self._by_extension: Dict[str, List[Rule]] = {}
+        self._generic: List[Rule] = []
+
+        for rule in self.rules:
+            if rule.extensions:
+                for ext in rule.extensions:
+                    self._by_extension.setdefault(ext, []).append(rule)
+            else:
+                self._generic.append(rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, file_ctx: FileContext) -> Optional[Rule]:
+        """
+        Return the first rule matching the file (in file order), or None.
+        """
+        if not self.rules:
+            return None
+
+        candidates = heapq.merge(
+            self._by_extension.get(file_ctx.extension.lower(), []),
+            self._generic,
+            key=lambda r: r.order,
+        )
+
+        now = time.time()
+        for rule in candidates:
+            if rule.matches(file_ctx, now):
+                self.hits[rule.name] += 1
+                return rule
+
+        return None
+
+    def record_applied(self, rule: Rule):
+        self.applied[rule.name] += 1
+
+
+def load_rules(path: Path) -> RuleSet:
+    """
+    Load and compile rules from a TOML file.
+
+    Missing files yield an empty RuleSet.
+
+    Example:
+        [[rules]]
+        name = "disk-images"
+        glob = "*.iso"
+        target = "ISOs"
+    """
+    if not path.exists():
+        return RuleSet()
+
+    import toml
+
+    data = toml.loads(path.read_text(encoding="utf-8"))
+    raw_rules = data.get("rules", [])
+
+    return RuleSet([compile_rule(raw, i) for i, raw in enumerate(raw_rules)])
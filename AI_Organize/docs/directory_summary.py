@@ -4,6 +4,7 @@ import re
 from typing import List, Optional, Callable
 import mimetypes
 
+from AI_Organize.ai.generation import parse_json_text
 from AI_Organize.docs.directory_fingerprint import directory_fingerprint
 
 THINKING_BLOCK_RE = re.compile(
@@ -178,8 +179,8 @@ async def generate_directory_summary(
     
     # 🔹 Lazy, controlled import (ONLY if needed)
     if ai_call is None:
-        from akinus.ai.ollama import ollama_query
-        ai_call = ollama_query
+        from AI_Organize.ai.backends import AkinusBackend
+        ai_call = AkinusBackend()
 
     context = _collect_directory_context(directory)
 
@@ -199,5 +200,10 @@ Directory purpose:
     response = await ai_call(prompt, model)
     response = strip_reasoning(response)
 
+    # `ai.generation.directory_summary.json` asks for {"summary": ...}
+    structured = parse_json_text(response, "summary")
+    if structured:
+        return structured
+
     return response.strip()
 
@@ -1,10 +1,56 @@
 # Auto-generated __init__.py
 
 from . import conftest
+from .conftest import async_log
+from .conftest import isolated_global_db
 from .conftest import stub_akinus_modules
+from . import test_backends
+from .test_backends import ollama_server
+from .test_backends import silent_server
+from .test_backends import test_backend_factories
+from .test_backends import test_fake_backend_matches_prompt_and_records_calls
+from .test_backends import test_generation_profile_is_sent_per_site
+from .test_backends import test_http_embedder_closes_only_a_backend_it_owns
+from .test_backends import test_json_summary_profile_drops_the_bullet_format
+from .test_backends import test_ollama_backend_reuses_one_connection
+from .test_backends import test_streaming_stops_generation_once_done
+from .test_backends import test_suggest_folders_stops_reading_after_enough_folders
+from .test_backends import test_suggest_folders_uses_given_backend
+from .test_backends import test_system_prompt_is_sent_separately_and_reuse_is_counted
+from .test_backends import test_timeout_is_honored_while_streaming_from_a_silent_server
+from .test_backends import test_warm_up_preloads_without_a_prompt
+from . import test_balancer
+from .test_balancer import servers
+from .test_balancer import start_server
+from .test_balancer import test_built_from_settings
+from .test_balancer import test_failing_host_is_ejected_and_calls_fail_over
+from .test_balancer import test_least_outstanding_spreads_concurrent_calls
+from .test_balancer import test_models_are_routed_to_hosts_that_serve_them
+from .test_balancer import test_timed_out_calls_release_the_host_and_count_as_failures
+from .test_balancer import test_weighted_round_robin
+from . import test_cassette
+from .test_cassette import test_interrupted_recording_replays_its_complete_entries
+from .test_cassette import test_original_latency_is_replayed
+from .test_cassette import test_repeated_requests_replay_in_recorded_order
+from .test_cassette import test_replays_recorded_responses_and_vectors
 from . import test_cli
 from .test_cli import test_cli_auto_move
 from .test_cli import test_cli_delete_to_trash
+from . import test_clustering
+from .test_clustering import CountingHashingEmbedder
+from .test_clustering import test_async_embedding_merge_is_one_batch_through_the_service
+from .test_clustering import test_cluster_by_template
+from .test_clustering import test_embedding_merge_respects_extension
+from . import test_dedup
+from .test_dedup import test_find_duplicates_checks_full_content_after_partial_match
+from .test_dedup import test_find_duplicates_groups_identical_content
+from .test_dedup import test_full_hash_of_empty_file
+from .test_dedup import test_singleflight_coalesces_concurrent_calls
+from .test_dedup import test_singleflight_shares_errors
+from . import test_destination_index
+from .test_destination_index import CountingEmbedder
+from .test_destination_index import test_reembeds_only_changed_descriptions
+from .test_destination_index import test_scores_all_destinations_in_one_pass
 from . import test_directory_summary
 from .test_directory_summary import create_binary_file
 from .test_directory_summary import create_text_file
@@ -12,16 +58,107 @@ from .test_directory_summary import test_collects_directory_name
 from .test_directory_summary import test_collects_filenames
 from .test_directory_summary import test_collects_subdirectories
 from .test_directory_summary import test_generate_directory_summary_calls_ai
+from .test_directory_summary import test_generate_directory_summary_reads_json_output
 from .test_directory_summary import test_ignores_binary_files
 from .test_directory_summary import test_limits_number_of_sampled_files
 from .test_directory_summary import test_samples_text_file_contents
+from . import test_embedding_service
+from .test_embedding_service import BatchEmbedder
+from .test_embedding_service import SingleEmbedder
+from .test_embedding_service import test_concurrent_requests_share_one_batch
+from .test_embedding_service import test_context_cache_async_lookup_embeds_once
+from .test_embedding_service import test_full_batch_is_sent_without_waiting_for_the_window
+from .test_embedding_service import test_single_input_backend_runs_off_the_event_loop
+from . import test_embeddings
+from .test_embeddings import test_combine_embeddings_weighting
+from .test_embeddings import test_context_cache_embeds_shared_context_once
+from .test_embeddings import test_get_embedder_from_settings
+from .test_embeddings import test_hashing_embedder_empty_text
+from .test_embeddings import test_hashing_embedder_is_normalized_and_deterministic
+from .test_embeddings import test_hashing_embedder_similarity_follows_names
+from . import test_filename_templates
+from .test_filename_templates import test_consistent_template_skips_llm
+from .test_filename_templates import test_filename_template
+from .test_filename_templates import test_template_index_counts
+from . import test_generation
+from .test_generation import test_classify_prompt_asks_for_one_output_format
+from .test_generation import test_client_side_stop_sequences
+from .test_generation import test_no_default_output_budget
+from .test_generation import test_parsers_read_structured_and_plain_output
+from .test_generation import test_settings_override_only_given_keys
+from .test_generation import test_summary_prompt_asks_for_one_output_format
+from . import test_local_classifier
+from .test_local_classifier import test_knn_vote_uses_embeddings
+from .test_local_classifier import test_naive_bayes_prefers_matching_tokens
+from .test_local_classifier import test_name_tokens_drop_digit_runs
+from .test_local_classifier import test_refresh_is_incremental
+from . import test_local_summary
+from .test_local_summary import test_document_frequencies_persist_and_downweight_common_terms
+from .test_local_summary import test_empty_content_gives_fallback_summary
+from .test_local_summary import test_summary_is_bulleted_and_extractive
 from . import test_memory
+from .test_memory import test_memory_never_mixes_embedding_backends
 from .test_memory import test_memory_store_roundtrip
 from . import test_models
 from .test_models import test_directory_context_defaults
 from .test_models import test_file_context_normalization
+from . import test_organize_run
+from .test_organize_run import ClosingBackend
+from .test_organize_run import WarmingBackend
+from .test_organize_run import organize_run
+from .test_organize_run import test_identical_files_in_different_folders_are_classified_once
+from .test_organize_run import test_interrupted_run_closes_the_backend_and_keeps_its_recording
+from .test_organize_run import test_new_folder_answer_invalidates_and_recomputes_prefetched_suggestions
+from .test_organize_run import test_prefetched_suggestions_are_used_while_answers_keep_them_valid
+from .test_organize_run import test_replay_uses_the_recorded_model_without_the_server
+from .test_organize_run import test_rule_moves_without_prompt_and_is_remembered
+from .test_organize_run import test_rule_target_is_offered_without_ai_when_auto_move_is_off
+from .test_organize_run import test_skipped_rule_match_is_not_counted_as_applied
 from . import test_organizer
+from .test_organizer import test_lazy_summary_runs_only_when_cheap_signals_are_weak
+from .test_organizer import test_llm_failure_degrades_to_memory_suggestions
+from .test_organizer import test_local_summary_mode_never_calls_llm_summary
+from .test_organizer import test_memory_fastpath_skips_llm
 from .test_organizer import test_organizer_ranking
+from .test_organizer import test_re_seen_file_hits_the_memory_fastpath_with_real_embeddings
+from .test_organizer import test_scores_destinations_once_and_closes_its_own_backend
+from . import test_rate_limit
+from .test_rate_limit import LimiterClock
+from .test_rate_limit import Throttled
+from .test_rate_limit import test_backend_charges_token_budget_per_call
+from .test_rate_limit import test_concurrency_grows_additively_and_halves_on_throttle
+from .test_rate_limit import test_from_settings_auto_enables_for_cloud_models
+from .test_rate_limit import test_is_throttled
+from .test_rate_limit import test_one_decrease_per_round_of_calls
+from .test_rate_limit import test_shared_bucket_is_one_budget_across_connections
+from .test_rate_limit import test_shared_bucket_waits_for_other_processes_off_the_event_loop
+from .test_rate_limit import test_slow_calls_shrink_the_limit_and_cap_in_flight
+from .test_rate_limit import test_time_queued_for_a_slot_is_not_charged_to_the_timeout
+from .test_rate_limit import test_token_bucket_bursts_then_spaces_requests
+from . import test_resilience
+from .test_resilience import FakeClock
+from .test_resilience import test_breaker_opens_then_half_opens_after_reset_timeout
+from .test_resilience import test_call_sync_counts_are_exact_across_threads
+from .test_resilience import test_call_sync_stops_waiting_at_timeout
+from .test_resilience import test_close_releases_worker_threads
+from .test_resilience import test_open_breaker_rejects_without_calling
+from .test_resilience import test_retries_until_success
+from .test_resilience import test_timeouts_are_counted_and_raised
+from . import test_response_cache
+from .test_response_cache import ManualClock
+from .test_response_cache import test_cached_backend_only_caches_opted_in_sites
+from .test_response_cache import test_entries_expire_after_ttl
+from .test_response_cache import test_key_ignores_cosmetic_whitespace_but_not_model_or_options
+from .test_response_cache import test_least_recently_used_entries_are_evicted
+from . import test_routing
+from .test_routing import test_classification_escalates_unreliable_small_answers
+from .test_routing import test_escalation_rules
+from .test_routing import test_routes_sites_to_tiers
+from .test_routing import test_weak_memory_hit_does_not_force_escalation
+from . import test_rules
+from .test_rules import test_missing_rules_file
+from .test_rules import test_rules_first_match_and_hits
+from .test_rules import test_rules_size_and_age
 from . import test_scanner
 from .test_scanner import test_build_file_context
 from .test_scanner import test_ignore_glob
@@ -35,40 +172,164 @@ from .test_scanner_directory_summary import test_scanner_refreshes_summary_when_
 from .test_scanner_directory_summary import test_scanner_uses_cache_when_directory_unchanged
 from .test_scanner_directory_summary import test_scanner_writes_readme_with_description
 from .test_scanner_directory_summary import write_file
+from . import test_shortlist
+from .test_shortlist import test_shortlist_ranks_lexical_and_memory_signals
+from .test_shortlist import test_shortlist_respects_token_budget
+from .test_shortlist import test_small_trees_are_unchanged
 from . import test_trash
 from .test_trash import test_cleanup_trash
 from .test_trash import test_move_to_trash
+from . import test_warmup
+from .test_warmup import WarmableBackend
+from .test_warmup import test_keep_alive_is_refreshed_only_while_idle
+from .test_warmup import test_warm_up_runs_in_background_and_records_failures
 
 __all__ = [
     "conftest",
+    "test_backends",
+    "test_balancer",
+    "test_cassette",
     "test_cli",
+    "test_clustering",
+    "test_dedup",
+    "test_destination_index",
     "test_directory_summary",
+    "test_embedding_service",
+    "test_embeddings",
+    "test_filename_templates",
+    "test_generation",
+    "test_local_classifier",
+    "test_local_summary",
     "test_memory",
     "test_models",
+    "test_organize_run",
     "test_organizer",
+    "test_rate_limit",
+    "test_resilience",
+    "test_response_cache",
+    "test_routing",
+    "test_rules",
     "test_scanner",
     "test_scanner_directory_summary",
+    "test_shortlist",
     "test_trash",
+    "test_warmup",
+    "BatchEmbedder",
+    "ClosingBackend",
+    "CountingEmbedder",
+    "CountingHashingEmbedder",
+    "FakeClock",
+    "LimiterClock",
+    "ManualClock",
+    "SingleEmbedder",
+    "Throttled",
+    "WarmableBackend",
+    "WarmingBackend",
+    "async_log",
     "create_binary_file",
     "create_text_file",
     "fake_ai_call",
+    "isolated_global_db",
+    "ollama_server",
+    "organize_run",
+    "servers",
+    "silent_server",
+    "start_server",
     "stub_akinus_modules",
+    "test_async_embedding_merge_is_one_batch_through_the_service",
+    "test_backend_charges_token_budget_per_call",
+    "test_backend_factories",
+    "test_breaker_opens_then_half_opens_after_reset_timeout",
     "test_build_file_context",
+    "test_built_from_settings",
+    "test_cached_backend_only_caches_opted_in_sites",
+    "test_call_sync_counts_are_exact_across_threads",
+    "test_call_sync_stops_waiting_at_timeout",
+    "test_classification_escalates_unreliable_small_answers",
+    "test_classify_prompt_asks_for_one_output_format",
     "test_cleanup_trash",
     "test_cli_auto_move",
     "test_cli_delete_to_trash",
+    "test_client_side_stop_sequences",
+    "test_close_releases_worker_threads",
+    "test_cluster_by_template",
     "test_collects_directory_name",
     "test_collects_filenames",
     "test_collects_subdirectories",
+    "test_combine_embeddings_weighting",
+    "test_concurrency_grows_additively_and_halves_on_throttle",
+    "test_concurrent_requests_share_one_batch",
+    "test_consistent_template_skips_llm",
+    "test_context_cache_async_lookup_embeds_once",
+    "test_context_cache_embeds_shared_context_once",
     "test_directory_context_defaults",
+    "test_document_frequencies_persist_and_downweight_common_terms",
+    "test_embedding_merge_respects_extension",
+    "test_empty_content_gives_fallback_summary",
+    "test_entries_expire_after_ttl",
+    "test_escalation_rules",
+    "test_failing_host_is_ejected_and_calls_fail_over",
+    "test_fake_backend_matches_prompt_and_records_calls",
     "test_file_context_normalization",
+    "test_filename_template",
+    "test_find_duplicates_checks_full_content_after_partial_match",
+    "test_find_duplicates_groups_identical_content",
+    "test_from_settings_auto_enables_for_cloud_models",
+    "test_full_batch_is_sent_without_waiting_for_the_window",
+    "test_full_hash_of_empty_file",
     "test_generate_directory_summary_calls_ai",
+    "test_generate_directory_summary_reads_json_output",
+    "test_generation_profile_is_sent_per_site",
+    "test_get_embedder_from_settings",
+    "test_hashing_embedder_empty_text",
+    "test_hashing_embedder_is_normalized_and_deterministic",
+    "test_hashing_embedder_similarity_follows_names",
+    "test_http_embedder_closes_only_a_backend_it_owns",
+    "test_identical_files_in_different_folders_are_classified_once",
     "test_ignore_glob",
     "test_ignores_binary_files",
+    "test_interrupted_recording_replays_its_complete_entries",
+    "test_interrupted_run_closes_the_backend_and_keeps_its_recording",
+    "test_is_throttled",
+    "test_json_summary_profile_drops_the_bullet_format",
+    "test_keep_alive_is_refreshed_only_while_idle",
+    "test_key_ignores_cosmetic_whitespace_but_not_model_or_options",
+    "test_knn_vote_uses_embeddings",
+    "test_lazy_summary_runs_only_when_cheap_signals_are_weak",
+    "test_least_outstanding_spreads_concurrent_calls",
+    "test_least_recently_used_entries_are_evicted",
     "test_limits_number_of_sampled_files",
+    "test_llm_failure_degrades_to_memory_suggestions",
+    "test_local_summary_mode_never_calls_llm_summary",
+    "test_memory_fastpath_skips_llm",
+    "test_memory_never_mixes_embedding_backends",
     "test_memory_store_roundtrip",
+    "test_missing_rules_file",
+    "test_models_are_routed_to_hosts_that_serve_them",
     "test_move_to_trash",
+    "test_naive_bayes_prefers_matching_tokens",
+    "test_name_tokens_drop_digit_runs",
+    "test_new_folder_answer_invalidates_and_recomputes_prefetched_suggestions",
+    "test_no_default_output_budget",
+    "test_ollama_backend_reuses_one_connection",
+    "test_one_decrease_per_round_of_calls",
+    "test_open_breaker_rejects_without_calling",
     "test_organizer_ranking",
+    "test_original_latency_is_replayed",
+    "test_parsers_read_structured_and_plain_output",
+    "test_prefetched_suggestions_are_used_while_answers_keep_them_valid",
+    "test_re_seen_file_hits_the_memory_fastpath_with_real_embeddings",
+    "test_reembeds_only_changed_descriptions",
+    "test_refresh_is_incremental",
+    "test_repeated_requests_replay_in_recorded_order",
+    "test_replay_uses_the_recorded_model_without_the_server",
+    "test_replays_recorded_responses_and_vectors",
+    "test_retries_until_success",
+    "test_routes_sites_to_tiers",
+    "test_rule_moves_without_prompt_and_is_remembered",
+    "test_rule_target_is_offered_without_ai_when_auto_move_is_off",
+    "test_rules_first_match_and_hits",
+    "test_rules_size_and_age",
     "test_samples_text_file_contents",
     "test_scan_directory_basic",
     "test_scanner_generates_directory_summary",
@@ -77,5 +338,34 @@ __all__ = [
     "test_scanner_refreshes_summary_when_files_change",
     "test_scanner_uses_cache_when_directory_unchanged",
     "test_scanner_writes_readme_with_description",
+    "test_scores_all_destinations_in_one_pass",
+    "test_scores_destinations_once_and_closes_its_own_backend",
+    "test_settings_override_only_given_keys",
+    "test_shared_bucket_is_one_budget_across_connections",
+    "test_shared_bucket_waits_for_other_processes_off_the_event_loop",
+    "test_shortlist_ranks_lexical_and_memory_signals",
+    "test_shortlist_respects_token_budget",
+    "test_single_input_backend_runs_off_the_event_loop",
+    "test_singleflight_coalesces_concurrent_calls",
+    "test_singleflight_shares_errors",
+    "test_skipped_rule_match_is_not_counted_as_applied",
+    "test_slow_calls_shrink_the_limit_and_cap_in_flight",
+    "test_small_trees_are_unchanged",
+    "test_streaming_stops_generation_once_done",
+    "test_suggest_folders_stops_reading_after_enough_folders",
+    "test_suggest_folders_uses_given_backend",
+    "test_summary_is_bulleted_and_extractive",
+    "test_summary_prompt_asks_for_one_output_format",
+    "test_system_prompt_is_sent_separately_and_reuse_is_counted",
+    "test_template_index_counts",
+    "test_time_queued_for_a_slot_is_not_charged_to_the_timeout",
+    "test_timed_out_calls_release_the_host_and_count_as_failures",
+    "test_timeout_is_honored_while_streaming_from_a_silent_server",
+    "test_timeouts_are_counted_and_raised",
+    "test_token_bucket_bursts_then_spaces_requests",
+    "test_warm_up_preloads_without_a_prompt",
+    "test_warm_up_runs_in_background_and_records_failures",
+    "test_weak_memory_hit_does_not_force_escalation",
+    "test_weighted_round_robin",
     "write_file",
-]
+]
\ No newline at end of file
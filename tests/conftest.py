@@ -47,3 +47,26 @@ def stub_akinus_modules(monkeypatch):
     monkeypatch.setitem(sys.modules, "akinus.utils", fake_utils)
     monkeypatch.setitem(sys.modules, "akinus.utils.logger", fake_utils_logger)
     monkeypatch.setitem(sys.modules, "akinus.utils.app_details", fake_app_details)
+
+
+@pytest.fixture
+def async_log(monkeypatch):
+    """
+    Replace the stub logger with an awaitable no-op for code paths
+    that `await log(...)`.
+    """
+    async def fake_log(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(sys.modules["akinus.utils.logger"], "log", fake_log)
+    return fake_log
+
+
+@pytest.fixture
+def isolated_global_db(tmp_path, monkeypatch):
+    """
+    Keep global memory writes inside the test's temporary directory.
+    """
+    path = tmp_path / "global.db"
+    monkeypatch.setattr("AI_Organize.core.memory.GLOBAL_DB_PATH", path)
+    return path
@@ -0,0 +1,378 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from AI_Organize.ai.backends import (
+    AkinusBackend,
+    FakeBackend,
+    FakeEmbedder,
+    OllamaBackend,
+    get_backend,
+)
+from AI_Organize.ai.embeddings import get_embedder
+from AI_Organize.ai.generation import JSON_SCHEMAS, GenerationProfile, profiles_from_settings
+from AI_Organize.ai.organizer import suggest_folders
+from AI_Organize.ai.prompts import CLASSIFY_SYSTEM_PROMPT, SUMMARY_RULES
+from AI_Organize.ai.resilience import CallPolicy, CircuitBreaker, Resilience
+from AI_Organize.core.memory import MemoryStore
+from AI_Organize.core.models import DirectoryContext, FileContext
+
+
+@pytest.fixture
+def ollama_server():
+    """
+    Minimal stand-in for the Ollama HTTP API (HTTP/1.1 keep-alive).
+    Records the client port of every request. Streamed generations emit
+    "Folder<i>" lines until the client hangs up.
+    """
+    seen = {"ports": [], "payloads": [], "streamed": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            seen["ports"].append(self.client_address[1])
+            seen["payloads"].append((self.path, payload))
+
+            if payload.get("stream"):
+                return self._stream()
+
+            if self.path == "/api/embed":
+                body = {"embeddings": [[1.0, 0.0, 0.0]]}
+            else:
+                body = {
+                    "response": f"echo:{payload.get('prompt', '')}",
+                    "eval_count": 3,
+                    "eval_duration": 30_000_000,
+                }
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for i in range(100):
+                    line = json.dumps({"response": f"Folder{i}\n", "done": False}).encode() + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+                    seen["streamed"] += 1
+                    time.sleep(0.01)
+                self.wfile.write(b"0\r\n\r\n")
+            except OSError:
+                pass  # client stopped reading
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}", seen
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def silent_server():
+    """
+    Ollama stand-in that accepts requests but sends nothing back for
+    three seconds.
+    """
+    release = threading.Event()
+
+    class SilentHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            release.wait(3)
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SilentHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    release.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_ollama_backend_reuses_one_connection(ollama_server):
+    url, seen = ollama_server
+    backend = OllamaBackend(url, default_model="m", keep_alive="10m")
+
+    first = await backend.generate("hello")
+    second = await backend.generate("again", model="other", temperature=0)
+    vec = backend.embedder("embed-model").embed("text")
+    backend.close()
+
+    assert (first, second) == ("echo:hello", "echo:again")
+    assert vec.tolist() == [1.0, 0.0, 0.0]
+    assert len(set(seen["ports"])) == 1
+
+    (_, p1), (_, p2), (path, p3) = seen["payloads"]
+    assert p1["model"] == "m" and p1["keep_alive"] == "10m" and not p1["stream"]
+    assert p2["model"] == "other" and p2["options"] == {"temperature": 0}
+    assert path == "/api/embed" and p3["model"] == "embed-model"
+
+
+@pytest.mark.asyncio
+async def test_system_prompt_is_sent_separately_and_reuse_is_counted(ollama_server, monkeypatch):
+    url, seen = ollama_server
+    backend = OllamaBackend(url, default_model="m")
+
+    for name in ("a.txt", "b.txt"):
+        assert await backend.generate(name, system="Static rules.") == f"echo:{name}"
+    backend.close()
+
+    assert [p["system"] for _, p in seen["payloads"]] == ["Static rules."] * 2
+    assert backend.prompt_stats["system_tokens_sent"] == backend.prompt_stats["system_tokens_reused"] > 0
+
+    # Backends without a system field get it inlined, and save nothing
+    prompts = []
+
+    async def ollama_query(prompt, **kwargs):
+        prompts.append(prompt)
+        return "Docs"
+
+    monkeypatch.setattr("akinus.ai.ollama.ollama_query", ollama_query)
+    akinus = AkinusBackend()
+    await akinus.generate("a.txt", system="Static rules.")
+    await akinus.generate("b.txt", system="Static rules.")
+
+    assert prompts == ["Static rules.\n\na.txt", "Static rules.\n\nb.txt"]
+    assert akinus.prompt_stats["system_tokens_reused"] == 0
+
+
+@pytest.mark.asyncio
+async def test_generation_profile_is_sent_per_site(ollama_server):
+    url, seen = ollama_server
+    profiles = {
+        "classify": GenerationProfile(max_tokens=32, temperature=0.0, stop=["\n\n"], json=True),
+    }
+    backend = OllamaBackend(url, default_model="m", profiles=profiles)
+
+    await backend.generate("file", site="classify", system="Rules.")
+    await backend.generate("other")
+    backend.close()
+
+    (_, classify), (_, plain) = seen["payloads"]
+    assert classify["options"] == {"num_predict": 32, "temperature": 0.0, "stop": ["\n\n"]}
+    assert classify["format"] == JSON_SCHEMAS["classify"]
+    assert classify["system"].startswith("Rules.") and "JSON" in classify["system"]
+    assert "options" not in plain and "format" not in plain
+
+    assert backend.generation_report()[-1] == "classify: calls=1 output_tokens/call~3 decode_ms/call=30"
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_honored_while_streaming_from_a_silent_server(silent_server):
+    backend = OllamaBackend(silent_server, default_model="m")
+    resilience = Resilience(
+        {"classify": CallPolicy(timeout=0.3, retries=0)}, CircuitBreaker(failure_threshold=100)
+    )
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        await resilience.call(
+            "classify", backend.for_site("classify"), "file", "m", done=lambda t: False
+        )
+    assert time.perf_counter() - started < 1.5   # not held until the server answers
+
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_streaming_stops_generation_once_done(ollama_server):
+    url, seen = ollama_server
+    backend = OllamaBackend(url, default_model="m")
+
+    text = await backend.generate_until(
+        "file", site="classify", done=lambda t: t.count("\n") >= 3
+    )
+    await asyncio.sleep(0.1)
+    backend.close()
+
+    assert text == "Folder0\nFolder1\nFolder2\n"
+    assert seen["payloads"][0][1]["stream"] is True
+    assert seen["streamed"] < 20
+    assert backend.generation_stats[("classify", "early_stops")] == 1
+
+
+@pytest.mark.asyncio
+async def test_suggest_folders_stops_reading_after_enough_folders(
+    tmp_path: Path, async_log, isolated_global_db
+):
+    file_ctx = FileContext(
+        path=tmp_path / "photo.jpg",
+        name="photo.jpg",
+        extension=".jpg",
+        size_bytes=10,
+        mime_type="image/jpeg",
+    )
+    backend = FakeBackend(default="Photos\nImages\nMedia\nArchive\nMisc\n")
+
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[],
+        memory=MemoryStore(tmp_path / "project.db"),
+        settings={},
+        root=tmp_path,
+        embedder=FakeEmbedder(dim=64),
+        backend=backend,
+        max_suggestions=3,
+    )
+
+    assert [s["folder"] for s in suggestions] == ["Photos", "Images", "Media"]
+    assert backend.chunks_streamed == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_up_preloads_without_a_prompt(ollama_server):
+    url, seen = ollama_server
+    backend = OllamaBackend(url, default_model="m", keep_alive="30m")
+
+    assert await backend.warm_up(None)
+    backend.close()  # the stand-in server serves one connection at a time
+
+    assert await AkinusBackend(ollama_url=url, keep_alive="30m").warm_up("small")
+    assert not await AkinusBackend().warm_up("small")
+
+    assert [p for _, p in seen["payloads"]] == [
+        {"model": "m", "keep_alive": "30m"},
+        {"model": "small", "keep_alive": "30m"},
+    ]
+    assert backend.idle_for() < 1
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_matches_prompt_and_records_calls():
+    backend = FakeBackend({"invoice": "Finance"}, default="Misc")
+
+    assert await backend.generate("file invoice_1.pdf", model="m") == "Finance"
+    assert await backend("something else", "m") == "Misc"
+    assert [c["prompt"] for c in backend.calls] == ["file invoice_1.pdf", "something else"]
+
+
+def test_backend_factories():
+    assert isinstance(get_backend({}), AkinusBackend)
+
+    fake = get_backend({"ai": {"backend": "fake", "fake_response": "Docs"}})
+    assert isinstance(fake, FakeBackend) and fake.default == "Docs"
+
+    embedder = get_embedder({"ai": {"embedding_backend": "fake", "embedding_dim": 32}})
+    assert isinstance(embedder, FakeEmbedder) and embedder.name == "fake-32"
+
+    with pytest.raises(ValueError):
+        get_backend({"ai": {"backend": "nope"}})
+
+
+def test_http_embedder_closes_only_a_backend_it_owns(monkeypatch):
+    closed = []
+    monkeypatch.setattr(OllamaBackend, "close", lambda self: closed.append(self))
+    settings = {"ai": {"embedding_backend": "ollama-http"}}
+
+    shared = OllamaBackend("http://localhost:11434")
+    get_embedder(settings, shared).close()
+    assert closed == []
+
+    # Not an Ollama backend: the embedder opens (and closes) its own session
+    own = get_embedder(settings, FakeBackend())
+    assert own.backend is not shared
+    own.close()
+    assert closed == [own.backend]
+
+
+@pytest.mark.asyncio
+async def test_suggest_folders_uses_given_backend(
+    tmp_path: Path, async_log, isolated_global_db
+):
+    (tmp_path / "Docs").mkdir()
+    file_ctx = FileContext(
+        path=tmp_path / "photo.jpg",
+        name="photo.jpg",
+        extension=".jpg",
+        size_bytes=10,
+        mime_type="image/jpeg",
+    )
+    backend = FakeBackend(default="Docs")
+
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Docs", name="Docs")],
+        memory=MemoryStore(tmp_path / "project.db"),
+        settings={},
+        root=tmp_path,
+        embedder=FakeEmbedder(dim=64),
+        backend=backend,
+    )
+
+    assert suggestions[0]["folder"] == "Docs"
+    assert len(backend.calls) == 1
+
+    # Only the per-file part is sent as the prompt
+    call = backend.calls[0]
+    assert call["system"] == CLASSIFY_SYSTEM_PROMPT
+    assert "photo.jpg" in call["prompt"] and "STRICT RULES" not in call["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_json_summary_profile_drops_the_bullet_format(
+    tmp_path: Path, async_log, isolated_global_db
+):
+    (tmp_path / "Docs").mkdir()
+    notes = tmp_path / "notes.txt"
+    notes.write_text("Quarterly planning meeting notes")
+    file_ctx = FileContext(
+        path=notes,
+        name="notes.txt",
+        extension=".txt",
+        size_bytes=notes.stat().st_size,
+        mime_type="text/plain",
+    )
+    settings = {
+        "ai": {"summary_mode": "llm", "generation": {"summary": {"json": True}}},
+    }
+    backend = FakeBackend(
+        responses={"File content": '{"bullets": ["Meeting notes."]}'},
+        default="Docs",
+        profiles=profiles_from_settings(settings),
+    )
+
+    await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Docs", name="Docs")],
+        memory=MemoryStore(tmp_path / "project.db"),
+        settings=settings,
+        root=tmp_path,
+        embedder=FakeEmbedder(dim=64),
+        backend=backend,
+    )
+
+    summary = next(c for c in backend.calls if c["site"] == "summary")
+    assert summary["system"] == SUMMARY_RULES
+    assert "- Meeting notes." in backend.calls[-1]["prompt"]
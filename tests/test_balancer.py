@@ -0,0 +1,190 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from AI_Organize.ai.backends import get_backend
+from AI_Organize.ai.balancer import BalancedBackend, Endpoint, NoEndpointError
+from AI_Organize.ai.embeddings import get_embedder
+from AI_Organize.ai.resilience import CallPolicy, CircuitBreaker, Resilience
+
+
+def start_server(name, *, latency=0.0, fail=False):
+    """
+    Stand-in Ollama host. Counts requests; `fail` answers 500.
+    """
+    state = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                state["requests"] += 1
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(latency)
+            with lock:
+                state["in_flight"] -= 1
+
+            if fail:
+                self.send_response(500)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            if self.path == "/api/embed":
+                body = {"embeddings": [[1.0, 0.0]] * len(payload["input"])}
+            else:
+                body = {"response": name}
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", state
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(name, **kwargs):
+        server, url, state = start_server(name, **kwargs)
+        started.append(server)
+        return url, state
+
+    yield start
+
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_spreads_concurrent_calls(servers):
+    (url_a, a), (url_b, b) = servers("a", latency=0.05), servers("b", latency=0.05)
+    backend = BalancedBackend(
+        [Endpoint(url_a, max_concurrency=2), Endpoint(url_b, max_concurrency=2)],
+        default_model="m",
+    )
+
+    started = time.perf_counter()
+    replies = await asyncio.gather(*(backend.generate(f"p{i}") for i in range(8)))
+    elapsed = time.perf_counter() - started
+    backend.close()
+
+    assert sorted(replies) == ["a"] * 4 + ["b"] * 4
+    assert a["max_in_flight"] <= 2 and b["max_in_flight"] <= 2
+    assert elapsed < 8 * 0.05              # hosts worked in parallel
+
+
+@pytest.mark.asyncio
+async def test_weighted_round_robin(servers):
+    (url_a, a), (url_b, b) = servers("a"), servers("b")
+    backend = BalancedBackend(
+        [Endpoint(url_a, weight=3), Endpoint(url_b, weight=1)],
+        default_model="m",
+        strategy="round-robin",
+    )
+
+    for i in range(8):
+        await backend.generate(f"p{i}")
+    backend.close()
+
+    assert (a["requests"], b["requests"]) == (6, 2)
+
+
+@pytest.mark.asyncio
+async def test_failing_host_is_ejected_and_calls_fail_over(servers):
+    (url_bad, bad), (url_good, good) = servers("bad", fail=True), servers("good")
+    now = [0.0]
+    backend = BalancedBackend(
+        [Endpoint(url_bad), Endpoint(url_good)],
+        default_model="m",
+        eject_after=2,
+        eject_seconds=30,
+        clock=lambda: now[0],
+    )
+
+    replies = [await backend.generate(f"p{i}") for i in range(6)]
+    assert replies == ["good"] * 6
+    assert bad["requests"] == 2            # ejected after two failures
+    assert good["requests"] == 6           # failed calls were retried here
+    assert "ejected" in backend.report()[0]
+
+    now[0] = 31                            # ejection expires: host is retried
+    await backend.generate("again")
+    backend.close()
+    assert bad["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_timed_out_calls_release_the_host_and_count_as_failures(servers):
+    (url, hung) = servers("hung", latency=1.0)
+    backend = BalancedBackend([Endpoint(url)], default_model="m", eject_after=2)
+    resilience = Resilience(
+        {"classify": CallPolicy(timeout=0.2, retries=0)}, CircuitBreaker(failure_threshold=100)
+    )
+    call = backend.for_site("classify")
+
+    with pytest.raises(TimeoutError):
+        await resilience.call("classify", call, "p")
+    with pytest.raises(TimeoutError):
+        await resilience.call("classify", call, "p", done=lambda t: False)  # streamed
+
+    ep = backend.endpoints[0]
+    assert ep.outstanding == 0
+    assert ep.errors == 2 and ep.ejections == 1
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_models_are_routed_to_hosts_that_serve_them(servers):
+    (url_big, big), (url_small, small) = servers("big"), servers("small")
+    backend = BalancedBackend(
+        [Endpoint(url_big, models=["big"]), Endpoint(url_small, models=["small", "embed"])],
+    )
+
+    assert await backend.generate("p", model="big") == "big"
+    assert await backend.generate("p", model="small") == "small"
+    with pytest.raises(NoEndpointError):
+        await backend.generate("p", model="other")
+
+    vectors = backend.embedder("embed").embed_many(["x", "y"])
+    backend.close()
+    assert len(vectors) == 2 and small["requests"] == 2
+    assert big["requests"] == 1
+
+
+def test_built_from_settings(servers):
+    (url, _) = servers("a")
+    settings = {
+        "ai": {
+            "backend": "balanced",
+            "embedding_backend": "ollama-http",
+            "endpoints": [{"url": url, "weight": 2, "max_concurrency": 3}],
+        }
+    }
+
+    backend = get_backend(settings)
+    embedder = get_embedder(settings, backend)
+
+    assert isinstance(backend, BalancedBackend)
+    assert backend.endpoints[0].weight == 2 and backend.endpoints[0].backend.pool_size == 3
+    assert embedder.embed("x").tolist() == [1.0, 0.0]
+    backend.close()
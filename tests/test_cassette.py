@@ -0,0 +1,103 @@
+import time
+
+import numpy as np
+import pytest
+
+from AI_Organize.ai.backends import FakeBackend, FakeEmbedder
+from AI_Organize.ai.cassette import (
+    Cassette,
+    CassetteMissError,
+    RecordingBackend,
+    RecordingEmbedder,
+    ReplayBackend,
+    ReplayEmbedder,
+)
+
+
+async def _record(path):
+    cassette = Cassette.record_to(path)
+    cassette.record_model("m")
+    backend = RecordingBackend(
+        FakeBackend({"invoice": "Finance", "photo": "Pictures"}, latency=0.05), cassette
+    )
+    embedder = RecordingEmbedder(FakeEmbedder(dim=16), cassette)
+
+    await backend.generate("classify invoice.pdf", model="m", site="classify", system="rules")
+    await backend.generate("classify photo.jpg", model="m", site="classify", system="rules")
+    vectors = embedder.embed_many(["invoice", "photo"])
+    backend.close()
+    return vectors
+
+
+@pytest.mark.asyncio
+async def test_replays_recorded_responses_and_vectors(tmp_path):
+    path = tmp_path / "run.jsonl.gz"
+    vectors = await _record(path)
+
+    cassette = Cassette.load(path)
+    assert len(cassette) == 4 and cassette.model == "m"
+    backend = ReplayBackend(cassette, latency="none")
+    embedder = ReplayEmbedder(cassette, latency="none")
+
+    assert await backend.generate("classify photo.jpg", model="m", site="classify", system="rules") == "Pictures"
+    assert await backend.generate("classify invoice.pdf", model="m", site="classify", system="rules") == "Finance"
+    assert np.allclose(embedder.embed("photo"), vectors[1])
+    assert embedder.name == "fake-16"
+    assert backend.generation_stats[("classify", "calls")] == 2
+
+    # Anything that changes the request is a different recording
+    with pytest.raises(CassetteMissError):
+        await backend.generate("classify invoice.pdf", model="other", site="classify", system="rules")
+    assert cassette.stats[("generate", "misses")] == 1
+
+
+@pytest.mark.asyncio
+async def test_original_latency_is_replayed(tmp_path):
+    path = tmp_path / "run.jsonl"
+    await _record(path)
+
+    backend = ReplayBackend(Cassette.load(path), latency="original")
+    started = time.perf_counter()
+    await backend.generate("classify invoice.pdf", model="m", site="classify", system="rules")
+    assert time.perf_counter() - started >= 0.04
+
+    fast = ReplayBackend(Cassette.load(path), latency="none")
+    started = time.perf_counter()
+    await fast.generate("classify invoice.pdf", model="m", site="classify", system="rules")
+    assert time.perf_counter() - started < 0.04
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_replay_in_recorded_order(tmp_path):
+    path = tmp_path / "run.jsonl"
+    replies = iter(["first", "second"])
+    cassette = Cassette.record_to(path)
+    backend = RecordingBackend(FakeBackend(lambda prompt: next(replies)), cassette)
+    await backend.generate("same")
+    await backend.generate("same")
+    backend.close()
+
+    replay = ReplayBackend(Cassette.load(path), latency="none")
+    assert [await replay.generate("same") for _ in range(3)] == ["first", "second", "second"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["run.jsonl.gz", "run.jsonl"])
+async def test_interrupted_recording_replays_its_complete_entries(tmp_path, name):
+    path = tmp_path / name
+    cassette = Cassette.record_to(path)
+    backend = RecordingBackend(FakeBackend({"invoice": "Finance", "photo": "Pictures"}), cassette)
+
+    await backend.generate("classify invoice.pdf")
+    first_entry_end = path.stat().st_size
+    await backend.generate("classify photo.jpg")
+
+    # The run died: never closed, and the last write only half made it
+    with open(path, "r+b") as f:
+        f.truncate((first_entry_end + path.stat().st_size) // 2)
+
+    replay = ReplayBackend(Cassette.load(path), latency="none")
+    assert await replay.generate("classify invoice.pdf") == "Finance"
+    with pytest.raises(CassetteMissError):
+        await replay.generate("classify photo.jpg")
+    cassette.close()
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from AI_Organize.ai.clustering import cluster_files, cluster_files_async
+from AI_Organize.ai.embedding_service import EmbeddingService
+from AI_Organize.ai.embeddings import HashingEmbedder
+from AI_Organize.core.models import FileContext
+
+
+def _ctx(name: str) -> FileContext:
+    return FileContext(
+        path=Path("/tmp") / name,
+        name=name,
+        extension=Path(name).suffix,
+        size_bytes=1,
+    )
+
+
+def test_cluster_by_template():
+    files = [_ctx(f"DSC_{i:04d}.JPG") for i in range(50)]
+    files += [_ctx("notes.txt"), _ctx("DSC_0001.png")]
+
+    clusters = cluster_files(files)
+
+    assert [len(c) for c in clusters] == [50, 1, 1]
+    assert clusters[0].representative.name == "DSC_0000.JPG"
+    assert len(clusters[0].others) == 49
+
+
+def test_embedding_merge_respects_extension():
+    files = [
+        _ctx("holiday_photo_a.jpg"),
+        _ctx("holiday_photo_b.jpg"),
+        _ctx("holiday_photo_a.pdf"),
+    ]
+
+    clusters = cluster_files(
+        files,
+        embedder=HashingEmbedder(),
+        similarity_threshold=0.8,
+    )
+
+    assert sorted(len(c) for c in clusters) == [1, 2]
+    assert {f.extension for f in clusters[0].files} == {".jpg"}
+
+
+class CountingHashingEmbedder(HashingEmbedder):
+    supports_batch = True
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def embed_many(self, texts):
+        self.batches.append(len(texts))
+        return super().embed_many(texts)
+
+
+@pytest.mark.asyncio
+async def test_async_embedding_merge_is_one_batch_through_the_service():
+    files = [
+        _ctx("holiday_photo_a.jpg"),
+        _ctx("holiday_photo_b.jpg"),
+        _ctx("holiday_photo_a.pdf"),
+    ]
+    embedder = CountingHashingEmbedder()
+
+    clusters = await cluster_files_async(
+        files,
+        EmbeddingService(embedder),
+        similarity_threshold=0.8,
+    )
+
+    assert embedder.batches == [3]
+    assert [sorted(f.name for f in c.files) for c in clusters] == [
+        ["holiday_photo_a.jpg", "holiday_photo_b.jpg"],
+        ["holiday_photo_a.pdf"],
+    ]
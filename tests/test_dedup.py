@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from AI_Organize.core.dedup import (
+    PARTIAL_HASH_BYTES,
+    SingleFlight,
+    find_duplicates,
+    full_hash,
+)
+from AI_Organize.core.models import build_file_context
+
+
+def _ctx(path, data):
+    path.write_bytes(data)
+    return build_file_context(path)
+
+
+def test_find_duplicates_groups_identical_content(tmp_path):
+    original = _ctx(tmp_path / "report.pdf", b"same bytes")
+    copy = _ctx(tmp_path / "report (1).pdf", b"same bytes")
+    other = _ctx(tmp_path / "other.pdf", b"diff bytes")  # same size
+
+    duplicates = find_duplicates([original, other, copy])
+
+    assert list(duplicates.values()) == [[original, copy]]
+    assert list(duplicates) == [full_hash(original.path)]
+
+
+def test_find_duplicates_checks_full_content_after_partial_match(tmp_path):
+    # Same head and tail, different middle: partial hashes collide
+    head = b"a" * PARTIAL_HASH_BYTES
+    tail = b"z" * PARTIAL_HASH_BYTES
+    first = _ctx(tmp_path / "one.bin", head + b"1" + tail)
+    second = _ctx(tmp_path / "two.bin", head + b"2" + tail)
+
+    assert find_duplicates([first, second]) == {}
+
+
+def test_full_hash_of_empty_file(tmp_path):
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+
+    assert full_hash(empty) == (
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+    )
+
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_concurrent_calls():
+    flights = SingleFlight()
+    calls = 0
+
+    async def classify():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["Docs"]
+
+    results = await asyncio.gather(
+        *(flights.do("sha", classify) for _ in range(3))
+    )
+
+    assert results == [["Docs"]] * 3
+    assert calls == 1
+    assert flights.coalesced == 2
+
+    # Released after completion: the next call runs again
+    await flights.do("sha", classify)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_errors():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model down")
+
+    results = await asyncio.gather(
+        flights.do("k", fail), flights.do("k", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
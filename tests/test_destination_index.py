@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from AI_Organize.ai.destination_index import DestinationIndex
+from AI_Organize.ai.embeddings import HashingEmbedder
+from AI_Organize.core.models import DirectoryContext
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(dim=256)
+        self.calls = 0
+
+    def embed(self, text):
+        self.calls += 1
+        return super().embed(text)
+
+
+def _dest(tmp_path: Path, name: str, description: str | None) -> DirectoryContext:
+    return DirectoryContext(path=tmp_path / name, name=name, description=description)
+
+
+def test_scores_all_destinations_in_one_pass(tmp_path: Path):
+    embedder = CountingEmbedder()
+    index = DestinationIndex(embedder)
+
+    index.update(
+        [
+            _dest(tmp_path, "Finance", "invoices receipts tax returns bank statements"),
+            _dest(tmp_path, "Photos", "holiday photos camera pictures jpeg"),
+            _dest(tmp_path, "Empty", None),
+        ]
+    )
+
+    scores = index.score(embedder.embed("invoice receipts statement"))
+
+    assert len(index) == 2
+    assert [folder for folder, _ in scores] == ["Finance", "Photos"]
+    assert scores[0][1] > scores[1][1]
+
+
+def test_reembeds_only_changed_descriptions(tmp_path: Path):
+    embedder = CountingEmbedder()
+    index = DestinationIndex(embedder)
+
+    destinations = [
+        _dest(tmp_path, "Finance", "invoices"),
+        _dest(tmp_path, "Photos", "pictures"),
+    ]
+    assert index.update(destinations) == 2
+    assert index.update(destinations) == 0
+
+    destinations[1] = _dest(tmp_path, "Photos", "pictures and videos")
+    assert index.update(destinations) == 1
+
+    index.update(destinations[:1])
+    assert [f for f, _ in index.score(embedder.embed("invoices"))] == ["Finance"]
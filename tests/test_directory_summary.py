@@ -92,3 +92,19 @@ async def test_generate_directory_summary_calls_ai(tmp_path: Path):
     )
 
     assert summary == "This directory contains documentation files."
+
+
+@pytest.mark.asyncio
+async def test_generate_directory_summary_reads_json_output(tmp_path: Path):
+    create_text_file(tmp_path / "readme.txt", "example")
+
+    async def json_ollama(prompt: str, model: str):
+        return '{"summary": "Project documentation."}'
+
+    summary = await generate_directory_summary(
+        tmp_path,
+        model="dummy-model",
+        ai_call=json_ollama,
+    )
+
+    assert summary == "Project documentation."
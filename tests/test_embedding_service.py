@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from AI_Organize.ai.embedding_service import EmbeddingService
+from AI_Organize.ai.embeddings import ContextEmbeddingCache, EmbeddingBackend
+
+
+class BatchEmbedder(EmbeddingBackend):
+    name = "batch"
+    supports_batch = True
+
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, text):
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts):
+        self.batches.append(list(texts))
+        return [np.full(3, len(t), dtype=np.float32) for t in texts]
+
+
+class SingleEmbedder(EmbeddingBackend):
+    name = "single"
+
+    def __init__(self):
+        self.threads = set()
+
+    def embed(self, text):
+        self.threads.add(threading.current_thread().name)
+        if text == "bad":
+            raise ConnectionError("refused")
+        return np.full(3, len(text), dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    embedder = BatchEmbedder()
+    service = EmbeddingService(embedder, window=0.01)
+
+    vectors = await asyncio.gather(
+        service.embed("a"), service.embed("bb"), service.embed("a")
+    )
+
+    assert [v[0] for v in vectors] == [1, 2, 1]
+    assert embedder.batches == [["a", "bb"]]  # duplicates embedded once
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting_for_the_window():
+    embedder = BatchEmbedder()
+    service = EmbeddingService(embedder, max_batch=2, window=60)
+
+    await asyncio.wait_for(
+        asyncio.gather(service.embed("a"), service.embed("b")), timeout=1
+    )
+
+    assert embedder.batches == [["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_single_input_backend_runs_off_the_event_loop():
+    embedder = SingleEmbedder()
+    service = EmbeddingService(embedder)
+
+    ok, bad = await asyncio.gather(
+        service.embed("abc"), service.embed("bad"), return_exceptions=True
+    )
+
+    assert ok.tolist() == [3, 3, 3]
+    assert isinstance(bad, ConnectionError)
+    assert threading.current_thread().name not in embedder.threads
+
+
+@pytest.mark.asyncio
+async def test_context_cache_async_lookup_embeds_once():
+    embedder = BatchEmbedder()
+    service = EmbeddingService(embedder)
+    cache = ContextEmbeddingCache()
+
+    first = await cache.aget(service, ["Docs", "Photos"])
+    second = await cache.aget(service, ["Docs", "Photos"])
+
+    assert first is second
+    assert len(embedder.batches) == 1
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from AI_Organize.ai.embeddings import (
+    ContextEmbeddingCache,
+    HashingEmbedder,
+    OllamaEmbedder,
+    combine_embeddings,
+    get_embedder,
+)
+
+
+def test_hashing_embedder_is_normalized_and_deterministic():
+    embedder = HashingEmbedder(dim=256)
+
+    a = embedder.embed("Invoice_2024_03.pdf\n.pdf\napplication/pdf")
+    b = embedder.embed("Invoice_2024_03.pdf\n.pdf\napplication/pdf")
+
+    assert a.dtype == np.float32
+    assert a.shape == (256,)
+    assert np.isclose(np.linalg.norm(a), 1.0)
+    assert np.array_equal(a, b)
+    assert embedder.name == "hashing-256"
+
+
+def test_hashing_embedder_similarity_follows_names():
+    embedder = HashingEmbedder()
+
+    invoice_a = embedder.embed("Invoice_2024_03.pdf application/pdf")
+    invoice_b = embedder.embed("Invoice_2024_04.pdf application/pdf")
+    photo = embedder.embed("DSC_0042.JPG image/jpeg")
+
+    assert invoice_a @ invoice_b > invoice_a @ photo
+
+
+def test_hashing_embedder_empty_text():
+    assert not HashingEmbedder(dim=8).embed("").any()
+
+
+def test_get_embedder_from_settings():
+    assert isinstance(get_embedder({}), OllamaEmbedder)
+    assert get_embedder({"ai": {"embedding_backend": "hashing", "embedding_dim": 64}}).dim == 64
+
+    with pytest.raises(ValueError):
+        get_embedder({"ai": {"embedding_backend": "nope"}})
+
+
+def test_context_cache_embeds_shared_context_once():
+    class CountingEmbedder(HashingEmbedder):
+        calls = 0
+
+        def embed(self, text):
+            CountingEmbedder.calls += 1
+            return super().embed(text)
+
+    cache = ContextEmbeddingCache()
+    embedder = CountingEmbedder(dim=32)
+    descriptions = ["Tax returns and invoices", "Holiday photos"]
+
+    first = cache.get(embedder, descriptions)
+    second = cache.get(embedder, list(descriptions))
+
+    assert CountingEmbedder.calls == 1
+    assert first is second
+    assert cache.get(embedder, []) is None
+
+
+def test_combine_embeddings_weighting():
+    file_vec = np.array([1.0, 0.0], dtype=np.float32)
+    context_vec = np.array([0.0, 3.0], dtype=np.float32)
+
+    combined = combine_embeddings(file_vec, context_vec, weight=0.2)
+
+    assert np.isclose(np.linalg.norm(combined), 1.0)
+    assert combined[0] > combined[1] > 0
+    assert combine_embeddings(file_vec, None) is not None
+    assert np.array_equal(combine_embeddings(file_vec, context_vec, weight=0), file_vec)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from pathlib import Path
+
+from AI_Organize.ai.filename_templates import TemplateIndex, filename_template
+from AI_Organize.ai.organizer import suggest_folders
+from AI_Organize.core.memory import MemoryStore
+from AI_Organize.core.models import FileContext
+
+
+@pytest.mark.parametrize(
+    "name, template",
+    [
+        ("Scan_2024-03-01_0012.pdf", "scan_<date>_<n>.pdf"),
+        ("IMG_4411.HEIC", "img_<n>.heic"),
+        ("statement-88812-march.csv", "statement-<n>-<month>.csv"),
+        ("statement-88812-2024-03.csv", "statement-<n>-<date>.csv"),
+        ("backup-3f2a9c1e7b.tar", "backup-<hex>.tar"),
+        ("export_123e4567-e89b-12d3-a456-426614174000.json", "export_<uuid>.json"),
+        ("notes.txt", "notes.txt"),
+    ],
+)
+def test_filename_template(name, template):
+    assert filename_template(name) == template
+
+
+def test_template_index_counts():
+    index = TemplateIndex()
+    for i in range(4):
+        index.add(filename_template(f"IMG_{i}.HEIC"), "Photos")
+    index.add(filename_template("IMG_9.HEIC"), "Archive")
+
+    folder, share, total = index.lookup("IMG_12345.heic")[0]
+    assert (folder, share, total) == ("Photos", 0.8, 5)
+    assert index.lookup("report.pdf") == []
+
+
+@pytest.mark.asyncio
+async def test_consistent_template_skips_llm(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    (tmp_path / "Scans").mkdir()
+    memory = MemoryStore(tmp_path / "project.db")
+
+    for i in range(3):
+        memory.record_decision(
+            embedding=np.ones(10),
+            extension=".pdf",
+            tokens=["scan"],
+            target_folder="Scans",
+            directory_description=None,
+            confidence=0.5,
+            name_template=filename_template(f"Scan_2024-01-0{i + 1}_000{i}.pdf"),
+        )
+
+    async def llm_must_not_run(*args, **kwargs):
+        pytest.fail("LLM called despite a consistent filename template")
+
+    monkeypatch.setattr("akinus.ai.ollama.ollama_query", llm_must_not_run)
+
+    suggestions = await suggest_folders(
+        file_ctx=FileContext(
+            path=tmp_path / "Scan_2024-03-01_0012.pdf",
+            name="Scan_2024-03-01_0012.pdf",
+            extension=".pdf",
+            size_bytes=10,
+        ),
+        directories=[],
+        memory=memory,
+        settings={},
+        root=tmp_path,
+        templates=TemplateIndex(),
+    )
+
+    assert suggestions[0]["folder"] == "Scans"
+    assert suggestions[0]["source"] == "template"
+    assert suggestions[0]["auto_move_eligible"] is True
@@ -0,0 +1,73 @@
+from AI_Organize.ai.file_context import _clean_bullets
+from AI_Organize.ai.generation import (
+    DEFAULT_PROFILES,
+    apply_stop,
+    parse_json_list,
+    parse_json_text,
+    profiles_from_settings,
+)
+from AI_Organize.ai.organizer import extract_folder_lines
+from AI_Organize.ai.prompts import (
+    CLASSIFY_SYSTEM_PROMPT,
+    SUMMARY_SYSTEM_PROMPT,
+    classify_system_prompt,
+    summary_system_prompt,
+)
+
+
+def test_settings_override_only_given_keys():
+    profiles = profiles_from_settings(
+        {"ai": {"generation": {"classify": {"max_tokens": 16, "json": True}}}}
+    )
+
+    classify = profiles["classify"]
+    assert classify.max_tokens == 16 and classify.json
+    assert classify.temperature == DEFAULT_PROFILES["classify"].temperature
+    assert profiles["summary"] == DEFAULT_PROFILES["summary"]
+    assert classify.format_for("classify")["required"] == ["folders"]
+
+
+def test_no_default_output_budget():
+    # Reasoning models spend the budget thinking; leave it to the model
+    assert all(p.max_tokens is None for p in DEFAULT_PROFILES.values())
+    assert "num_predict" not in DEFAULT_PROFILES["classify"].options()
+
+
+def test_classify_prompt_asks_for_one_output_format():
+    assert classify_system_prompt() == CLASSIFY_SYSTEM_PROMPT
+    assert "per line" in CLASSIFY_SYSTEM_PROMPT
+
+    json_prompt = classify_system_prompt(json_output=True)
+    assert "per line" not in json_prompt and "Photos/Vacation\nMusic" not in json_prompt
+
+
+def test_summary_prompt_asks_for_one_output_format():
+    assert summary_system_prompt() == SUMMARY_SYSTEM_PROMPT
+    assert "ONLY bullet points" in SUMMARY_SYSTEM_PROMPT
+
+    json_prompt = summary_system_prompt(json_output=True)
+    assert "ONLY bullet points" not in json_prompt and "Maximum 3 bullet points" in json_prompt
+
+
+def test_parsers_read_structured_and_plain_output():
+    assert parse_json_list("not json", "folders") is None
+    assert parse_json_list('{"folders": "Docs"}', "folders") is None
+
+    assert extract_folder_lines('{"folders": ["Finance", "Work/Reports", " "]}') == [
+        "Finance",
+        "Work/Reports",
+    ]
+    assert extract_folder_lines("Finance\nThis is my reasoning\nWork") == ["Finance", "Work"]
+
+    assert _clean_bullets('{"bullets": ["Invoice from ACME.", "- Due in May."]}') == (
+        "- Invoice from ACME.\n- Due in May."
+    )
+
+    assert parse_json_text('{"summary": " Tax records. "}', "summary") == "Tax records."
+    assert parse_json_text('{"summary": ["Tax"]}', "summary") is None
+    assert parse_json_text("Tax records.", "summary") is None
+
+
+def test_client_side_stop_sequences():
+    assert apply_stop("Docs\nArchive\n\nBecause...", ["\n\n"]) == "Docs\nArchive"
+    assert apply_stop("Docs", ["\n\n", ""]) == "Docs"
@@ -0,0 +1,62 @@
+import numpy as np
+from pathlib import Path
+
+from AI_Organize.ai.local_classifier import LocalClassifier, name_tokens
+from AI_Organize.core.memory import MemoryStore
+
+
+def test_name_tokens_drop_digit_runs():
+    assert name_tokens("Invoice_2024_ACME.pdf") == ["invoice", "acme", "pdf"]
+
+
+def test_naive_bayes_prefers_matching_tokens():
+    clf = LocalClassifier()
+
+    for i in range(5):
+        clf.partial_fit(tokens=["invoice", "acme"], extension=".pdf", target_folder="Finance")
+        clf.partial_fit(tokens=["dsc"], extension=".jpg", target_folder="Photos")
+
+    top_folder, top_prob = clf.predict(tokens=["invoice"], extension=".pdf")[0]
+    assert top_folder == "Finance"
+    assert top_prob > 0.9
+
+    assert clf.predict(tokens=["dsc"], extension=".jpg")[0][0] == "Photos"
+
+
+def test_knn_vote_uses_embeddings():
+    clf = LocalClassifier(knn_weight=1.0)
+    a = np.array([1.0, 0.0, 0.0])
+    b = np.array([0.0, 1.0, 0.0])
+
+    clf.partial_fit(tokens=[], extension=None, target_folder="A", embedding=a)
+    clf.partial_fit(tokens=[], extension=None, target_folder="B", embedding=b)
+
+    query = np.array([0.9, 0.1, 0.0])
+    assert clf.predict(tokens=[], extension=None, embedding=query)[0][0] == "A"
+
+
+def test_refresh_is_incremental(tmp_path: Path, isolated_global_db):
+    memory = MemoryStore(tmp_path / "project.db")
+    clf = LocalClassifier()
+
+    memory.record_decision(
+        embedding=np.ones(4),
+        extension=".iso",
+        tokens=["ubuntu"],
+        target_folder="ISOs",
+        directory_description=None,
+        confidence=1.0,
+    )
+    assert clf.refresh(memory) == 1
+    assert clf.refresh(memory) == 0
+
+    memory.record_decision(
+        embedding=np.ones(4),
+        extension=".iso",
+        tokens=["debian"],
+        target_folder="ISOs",
+        directory_description=None,
+        confidence=1.0,
+    )
+    assert clf.refresh(memory) == 1
+    assert clf.n_samples == 2
@@ -0,0 +1,45 @@
+import sqlite3
+
+from AI_Organize.ai.local_summary import LocalSummarizer
+
+
+def _summarizer():
+    return LocalSummarizer(sqlite3.connect(":memory:"))
+
+
+def test_summary_is_bulleted_and_extractive():
+    content = (
+        "Invoice number 1042 for consulting services.\n"
+        "Payment is due within thirty days of the invoice date.\n"
+        "Thank you for your business and continued support.\n"
+        "Consulting services were delivered in March.\n"
+    )
+
+    summary = _summarizer().summarize(content, max_sentences=2)
+
+    lines = summary.bullets.splitlines()
+    assert len(lines) == 2
+    assert all(line.startswith("- ") for line in lines)
+    assert all(line[2:] in content for line in lines)
+    assert "invoice" in summary.keywords
+
+
+def test_document_frequencies_persist_and_downweight_common_terms():
+    summarizer = _summarizer()
+    for i in range(5):
+        summarizer.summarize(f"Project report number {i} about project status.")
+
+    summary = summarizer.summarize("Project report about kayak trip planning.")
+
+    # "project" appears in every document, "kayak" only in this one
+    assert summary.keywords.index("kayak") < summary.keywords.index("project")
+
+    documents = summarizer.conn.execute("SELECT documents FROM term_corpus").fetchone()[0]
+    assert documents == 6
+
+
+def test_empty_content_gives_fallback_summary():
+    summary = _summarizer().summarize("12 34 ... !!")
+
+    assert summary.bullets.startswith("- ")
+    assert summary.keywords == []
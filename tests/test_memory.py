@@ -22,3 +22,21 @@ def test_memory_store_roundtrip(tmp_path: Path, monkeypatch):
     hits = memory.get_similar(embedding, scope="project")
     assert hits
 
+
+
+def test_memory_never_mixes_embedding_backends(tmp_path: Path, isolated_global_db):
+    db_path = tmp_path / "project.db"
+    ollama_memory = MemoryStore(db_path)
+    hashing_memory = MemoryStore(db_path, embedding_backend="hashing-10")
+
+    ollama_memory.record_decision(
+        embedding=np.ones(10),
+        extension=".pdf",
+        tokens=[],
+        target_folder="Career",
+        directory_description=None,
+        confidence=0.9,
+    )
+
+    assert ollama_memory.get_similar(np.ones(10), scope="project")
+    assert hashing_memory.get_similar(np.ones(10), scope="project") == []
@@ -0,0 +1,252 @@
+import sqlite3
+import sys
+import time
+
+import pytest
+
+from AI_Organize.ai.backends import FakeBackend
+from AI_Organize.ai.cassette import Cassette
+from AI_Organize.cli import organize
+
+
+@pytest.fixture
+def organize_run(tmp_path, monkeypatch, isolated_global_db):
+    """
+    Drive `organize.run` end to end: fake LLM backend and embeddings,
+    scripted answers, captured log lines.
+
+        backend, log_lines = await organize_run(files, dirs=..., inputs=..., settings=...)
+    """
+    logged = []
+
+    async def fake_log(*args, **kwargs):
+        logged.append(args)
+
+    async def list_models():
+        return ["test-model"]
+
+    monkeypatch.setattr(sys.modules["akinus.utils.logger"], "log", fake_log)
+    monkeypatch.setattr(sys.modules["akinus.utils.logger"], "LOG_FILE", "organize.log", raising=False)
+    monkeypatch.setattr(sys.modules["akinus.ai.ollama"], "list_models", list_models, raising=False)
+
+    root = tmp_path / "root"
+    (root / ".ai").mkdir(parents=True)
+
+    async def run(files, *, dirs=(), inputs=(), settings=None, rules=None, backend=None, auto=None):
+        import json
+
+        merged = {
+            "ai": {
+                "model": "test-model",
+                "embedding_backend": "fake",
+                "enable_directory_summaries": False,
+                "warm_up": False,
+            },
+            "local_model": {"enabled": False},
+        }
+        for section, values in (settings or {}).items():
+            merged.setdefault(section, {}).update(values)
+        (root / ".ai" / "settings.json").write_text(json.dumps(merged))
+
+        if rules:
+            (root / ".ai" / "rules.toml").write_text(rules)
+        for d in dirs:
+            (root / d).mkdir(parents=True, exist_ok=True)
+        for name, content in files.items():
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_text(content)
+
+        backend = backend or FakeBackend(default="Docs")
+        monkeypatch.setattr(organize, "get_backend", lambda settings: backend)
+
+        answers = iter(inputs)
+
+        def fake_input(prompt=""):
+            time.sleep(0.02)        # the "user" reads; prefetching runs meanwhile
+            try:
+                return next(answers)
+            except StopIteration:
+                raise EOFError("no scripted answer left")
+
+        monkeypatch.setattr("builtins.input", fake_input)
+
+        await organize.run(project_root=root, max_depth=1, auto_move_override=auto)
+        return backend, logged
+
+    run.root = root
+    return run
+
+
+def _decisions(root):
+    conn = sqlite3.connect(root / ".ai" / "project.db")
+    try:
+        return conn.execute("SELECT target_folder FROM decisions").fetchall()
+    finally:
+        conn.close()
+
+
+RULES = """
+[[rules]]
+name = "disk-images"
+glob = "*.iso"
+target = "ISOs"
+"""
+
+
+@pytest.mark.asyncio
+async def test_rule_moves_without_prompt_and_is_remembered(organize_run):
+    backend, logged = await organize_run({"ubuntu.iso": "iso"}, dirs=["ISOs"], rules=RULES)
+
+    root = organize_run.root
+    assert (root / "ISOs" / "ubuntu.iso").exists()
+    assert backend.calls == []
+    assert _decisions(root) == [("ISOs",)]
+
+
+@pytest.mark.asyncio
+async def test_rule_target_is_offered_without_ai_when_auto_move_is_off(organize_run):
+    backend, logged = await organize_run(
+        {"ubuntu.iso": "iso"}, dirs=["ISOs"], rules=RULES, inputs=[""], auto=False
+    )
+
+    root = organize_run.root
+    assert (root / "ISOs" / "ubuntu.iso").exists()
+    assert backend.calls == []
+    assert any("[RULE-MATCH]" in str(line) for line in logged)
+    assert any("disk-images=matched:1/applied:1" in str(line) for line in logged)
+
+
+@pytest.mark.asyncio
+async def test_skipped_rule_match_is_not_counted_as_applied(organize_run):
+    backend, logged = await organize_run(
+        {"ubuntu.iso": "iso"}, dirs=["ISOs"], rules=RULES, inputs=["s"], auto=False
+    )
+
+    root = organize_run.root
+    assert (root / "ubuntu.iso").exists()
+    assert backend.calls == []
+    assert any("[SKIP]" in str(line) for line in logged)
+    assert any("disk-images=matched:1/applied:0" in str(line) for line in logged)
+
+
+@pytest.mark.asyncio
+async def test_identical_files_in_different_folders_are_classified_once(organize_run):
+    backend, logged = await organize_run(
+        {
+            "inbox/report.txt": "quarterly numbers",
+            "backup/report copy.txt": "quarterly numbers",
+        },
+        dirs=["Docs"],
+        inputs=["s", "s"],
+        settings={"ai": {"summary_mode": "local"}},
+    )
+
+    classify_calls = [c for c in backend.calls if c["site"] == "classify"]
+    assert len(classify_calls) == 1
+    assert sum("[SKIP]" in str(line) for line in logged) == 2
+
+
+FILES = {
+    "inbox/alpha.txt": "first",
+    "inbox/budget.pdf": "second",
+    "inbox/zebra.md": "third",
+}
+
+
+def _classified(backend):
+    return [c for c in backend.calls if c["site"] == "classify"]
+
+
+@pytest.mark.asyncio
+async def test_prefetched_suggestions_are_used_while_answers_keep_them_valid(organize_run):
+    backend, logged = await organize_run(
+        FILES, dirs=["Docs"], inputs=["s", "s", "s"], settings={"ai": {"summary_mode": "local"}}
+    )
+
+    assert len(_classified(backend)) == 3
+    assert any("[PREFETCH] suggestions ready before needed" in str(line) for line in logged)
+
+
+@pytest.mark.asyncio
+async def test_new_folder_answer_invalidates_and_recomputes_prefetched_suggestions(organize_run):
+    backend, logged = await organize_run(
+        FILES,
+        dirs=["Docs"],
+        inputs=["n", "Projects", "s", "s"],
+        settings={"ai": {"summary_mode": "local"}},
+    )
+
+    calls = _classified(backend)
+    # 3 up front (1 + 2 prefetched), then the 2 invalidated ones again
+    assert len(calls) == 5
+    assert "Projects" not in calls[1]["prompt"]
+    assert "Projects" in calls[3]["prompt"] and "Projects" in calls[4]["prompt"]
+    assert len(list((organize_run.root / "Projects").iterdir())) == 1
+
+
+class ClosingBackend(FakeBackend):
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_closes_the_backend_and_keeps_its_recording(organize_run):
+    backend = ClosingBackend(default="Docs")
+
+    # No scripted answer: the prompt for the first file ends the run
+    with pytest.raises(EOFError):
+        await organize_run(
+            {"inbox/report.txt": "quarterly numbers"},
+            dirs=["Docs"],
+            backend=backend,
+            settings={"ai": {"summary_mode": "local"}, "cassette": {"mode": "record"}},
+        )
+
+    assert backend.closed
+    recorded = Cassette.load(organize_run.root / ".ai" / "cassette.jsonl.gz")
+    assert len(recorded) >= 1
+
+
+class WarmingBackend(FakeBackend):
+    async def warm_up(self, model):
+        pytest.fail("replay must not warm up models")
+
+
+@pytest.mark.asyncio
+async def test_replay_uses_the_recorded_model_without_the_server(organize_run, monkeypatch):
+    root = organize_run.root
+    cassette = {"path": ".ai/run.jsonl.gz", "latency": "none"}
+    await organize_run(
+        {"inbox/report.txt": "quarterly numbers"},
+        dirs=["Docs"],
+        inputs=["1", "n"],
+        settings={"ai": {"summary_mode": "local"}, "cassette": {**cassette, "mode": "record"}},
+    )
+    assert Cassette.load(root / ".ai" / "run.jsonl.gz").model == "test-model"
+
+    # Same run again from a fresh workspace, with the model server gone
+    (root / "Docs" / "report.txt").unlink()
+    (root / ".ai" / "project.db").unlink()
+
+    async def list_models():
+        pytest.fail("replay must not contact the model server")
+
+    monkeypatch.setattr(sys.modules["akinus.ai.ollama"], "list_models", list_models, raising=False)
+
+    backend, logged = await organize_run(
+        {"inbox/report.txt": "quarterly numbers"},
+        dirs=["Docs"],
+        inputs=["1", "n"],
+        backend=WarmingBackend(default="Docs"),
+        settings={
+            "ai": {"model": "unset-model", "summary_mode": "local", "warm_up": True},
+            "cassette": {**cassette, "mode": "replay"},
+        },
+    )
+
+    assert (root / "Docs" / "report.txt").exists()
+    assert backend.calls == []
+    report = next(str(line) for line in logged if "[CASSETTE] mode=replay" in str(line))
+    assert "generate: replayed=" in report and "misses" not in report
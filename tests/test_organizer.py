@@ -38,3 +38,284 @@ async def test_organizer_ranking(tmp_path: Path, monkeypatch):
 
     assert suggestions
     assert suggestions[0]["folder"] in {"Docs", "Archive"}
+
+
+@pytest.mark.asyncio
+async def test_memory_fastpath_skips_llm(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    (tmp_path / "Invoices").mkdir()
+    file_ctx = FileContext(
+        path=tmp_path / "invoice_0042.pdf",
+        name="invoice_0042.pdf",
+        extension=".pdf",
+        size_bytes=100,
+        mime_type="application/pdf",
+    )
+
+    memory = MemoryStore(tmp_path / "project.db")
+    memory.record_decision(
+        embedding=np.ones(10),
+        extension=".pdf",
+        tokens=["invoice"],
+        target_folder="Invoices",
+        directory_description=None,
+        confidence=0.98,
+    )
+
+    async def llm_must_not_run(*args, **kwargs):
+        pytest.fail("LLM called despite a strong memory hit")
+
+    monkeypatch.setattr("akinus.ai.ollama.ollama_query", llm_must_not_run)
+
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Invoices", name="Invoices")],
+        memory=memory,
+        settings={"memory": {"fastpath_skip_summary": True}},
+        root=tmp_path,
+    )
+
+    assert suggestions == [
+        {
+            "folder": "Invoices",
+            "confidence": 0.98,
+            "source": "memory-fastpath",
+            "auto_move_eligible": True,
+            "stages": ["metadata"],
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_lazy_summary_runs_only_when_cheap_signals_are_weak(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    summaries = []
+
+    async def fake_summary(**kwargs):
+        summaries.append(kwargs["filename"])
+        return "- Meeting notes"
+
+    monkeypatch.setattr(
+        "AI_Organize.ai.organizer.summarize_file_content", fake_summary
+    )
+
+    (tmp_path / "Docs").mkdir()
+    notes = tmp_path / "notes.txt"
+    notes.write_text("Quarterly planning meeting notes")
+    file_ctx = FileContext(
+        path=notes,
+        name="notes.txt",
+        extension=".txt",
+        size_bytes=notes.stat().st_size,
+        mime_type="text/plain",
+    )
+    directories = [DirectoryContext(path=tmp_path / "Docs", name="Docs")]
+    memory = MemoryStore(tmp_path / "project.db")
+
+    weak = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=directories,
+        memory=memory,
+        settings={"ai": {"summary_mode": "llm"}},
+        root=tmp_path,
+    )
+    assert weak[0]["stages"] == ["metadata", "summary", "llm"]
+    assert summaries == ["notes.txt"]
+
+    # Strong but not fast-path-strong memory: the summary is skipped
+    memory.record_decision(
+        embedding=np.ones(10),
+        extension=".txt",
+        tokens=["notes"],
+        target_folder="Docs",
+        directory_description=None,
+        confidence=0.85,
+    )
+
+    strong = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=directories,
+        memory=memory,
+        settings={"ai": {"summary_mode": "llm"}},
+        root=tmp_path,
+    )
+    assert strong[0]["stages"] == ["metadata", "llm"]
+    assert summaries == ["notes.txt"]
+
+
+@pytest.mark.asyncio
+async def test_local_summary_mode_never_calls_llm_summary(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    async def llm_summary_must_not_run(**kwargs):
+        pytest.fail("LLM summary called in local summary mode")
+
+    monkeypatch.setattr(
+        "AI_Organize.ai.organizer.summarize_file_content", llm_summary_must_not_run
+    )
+
+    (tmp_path / "Docs").mkdir()
+    notes = tmp_path / "notes.txt"
+    notes.write_text("Quarterly planning meeting notes. Budget review for the kayak club.")
+    file_ctx = FileContext(
+        path=notes,
+        name="notes.txt",
+        extension=".txt",
+        size_bytes=notes.stat().st_size,
+        mime_type="text/plain",
+    )
+
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Docs", name="Docs")],
+        memory=MemoryStore(tmp_path / "project.db"),
+        settings={"ai": {"summary_mode": "local"}},
+        root=tmp_path,
+    )
+
+    assert suggestions[0]["stages"] == ["metadata", "summary-local", "llm"]
+    assert "kayak" in file_ctx.keywords
+
+
+@pytest.mark.asyncio
+async def test_llm_failure_degrades_to_memory_suggestions(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    (tmp_path / "Invoices").mkdir()
+    file_ctx = FileContext(
+        path=tmp_path / "invoice_0042.pdf",
+        name="invoice_0042.pdf",
+        extension=".pdf",
+        size_bytes=100,
+        mime_type="application/pdf",
+    )
+
+    memory = MemoryStore(tmp_path / "project.db")
+    memory.record_decision(
+        embedding=np.ones(10),
+        extension=".pdf",
+        tokens=["invoice"],
+        target_folder="Invoices",
+        directory_description=None,
+        confidence=0.7,
+    )
+
+    async def server_down(*args, **kwargs):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr("akinus.ai.ollama.ollama_query", server_down)
+
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Invoices", name="Invoices")],
+        memory=memory,
+        settings={"resilience": {"retries": 0}},
+        root=tmp_path,
+    )
+
+    assert [s["folder"] for s in suggestions] == ["Invoices"]
+    assert suggestions[0]["stages"][-2:] == ["llm", "degraded"]
+
+
+@pytest.mark.asyncio
+async def test_scores_destinations_once_and_closes_its_own_backend(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    from AI_Organize.ai.backends import FakeBackend
+    from AI_Organize.ai.destination_index import DestinationIndex
+    from AI_Organize.ai.embeddings import HashingEmbedder
+
+    closed = []
+
+    class ClosingBackend(FakeBackend):
+        def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(
+        "AI_Organize.ai.organizer.get_backend", lambda settings: ClosingBackend(default="Docs")
+    )
+
+    (tmp_path / "Docs").mkdir()
+    embedder = HashingEmbedder(dim=64)
+    destinations = DestinationIndex(embedder)
+    destinations.update([DirectoryContext(path=tmp_path / "Docs", name="Docs", description="letters")])
+
+    score_calls = []
+    score = destinations.score
+    monkeypatch.setattr(destinations, "score", lambda e: score_calls.append(e) or score(e))
+
+    file_ctx = FileContext(
+        path=tmp_path / "x.bin", name="x.bin", extension=".bin", size_bytes=1, mime_type=None
+    )
+    await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Docs", name="Docs")],
+        memory=MemoryStore(tmp_path / "project.db"),
+        settings={"ai": {}},
+        root=tmp_path,
+        embedder=embedder,
+        destinations=destinations,
+    )
+
+    assert len(score_calls) == 1
+    assert len(closed) == 1
+
+
+@pytest.mark.asyncio
+async def test_re_seen_file_hits_the_memory_fastpath_with_real_embeddings(
+    tmp_path: Path, monkeypatch, async_log, isolated_global_db
+):
+    from AI_Organize.ai.embeddings import HashingEmbedder
+    from AI_Organize.ai.organizer import memory_embedding_text
+
+    async def llm_must_not_run(*args, **kwargs):
+        pytest.fail("LLM called despite a remembered file")
+
+    def cosine_similarity(a, b):
+        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    monkeypatch.setattr("akinus.ai.ollama.ollama_query", llm_must_not_run)
+    monkeypatch.setattr("akinus.ai.ollama.cosine_similarity", cosine_similarity)
+
+    (tmp_path / "Invoices").mkdir()
+    invoice = tmp_path / "Invoice_0042.txt"
+    invoice.write_text("Invoice 0042 from ACME Corp. Amount due: 120 EUR by May 31.")
+    file_ctx = FileContext(
+        path=invoice,
+        name="Invoice_0042.txt",
+        extension=".txt",
+        size_bytes=invoice.stat().st_size,
+        mime_type="text/plain",
+    )
+    embedder = HashingEmbedder()
+
+    # Stored the way organize.run records a decision
+    memory = MemoryStore(tmp_path / "project.db")
+    memory.record_decision(
+        embedding=embedder.embed(memory_embedding_text(file_ctx)),
+        extension=".txt",
+        tokens=["invoice"],
+        target_folder="Invoices",
+        directory_description=None,
+        confidence=0.98,
+    )
+
+    # The content summary and directory context shape the ranking vector,
+    # not the memory query
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[
+            DirectoryContext(
+                path=tmp_path / "Invoices", name="Invoices", description="Supplier invoices"
+            )
+        ],
+        memory=memory,
+        settings={"ai": {"lazy_summary": False, "summary_mode": "local"}},
+        root=tmp_path,
+        embedder=embedder,
+    )
+
+    assert suggestions[0]["source"] == "memory-fastpath"
+    assert suggestions[0]["folder"] == "Invoices"
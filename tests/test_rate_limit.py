@@ -0,0 +1,221 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from AI_Organize.ai.backends import FakeBackend
+from AI_Organize.ai.generation import GenerationProfile
+from AI_Organize.ai.rate_limit import (
+    AdaptiveLimiter,
+    RateLimitedBackend,
+    SharedTokenBucket,
+    TokenBucket,
+    is_throttled,
+)
+from AI_Organize.ai.resilience import CallPolicy, CircuitBreaker, Resilience
+
+
+class LimiterClock:
+    """
+    Manual clock whose `sleep` advances time instead of waiting.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class Throttled(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        self.response = type(
+            "Response",
+            (),
+            {"status_code": 429, "headers": {"Retry-After": retry_after} if retry_after else {}},
+        )()
+
+
+def test_token_bucket_bursts_then_spaces_requests():
+    clock = LimiterClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    assert [bucket.reserve(1) for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    clock.now = 10
+    assert bucket.reserve(1) == 0.0
+
+
+def test_shared_bucket_is_one_budget_across_connections(tmp_path):
+    clock = LimiterClock()
+    db = tmp_path / "rate_limit.db"
+    a = SharedTokenBucket(db, "requests", rate=1, capacity=2, clock=clock)
+    b = SharedTokenBucket(db, "requests", rate=1, capacity=2, clock=clock)
+
+    assert a.reserve(1) == 0.0
+    assert b.reserve(1) == 0.0
+    assert a.reserve(1) == 1.0      # b's reservation counted against a
+    a.close()
+    b.close()
+
+
+def test_is_throttled():
+    assert is_throttled(Throttled())
+    assert is_throttled(RuntimeError("rate limit exceeded"))
+    assert not is_throttled(ConnectionError("refused"))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_grows_additively_and_halves_on_throttle():
+    clock = LimiterClock()
+    limiter = AdaptiveLimiter(
+        initial_concurrency=2, max_concurrency=8, clock=clock, sleep=clock.sleep
+    )
+
+    for _ in range(10):
+        async with limiter.slot():
+            clock.now += 1
+    grown = limiter.limit
+    assert 4 < grown < 5
+
+    with pytest.raises(Throttled):
+        async with limiter.slot():
+            raise Throttled(retry_after="3")
+    assert limiter.limit == pytest.approx(grown / 2)
+    assert limiter.stats["throttled"] == 1
+
+    # New calls wait out Retry-After
+    async with limiter.slot():
+        pass
+    assert clock.slept == [3.0]
+
+
+@pytest.mark.asyncio
+async def test_one_decrease_per_round_of_calls():
+    clock = LimiterClock()
+    limiter = AdaptiveLimiter(initial_concurrency=8, clock=clock, sleep=clock.sleep)
+
+    async def throttled_call():
+        async with limiter.slot():
+            await asyncio.sleep(0)
+            raise Throttled()
+
+    # Four calls in flight together fail: one multiplicative decrease
+    results = await asyncio.gather(*(throttled_call() for _ in range(4)), return_exceptions=True)
+    assert all(isinstance(r, Throttled) for r in results)
+    assert limiter.limit == 4
+    assert limiter.stats["decreases"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_shrink_the_limit_and_cap_in_flight():
+    clock = LimiterClock()
+    limiter = AdaptiveLimiter(
+        initial_concurrency=4, latency_target=5, clock=clock, sleep=clock.sleep
+    )
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(call() for _ in range(12)))
+    assert peak <= 4
+    grown = limiter.limit
+
+    async with limiter.slot():
+        clock.now += 10
+    assert limiter.limit == pytest.approx(grown / 2)
+    assert limiter.stats["slow"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_charges_token_budget_per_call():
+    clock = LimiterClock()
+    limiter = AdaptiveLimiter(
+        token_bucket=TokenBucket(rate=10, capacity=100, clock=clock),
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    inner = FakeBackend(default="Docs", profiles={"classify": GenerationProfile(max_tokens=64)})
+    backend = RateLimitedBackend(inner, limiter)
+
+    # classify reserves its 64-token output cap plus the prompt estimate
+    await backend.generate("x" * 40, site="classify")
+    await backend.generate("x" * 40, site="classify")
+
+    assert len(inner.calls) == 2
+    assert clock.slept and clock.slept[0] == pytest.approx(5.0)
+    assert limiter.stats["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_time_queued_for_a_slot_is_not_charged_to_the_timeout():
+    limiter = AdaptiveLimiter(initial_concurrency=1, max_concurrency=1)
+    backend = RateLimitedBackend(FakeBackend(default="Docs", latency=0.15), limiter)
+    resilience = Resilience(
+        {"classify": CallPolicy(timeout=0.25, retries=0)}, CircuitBreaker(failure_threshold=100)
+    )
+
+    # One at a time: the last call queues for 0.3s, then runs for 0.15s
+    replies = await asyncio.gather(
+        *(resilience.call("classify", backend.for_site("classify"), f"p{i}") for i in range(3))
+    )
+    assert replies == ["Docs"] * 3
+    assert resilience.stats[("classify", "timeouts")] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_bucket_waits_for_other_processes_off_the_event_loop(tmp_path):
+    db = tmp_path / "rate_limit.db"
+    limiter = AdaptiveLimiter(request_bucket=SharedTokenBucket(db, "requests", rate=1, capacity=2))
+
+    # Another process holds the write lock for a moment
+    other = sqlite3.connect(db, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.3, other.execute, ("COMMIT",)).start()
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    running = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    async with limiter.slot():
+        pass
+    running.cancel()
+
+    assert time.perf_counter() - started >= 0.25
+    assert ticks >= 10          # the loop kept running while the lock was held
+    other.close()
+    limiter.close()
+
+
+def test_from_settings_auto_enables_for_cloud_models(tmp_path):
+    assert AdaptiveLimiter.from_settings({"ai": {"model": "llama3.2:3b"}}) is None
+
+    limiter = AdaptiveLimiter.from_settings(
+        {
+            "ai": {"model": "gpt-oss:120b-cloud"},
+            "rate_limit": {"requests_per_second": 2, "tokens_per_minute": 600, "shared": True},
+        },
+        tmp_path,
+    )
+    assert isinstance(limiter.request_bucket, SharedTokenBucket)
+    assert limiter.token_bucket.capacity == 600
+    assert (tmp_path / ".ai" / "rate_limit.db").exists()
+    limiter.close()
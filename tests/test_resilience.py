@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+
+from AI_Organize.ai.resilience import (
+    CallPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _resilience(breaker=None, **policy):
+    policy = {"timeout": 0.05, "retries": 2, "backoff": 0.001, **policy}
+    return Resilience(
+        {"classify": CallPolicy(**policy), "embed": CallPolicy(**policy)},
+        breaker or CircuitBreaker(failure_threshold=100),
+        rng=lambda: 0.0,
+    )
+
+
+def test_breaker_opens_then_half_opens_after_reset_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half-open"
+    assert breaker.allow()          # one trial call
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.times_opened == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_until_success():
+    resilience = _resilience()
+    attempts = []
+
+    async def flaky(prompt, model=None):
+        attempts.append(prompt)
+        if len(attempts) < 3:
+            raise ConnectionError("refused")
+        return "Docs"
+
+    assert await resilience.call("classify", flaky, "p", model="m") == "Docs"
+    assert resilience.stats[("classify", "errors")] == 2
+    assert resilience.stats[("classify", "retries")] == 2
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_counted_and_raised():
+    resilience = _resilience(retries=1)
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with pytest.raises(TimeoutError):
+        await resilience.call("classify", hang)
+
+    assert resilience.stats[("classify", "timeouts")] == 2
+    assert resilience.had_failures
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_rejects_without_calling():
+    resilience = _resilience(
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60), retries=0
+    )
+    calls = 0
+
+    async def down(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("refused")
+
+    with pytest.raises(ConnectionError):
+        await resilience.call("classify", down)
+    with pytest.raises(CircuitOpenError):
+        await resilience.call("classify", down)
+
+    assert calls == 1
+    assert resilience.stats[("classify", "rejected")] == 1
+    assert resilience.report()[0] == "circuit=open opened=1"
+
+
+def test_call_sync_stops_waiting_at_timeout():
+    resilience = _resilience(retries=0)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        resilience.call_sync("embed", time.sleep, 0.5)
+
+    assert time.monotonic() - start < 0.4
+
+
+def test_call_sync_counts_are_exact_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    breaker = CircuitBreaker(failure_threshold=10_000)
+    resilience = _resilience(breaker, retries=0, timeout=5)
+
+    def flaky(i):
+        if i % 2:
+            raise ConnectionError("refused")
+        return i
+
+    def call(i):
+        try:
+            resilience.call_sync("embed", flaky, i)
+        except ConnectionError:
+            pass
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(call, range(2000)))
+
+    assert resilience.stats[("embed", "calls")] == 2000
+    assert resilience.stats[("embed", "errors")] == 1000
+    resilience.close()
+
+
+def test_close_releases_worker_threads():
+    resilience = _resilience()
+    resilience.call_sync("embed", lambda: 1)
+    executor = resilience._executor
+
+    resilience.close()
+
+    assert resilience._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: 1)
+    assert resilience.call_sync("embed", lambda: 2) == 2   # recreated on demand
+    resilience.close()
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from AI_Organize.ai.backends import FakeBackend
+from AI_Organize.ai.response_cache import (
+    CachedBackend,
+    ResponseCache,
+    cache_key,
+    normalize_prompt,
+)
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_cosmetic_whitespace_but_not_model_or_options():
+    a = "\n  Respond now:\n\n   Docs   please  \n"
+    b = "Respond now:\nDocs please"
+
+    assert normalize_prompt(a) == b
+    assert cache_key("m", a, {}) == cache_key("m", b, {})
+    assert cache_key("m", a, {}) != cache_key("other", a, {})
+    assert cache_key("m", a, {"temperature": 0}) != cache_key("m", a, {})
+
+
+def test_entries_expire_after_ttl(tmp_path: Path):
+    clock = ManualClock()
+    cache = ResponseCache(tmp_path / "cache.db", ttl=60, clock=clock)
+
+    cache.put("m", "prompt", "Docs")
+    assert cache.get("m", "prompt") == "Docs"
+
+    clock.now += 61
+    assert cache.get("m", "prompt") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    clock = ManualClock()
+    cache = ResponseCache(tmp_path / "cache.db", max_entries=2, clock=clock)
+
+    cache.put("m", "a", "A")
+    clock.now += 1
+    cache.put("m", "b", "B")
+    clock.now += 1
+    cache.get("m", "a")          # "a" is now more recent than "b"
+    clock.now += 1
+    cache.put("m", "c", "C")
+
+    assert cache.get("m", "a") == "A"
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "c") == "C"
+
+
+@pytest.mark.asyncio
+async def test_cached_backend_only_caches_opted_in_sites(tmp_path: Path):
+    inner = FakeBackend(default="Docs")
+    cache = ResponseCache(tmp_path / "cache.db")
+    backend = CachedBackend(inner, cache, sites=["classify"])
+
+    for _ in range(3):
+        assert await backend.generate("p", model="m", site="classify") == "Docs"
+        assert await backend.generate("p", model="m", site="summary") == "Docs"
+
+    assert [c["site"] for c in inner.calls] == ["classify", "summary", "summary", "summary"]
+    assert cache.hit_rate("classify") == pytest.approx(2 / 3)
+    assert cache.report() == ["classify: hits=2 misses=1 hit_rate=67%"]
+
+    # Persisted: a new process sees the entry
+    fresh = FakeBackend(default="other")
+    reopened = CachedBackend(fresh, ResponseCache(tmp_path / "cache.db"), sites=["classify"])
+    assert await reopened.generate("p", model="m", site="classify") == "Docs"
+    assert fresh.calls == []
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import pytest
+
+from AI_Organize.ai.backends import FakeBackend, FakeEmbedder
+from AI_Organize.ai.organizer import suggest_folders
+from AI_Organize.ai.routing import DEFAULT_TIER, ModelRouter
+from AI_Organize.core.memory import MemoryStore
+from AI_Organize.core.models import DirectoryContext, FileContext
+
+
+ROUTING = {
+    "routing": {
+        "enabled": True,
+        "tiers": {"small": "tiny", "large": None},
+        "sites": {"classify": "small", "summary": "small"},
+    }
+}
+
+
+def test_routes_sites_to_tiers():
+    router = ModelRouter.from_settings(ROUTING)
+
+    assert router.route("classify", "big") == ("small", "tiny")
+    assert router.route("directory_summary", "big") == (DEFAULT_TIER, "big")
+    assert router.escalation("big") == ("large", "big")
+    assert router.can_escalate("small", "tiny", "big")
+    assert not router.can_escalate("large", "big", "big")
+
+    router.record_escalation("classify")
+    assert router.report() == ["escalations: classify=1"]
+
+    disabled = ModelRouter.from_settings({})
+    assert disabled.route("classify", "big") == (DEFAULT_TIER, "big")
+    assert not disabled.can_escalate(DEFAULT_TIER, "big", "big")
+
+
+def test_escalation_rules():
+    router = ModelRouter(escalate_below=0.6)
+
+    assert router.should_escalate([], best_confidence=0.0, memory_folder=None)
+    assert router.should_escalate(["Docs"], best_confidence=0.9, memory_folder="Finance")
+    assert router.should_escalate(["Docs"], best_confidence=0.4, memory_folder=None)
+    assert not router.should_escalate(["Docs"], best_confidence=0.6, memory_folder="Docs")
+
+
+def test_weak_memory_hit_does_not_force_escalation():
+    router = ModelRouter(escalate_below=0.6, memory_floor=0.8)
+
+    assert not router.should_escalate(
+        ["Docs"], best_confidence=0.7, memory_folder="Finance", memory_score=0.35
+    )
+    assert router.should_escalate(
+        ["Docs"], best_confidence=0.7, memory_folder="Finance", memory_score=0.85
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "reply, models",
+    [
+        ("Docs", ["tiny"]),                  # existing folder: small answer kept
+        ("Invented", ["tiny", "big"]),       # new folder only: escalated
+    ],
+)
+async def test_classification_escalates_unreliable_small_answers(
+    tmp_path: Path, async_log, isolated_global_db, reply, models
+):
+    (tmp_path / "Docs").mkdir()
+    file_ctx = FileContext(
+        path=tmp_path / "photo.jpg",
+        name="photo.jpg",
+        extension=".jpg",
+        size_bytes=10,
+        mime_type="image/jpeg",
+    )
+    backend = FakeBackend(default=reply)
+    router = ModelRouter.from_settings(ROUTING)
+
+    suggestions = await suggest_folders(
+        file_ctx=file_ctx,
+        directories=[DirectoryContext(path=tmp_path / "Docs", name="Docs")],
+        memory=MemoryStore(tmp_path / "project.db"),
+        settings=ROUTING,
+        model="big",
+        root=tmp_path,
+        embedder=FakeEmbedder(dim=64),
+        backend=backend,
+        router=router,
+    )
+
+    assert [c["model"] for c in backend.calls] == models
+    assert ("escalated" in suggestions[0]["stages"]) == (len(models) == 2)
+    assert router.stats[("small", "calls")] == 1
+    assert router.escalations["classify"] == len(models) - 1
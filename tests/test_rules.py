@@ -0,0 +1,76 @@
+import os
+import time
+from pathlib import Path
+
+from AI_Organize.core.models import build_file_context
+from AI_Organize.core.rules import load_rules
+
+
+RULES = """
+[[rules]]
+name = "disk-images"
+glob = "*.iso"
+target = "ISOs"
+
+[[rules]]
+name = "invoices"
+glob = "Invoice_*.pdf"
+target = "Finance/Invoices"
+
+[[rules]]
+name = "big-old-videos"
+mime = "video/*"
+min_size = 10
+min_age_days = 30
+target = "Archive/Videos"
+
+[[rules]]
+name = "scans"
+regex = "^scan_\\\\d{4}"
+extension = ["png", ".jpg"]
+target = "Scans"
+"""
+
+
+def _ctx(tmp_path: Path, name: str, content: str = "x"):
+    path = tmp_path / name
+    path.write_text(content)
+    return build_file_context(path)
+
+
+def test_rules_first_match_and_hits(tmp_path: Path):
+    rules_path = tmp_path / "rules.toml"
+    rules_path.write_text(RULES)
+    rules = load_rules(rules_path)
+
+    assert len(rules) == 4
+    assert rules.match(_ctx(tmp_path, "ubuntu.ISO")).target == "ISOs"
+    assert rules.match(_ctx(tmp_path, "Invoice_2024_03.pdf")).target == "Finance/Invoices"
+    assert rules.match(_ctx(tmp_path, "report.pdf")) is None
+    assert rules.match(_ctx(tmp_path, "scan_0012.png")).target == "Scans"
+    assert rules.match(_ctx(tmp_path, "scan_0012.gif")) is None
+
+    assert rules.hits == {"disk-images": 1, "invoices": 1, "scans": 1}
+
+
+def test_rules_size_and_age(tmp_path: Path):
+    rules_path = tmp_path / "rules.toml"
+    rules_path.write_text(RULES)
+    rules = load_rules(rules_path)
+
+    fresh = _ctx(tmp_path, "clip.mp4", "x" * 20)
+    assert rules.match(fresh) is None
+
+    old = time.time() - 60 * 86_400
+    os.utime(fresh.path, (old, old))
+    assert rules.match(fresh).target == "Archive/Videos"
+
+    small = _ctx(tmp_path, "tiny.mp4", "x")
+    os.utime(small.path, (old, old))
+    assert rules.match(small) is None
+
+
+def test_missing_rules_file(tmp_path: Path):
+    rules = load_rules(tmp_path / "missing.toml")
+    assert len(rules) == 0
+    assert rules.match(_ctx(tmp_path, "a.iso")) is None
@@ -0,0 +1,36 @@
+from AI_Organize.ai.shortlist import estimate_tokens, shortlist_folders
+
+
+def test_small_trees_are_unchanged():
+    folders = ["Docs", "Photos", "Music"]
+    assert shortlist_folders(folders, query_tokens=["invoice"]) == folders
+
+
+def test_shortlist_ranks_lexical_and_memory_signals():
+    folders = [f"Project-{i:04d}" for i in range(2000)]
+    folders += ["Finance/Invoices", "Photos", "Archive"]
+
+    shortlist = shortlist_folders(
+        folders,
+        query_tokens=["invoice", "acme"],
+        memory_scores={"Archive": 0.4},
+        top_k=5,
+    )
+
+    assert len(shortlist) == 5
+    assert shortlist[0] == "Finance/Invoices"
+    assert "Archive" in shortlist
+
+
+def test_shortlist_respects_token_budget():
+    folders = [f"Some-Long-Folder-Name-{i}" for i in range(100)]
+
+    shortlist = shortlist_folders(
+        folders,
+        query_tokens=[],
+        top_k=100,
+        token_budget=50,
+    )
+
+    assert shortlist
+    assert sum(estimate_tokens(f) for f in shortlist) <= 50
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from AI_Organize.ai.backends import FakeBackend
+from AI_Organize.ai.warmup import ModelWarmer
+
+
+class WarmableBackend(FakeBackend):
+    def __init__(self, fail=()):
+        super().__init__()
+        self.warmed = []
+        self.fail = set(fail)
+        self.idle = 0.0
+
+    async def warm_up(self, model):
+        await asyncio.sleep(0.01)
+        if model in self.fail:
+            raise ConnectionError("refused")
+        self.warmed.append(model)
+        return True
+
+    def idle_for(self):
+        return self.idle
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_in_background_and_records_failures():
+    backend = WarmableBackend(fail={"broken"})
+    warmer = ModelWarmer(backend, ["big", None, "small", "big", "broken"], refresh_interval=0)
+
+    warmer.start()
+    assert not warmer.ready.is_set()       # start() does not wait
+
+    await asyncio.wait_for(warmer.ready.wait(), 1)
+    await warmer.stop()
+
+    assert sorted(backend.warmed) == ["big", "small"]
+    assert set(warmer.warmed) == {"big", "small"}
+    assert warmer.failed == {"broken": "refused"}
+    assert warmer.report()[-1] == "broken: failed (refused)"
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_is_refreshed_only_while_idle():
+    backend = WarmableBackend()
+    warmer = ModelWarmer(backend, ["big"], refresh_interval=0.1)
+
+    warmer.start()
+    await asyncio.sleep(0.2)
+    assert warmer.refreshes == 0           # backend busy
+
+    backend.idle = 1.0                     # user sits at a prompt
+    await asyncio.sleep(0.2)
+    await warmer.stop()
+
+    assert warmer.refreshes >= 1
+    assert len(backend.warmed) == 1 + warmer.refreshes